@@ -2,25 +2,29 @@ from fastapi import APIRouter, HTTPException, status, Depends, Query
 from starlette.requests import Request
 from typing import Dict, List, Optional
 from ....services.vertex_ai_service import analyze_profile_text, generate_github_query_with_genai
-from ...v1.endpoints.auth import get_github_token
-from ....services.github_service import get_profile_text_data, get_user_profile
+from ...v1.endpoints.auth import get_github_token, get_github_user
+from ....services.github_service import get_profile_text_data
 
 router = APIRouter()
 
 
 @router.get("/analyze-profile", response_model=Dict[str, List[str]])
-async def analyze_github_profile(request: Request, token: str = Depends(get_github_token)):
+async def analyze_github_profile(
+        request: Request,
+        token: str = Depends(get_github_token),
+        refresh: bool = Query(False, description="Refetch the GitHub profile instead of using the cached one")
+):
     """
     Analyzes the authenticated GitHub user's profile using Google Cloud Natural Language API.
     """
     try:
         # Get profile text data from GitHub
-        profile_data = await get_profile_text_data(token)
+        profile_data = await get_profile_text_data(token, refresh=refresh)
         print(
             f"DEBUG: Got profile_data with {len(profile_data.get('languages', []))} languages, {len(profile_data.get('topics', []))} topics")
 
         # Get user profile for additional information
-        user_profile = await get_user_profile(token)
+        user_profile = await get_github_user(request)
 
         # Extract components from profile_data
         languages = profile_data.get("languages", [])
@@ -95,14 +99,15 @@ async def generate_github_query(
         token: str = Depends(get_github_token),
         query_type: str = Query("issues",
                                 description="Type of query to generate: 'issues', 'repositories', or 'custom'"),
-        custom_prompt: Optional[str] = Query(None, description="Custom instructions for query generation")
+        custom_prompt: Optional[str] = Query(None, description="Custom instructions for query generation"),
+        refresh: bool = Query(False, description="Refetch the GitHub profile instead of using the cached one")
 ):
     """
     Generates GitHub search queries based on the user's profile analysis.
     """
     try:
         # First, get the analyzed profile data
-        profile_analysis = await analyze_github_profile(request, token)
+        profile_analysis = await analyze_github_profile(request, token, refresh)
 
         # Extract the relevant data
         keywords = profile_analysis.get("keywords_entities", [])
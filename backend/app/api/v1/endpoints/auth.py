@@ -1,9 +1,14 @@
 import httpx
 import secrets
+import time
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.responses import RedirectResponse
 from starlette.requests import Request
 from ....core.config import settings
+from ....services.http_client import get_http_client
+from ....services.github_cache import token_scope
+from ....services.github_identity import resolve_github_user
 
 router = APIRouter()
 
@@ -15,6 +20,7 @@ GITHUB_SCOPES = "read:user user:email repo"  # Permissions needed for user data
 FRONTEND_LOGIN_SUCCESS_URL = "http://localhost:3000/skills"  # Redirect after successful login
 FRONTEND_LOGIN_FAILURE_URL = "http://localhost:3000/login?error=auth_failed"
 FRONTEND_LOGOUT_REDIRECT_URL = "http://localhost:3000/login"
+SESSION_USER_KEY = "github_user"
 
 @router.get("/login")
 async def github_login_redirect(request: Request):
@@ -35,7 +41,8 @@ async def github_login_redirect(request: Request):
 
 
 @router.get("/callback")
-async def github_callback_handler(request: Request, code: str = None, state: str = None):
+async def github_callback_handler(request: Request, code: str = None, state: str = None,
+                                  client: httpx.AsyncClient = Depends(get_http_client)):
     """
     Handles the callback from GitHub after user authorization.
     Exchanges the code for an access token and stores it in the session.
@@ -66,17 +73,16 @@ async def github_callback_handler(request: Request, code: str = None, state: str
     }
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(GITHUB_TOKEN_URL, data=payload, headers=headers)
-            response.raise_for_status()
-            token_data = response.json()
-        except (httpx.RequestError, httpx.HTTPStatusError) as exc:
-            print(f"GitHub token exchange failed: {exc}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Could not exchange code for token with GitHub: {exc}"
-            )
+    try:
+        response = await client.post(GITHUB_TOKEN_URL, data=payload, headers=headers)
+        response.raise_for_status()
+        token_data = response.json()
+    except (httpx.RequestError, httpx.HTTPStatusError) as exc:
+        print(f"GitHub token exchange failed: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not exchange code for token with GitHub: {exc}"
+        )
 
     access_token = token_data.get("access_token")
     error = token_data.get("error")
@@ -117,4 +123,43 @@ async def get_github_token(request: Request) -> str:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated with GitHub. Please log in."
         )
-    return token
\ No newline at end of file
+    return token
+
+def _session_user_id(request: Request, token: str) -> Optional[int]:
+    """
+    The GitHub user id remembered in the session for this token, or None when
+    absent, recorded for another token, or older than GITHUB_IDENTITY_TTL.
+    """
+    cached = request.session.get(SESSION_USER_KEY)
+    if (cached and cached.get("scope") == token_scope(token)
+            and time.time() - cached.get("cachedAt", 0) < settings.GITHUB_IDENTITY_TTL):
+        return cached.get("id")
+    return None
+
+# Dependency resolving the GitHub user behind the session token
+async def get_github_user(request: Request) -> Dict[str, Any]:
+    """
+    Returns the authenticated user's GitHub snapshot (id, login, avatar_url, ...).
+    The snapshot lives in the server-side per-token cache, which only calls
+    GitHub /user on a miss; the session keeps just the user id and token hash.
+    """
+    token = request.session.get('github_token')
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    user = await resolve_github_user(token)
+    if _session_user_id(request, token) != user["id"]:
+        request.session[SESSION_USER_KEY] = {"scope": token_scope(token), "id": user["id"], "cachedAt": time.time()}
+    return user
+
+async def get_github_user_id(request: Request) -> str:
+    """
+    Returns the authenticated user's numeric GitHub id as a string, from the
+    session when it is still valid for the token, otherwise via get_github_user.
+    """
+    token = request.session.get('github_token')
+    user_id = _session_user_id(request, token) if token else None
+    if user_id is not None:
+        return str(user_id)
+    user = await get_github_user(request)
+    return str(user["id"])
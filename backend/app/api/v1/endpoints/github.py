@@ -59,6 +59,7 @@ async def search_github_issues(
 @router.get("/profile-text-data")
 async def get_profile_text_data(
     max_repos: Optional[int] = Query(5, description="Maximum number of repositories to fetch READMEs for"),
+    refresh: bool = Query(False, description="Refetch from GitHub instead of using the cached profile"),
     token: str = Depends(get_github_token)
 ):
     """
@@ -66,7 +67,7 @@ async def get_profile_text_data(
     for a user's top repositories.
     """
     try:
-        profile_data = await github_service.get_profile_text_data(token, max_repos)
+        profile_data = await github_service.get_profile_text_data(token, max_repos, refresh=refresh)
         return profile_data
     except HTTPException as e:
         # Pass through HTTPExceptions raised by the service
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from starlette.requests import Request
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
+import json
 from pydantic import BaseModel
 from ....services.github_service import get_profile_text_data
-from ....services.faiss_search import get_top_matched_issues
-from ...v1.endpoints.auth import get_github_token
+from ....services.profile_vectors import get_profile_vector, profile_hash
+from ....services.match_cache import get_match_cache, match_cache_key
+from ....services.faiss_search import get_top_matched_issues, stream_top_matched_issues
+from ....services.executor import ExecutorBusy
+from ...v1.endpoints.auth import get_github_token, get_github_user_id
 import logging
 
 # Set up logging
@@ -36,6 +42,92 @@ class MatchResponse(BaseModel):
     message: str
 
 
+class MatchQuery(BaseModel):
+    """Query text, search keywords and profile embedding derived for a match request."""
+    text: str
+    keywords: List[str]
+    languages: List[str]
+    topics: List[str]
+    profile_hash: str
+    github_id: Optional[str] = None
+    vector: Any = None
+
+    def cache_key(self, max_results: int) -> str:
+        return match_cache_key(self.keywords, self.languages, self.topics, max_results, self.profile_hash)
+
+    async def resolve_vector(self) -> Any:
+        """ Embed the query text, reusing the stored profile embedding while it is unchanged. """
+        if self.vector is None:
+            self.vector = await get_profile_vector(self.github_id, self.text)
+        return self.vector
+
+
+async def build_match_query(request: Request, token: str, keywords: List[str], languages: List[str],
+                            topics: List[str], refresh: bool = False) -> MatchQuery:
+    """
+    Combine the requested keywords, languages and topics with the user's
+    GitHub profile into the query text and search keywords. The embedding
+    is left to MatchQuery.resolve_vector, so cached results skip it.
+    """
+    # Try to get additional profile data if token is valid
+    try:
+        profile_data = await get_profile_text_data(token, refresh=refresh)
+
+        # Add profile keywords if we don't have any
+        if not keywords and "keywords" in profile_data:
+            keywords = profile_data.get("keywords", [])
+            logger.info(f"Using profile keywords: {keywords}")
+
+        # Add profile languages if we don't have any
+        if not languages and "languages" in profile_data:
+            languages = profile_data.get("languages", [])
+            logger.info(f"Using profile languages: {languages}")
+
+        # Add profile topics if we don't have any
+        if not topics and "topics" in profile_data:
+            topics = profile_data.get("topics", [])
+            logger.info(f"Using profile topics: {topics}")
+
+        # # Get the text blob for semantic matching
+        text_blob_summ = profile_data.get("text_blob", "")
+
+    except Exception as e:
+        logger.warning(f"Could not get profile data: {str(e)}")
+        # Continue with what we have from the request
+        text_blob_summ = ""
+
+    # Create a query text from keywords, languages, and topics if no text_blob
+    text_blob = ""
+    query_parts = []
+    if keywords:
+        query_parts.append("Keywords: " + ", ".join(keywords))
+    if languages:
+        query_parts.append("Languages: " + ", ".join(languages))
+    if topics:
+        query_parts.append("Topics: " + ", ".join(topics))
+
+        text_blob = ". ".join(query_parts) if query_parts else "open source issues"
+
+    text_blob = text_blob + ". " + text_blob_summ
+
+
+    logger.info(f"Using query text: {text_blob[:100]}...")
+
+    # Combine topics with keywords for better search
+    all_keywords = keywords.copy()
+    if topics:
+        all_keywords.extend(topics)
+
+    try:
+        github_id = await get_github_user_id(request)
+    except Exception as e:
+        logger.warning(f"Could not identify GitHub user: {str(e)}")
+        github_id = None
+
+    return MatchQuery(text=text_blob, keywords=all_keywords, languages=languages, topics=topics,
+                      profile_hash=profile_hash(text_blob_summ), github_id=github_id)
+
+
 @router.get(
     "/match-issue",
     response_model=MatchResponse,
@@ -48,6 +140,8 @@ async def match_issues(
         languages: List[str] = Query(default=[], description="Programming languages to match"),
         topics: List[str] = Query(default=[], description="Topics of interest to match"),
         max_results: int = Query(10, description="Maximum number of results to return"),
+        refresh: bool = Query(False, description="Refetch the GitHub profile and recompute cached results"),
+        cache: bool = Query(True, description="Serve and store results in the match result cache"),
         token: str = Depends(get_github_token)
 ):
     """
@@ -62,63 +156,26 @@ async def match_issues(
     try:
         logger.info(f"Matching issues with: Keywords={keywords}, Languages={languages}, Topics={topics}")
 
-        # Try to get additional profile data if token is valid
-        try:
-            profile_data = await get_profile_text_data(token)
-
-            # Add profile keywords if we don't have any
-            if not keywords and "keywords" in profile_data:
-                keywords = profile_data.get("keywords", [])
-                logger.info(f"Using profile keywords: {keywords}")
-
-            # Add profile languages if we don't have any
-            if not languages and "languages" in profile_data:
-                languages = profile_data.get("languages", [])
-                logger.info(f"Using profile languages: {languages}")
-
-            # Add profile topics if we don't have any
-            if not topics and "topics" in profile_data:
-                topics = profile_data.get("topics", [])
-                logger.info(f"Using profile topics: {topics}")
+        query = await build_match_query(request, token, keywords, languages, topics, refresh)
 
-            # # Get the text blob for semantic matching
-            text_blob_summ = profile_data.get("text_blob", "")
+        # Identical requests (same normalized inputs and profile) within the TTL reuse the result
+        result_cache = get_match_cache()
+        cache_key = query.cache_key(max_results)
+        result = result_cache.get(cache_key) if cache and not refresh else None
 
-        except Exception as e:
-            logger.warning(f"Could not get profile data: {str(e)}")
-            # Continue with what we have from the request
-            text_blob_summ = ""
-
-        # Create a query text from keywords, languages, and topics if no text_blob
-        text_blob = ""
-        query_parts = []
-        if keywords:
-            query_parts.append("Keywords: " + ", ".join(keywords))
-        if languages:
-            query_parts.append("Languages: " + ", ".join(languages))
-        if topics:
-            query_parts.append("Topics: " + ", ".join(topics))
-
-            text_blob = ". ".join(query_parts) if query_parts else "open source issues"
-
-        text_blob = text_blob + ". " + text_blob_summ
-
-
-        logger.info(f"Using query text: {text_blob[:100]}...")
-
-        # Combine topics with keywords for better search
-        all_keywords = keywords.copy()
-        if topics:
-            all_keywords.extend(topics)
-
-        # Get top matched issues
-        result = get_top_matched_issues(
-            query_text=text_blob,
-            keywords=all_keywords,
-            languages=languages,
-            top_k=max_results,
-            github_token=token
-        )
+        if result is None:
+            # Get top matched issues
+            result = await get_top_matched_issues(
+                query_text=query.text,
+                keywords=query.keywords,
+                languages=query.languages,
+                top_k=max_results,
+                github_token=token,
+                query_vector=await query.resolve_vector()
+            )
+            # Results served while the index refreshes in the background would go stale in the cache
+            if cache and result["recommendations"] and not result.get("refreshing"):
+                result_cache.put(cache_key, result)
 
         # Convert to response model
         response = MatchResponse(
@@ -130,6 +187,12 @@ async def match_issues(
 
         return response
 
+    except ExecutorBusy as e:
+        logger.warning(f"Match request rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Matching is busy, please retry shortly."
+        )
     except Exception as e:
         logger.error(f"Error in match_issues endpoint: {str(e)}")
         import traceback
@@ -137,4 +200,85 @@ async def match_issues(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to match issues: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _encode_event(event: Dict[str, Any], stream_format: str) -> str:
+    data = json.dumps(jsonable_encoder(event))
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@router.get(
+    "/match-issue/stream",
+    summary="Stream issue matches as they are ranked",
+    tags=["Matching", "Recommendations"]
+)
+async def stream_match_issues(
+        request: Request,
+        keywords: List[str] = Query(default=[], description="Technical keywords/skills to match"),
+        languages: List[str] = Query(default=[], description="Programming languages to match"),
+        topics: List[str] = Query(default=[], description="Topics of interest to match"),
+        max_results: int = Query(10, description="Maximum number of results to return"),
+        refresh: bool = Query(False, description="Refetch the GitHub profile and recompute cached results"),
+        cache: bool = Query(True, description="Serve and store results in the match result cache"),
+        stream_format: str = Query("ndjson", alias="format", description="'ndjson' or 'sse' (Server-Sent Events)"),
+        token: str = Depends(get_github_token)
+):
+    """
+    Streaming variant of /match-issue.
+
+    Emits a "started" event immediately, a "provisional" ranking as soon as
+    the first keyword searches are embedded and scored, "refined" rankings as
+    more searches complete, and a "final" event carrying the same fields as
+    the /match-issue response. A cached result is sent as the "final" event
+    straight away. Failures are reported as an "error" event.
+    """
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="format must be 'ndjson' or 'sse'")
+
+    async def events() -> AsyncIterator[str]:
+        yield _encode_event({"event": "started"}, stream_format)
+        try:
+            query = await build_match_query(request, token, keywords, languages, topics, refresh)
+            result_cache = get_match_cache()
+            cache_key = query.cache_key(max_results)
+            cached = result_cache.get(cache_key) if cache and not refresh else None
+            if cached is not None:
+                yield _encode_event({"event": "final", **cached}, stream_format)
+                return
+
+            async for event in stream_top_matched_issues(
+                query_text=query.text,
+                keywords=query.keywords,
+                languages=query.languages,
+                top_k=max_results,
+                github_token=token,
+                query_vector=await query.resolve_vector()
+            ):
+                if await request.is_disconnected():
+                    logger.info("Match stream client disconnected")
+                    return
+                if event["event"] == "final" and cache and event["recommendations"]:
+                    result_cache.put(cache_key, {key: value for key, value in event.items() if key != "event"})
+                event["recommendations"] = [IssueResult(**issue) for issue in event["recommendations"]]
+                yield _encode_event(event, stream_format)
+        except ExecutorBusy as e:
+            logger.warning(f"Match stream rejected: {str(e)}")
+            yield _encode_event({"event": "error", "status": 503,
+                                 "detail": "Matching is busy, please retry shortly."}, stream_format)
+        except Exception as e:
+            logger.error(f"Error in stream_match_issues endpoint: {str(e)}")
+            yield _encode_event({"event": "error", "status": 500,
+                                 "detail": f"Failed to match issues: {str(e)}"}, stream_format)
+
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,61 @@
+import asyncio
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Any, Dict, Optional
+from ....core.config import settings
+from ....services.embedding_cache import get_embedding_cache
+from ....services.github_cache import get_github_cache
+from ....services.github_rate_limit import get_rate_limiter
+from ....services.github_service import get_profile_cache, get_single_flight_stats
+from ....services.github_identity import get_identity_cache
+from ....services.match_cache import get_match_cache
+from ....services.leaderboard_cache import get_leaderboard_cache
+from ....services import issue_index as issue_index_service
+from ....services import mongo_indexes
+from ....services import executor, embedding_service
+
+router = APIRouter()
+
+
+async def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Guards the metrics endpoint: hidden unless METRICS_TOKEN is configured,
+    then only served to requests bearing that token.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+@router.get("/", response_model=Dict[str, Any], dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    """
+    Reports in-process cache and service statistics for this worker.
+    """
+    embedding_cache = get_embedding_cache()
+    github_cache = get_github_cache()
+    issue_index = issue_index_service.issue_index
+    return {
+        "embedding_cache": await asyncio.to_thread(embedding_cache.stats) if embedding_cache is not None else None,
+        "github_cache": await asyncio.to_thread(github_cache.stats) if github_cache is not None else None,
+        "issue_index": ({
+            "issues": len(issue_index),
+            "engine": issue_index.engine_name,
+            "compression": issue_index.compression,
+            "bytes_per_vector": issue_index.bytes_per_vector,
+            "snapshot": issue_index.snapshot_version,
+        } if issue_index is not None else None),
+        "github_rate_limit": get_rate_limiter().snapshot(),
+        "github_single_flight": get_single_flight_stats(),
+        "profile_cache": get_profile_cache().stats(),
+        "identity_cache": get_identity_cache().stats(),
+        "match_cache": get_match_cache().stats(),
+        "leaderboard_cache": get_leaderboard_cache().stats(),
+        "mongo_indexes": mongo_indexes.index_report,
+        "cpu_executor": executor.cpu_executor.stats() if executor.cpu_executor is not None else None,
+        "embedding_batcher": (embedding_service.embedding_service.stats()
+                              if embedding_service.embedding_service is not None else None),
+    }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth, github, match, ai
+from .endpoints import auth, github, match, ai, metrics
 from app.routers import leaderboard, referral, mentor, skills, contributions
 
 api_router = APIRouter()
@@ -8,6 +8,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(github.router, prefix="/github", tags=["github"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
 api_router.include_router(match.router, prefix="/match", tags=["match"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(skills.router, tags=["skills"])
 api_router.include_router(contributions.router, tags=["contributions"])
 api_router.include_router(leaderboard.router, tags=["leaderboard"])
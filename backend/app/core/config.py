@@ -13,10 +13,93 @@ class Settings(BaseSettings):
     SECRET_KEY: str
 
     MONGODB_URI: str
+    # Create missing indexes from services/mongo_indexes.py at startup
+    MONGODB_ENSURE_INDEXES: bool = True
+
+    # Bearer token for /api/v1/metrics; the endpoint is disabled (404) when unset
+    METRICS_TOKEN: Optional[str] = None
 
     SHEETS_ID: Optional[str] = None
     GOOGLE_AI_STUDIO_API_KEY: Optional[str] = None
 
+    # Outbound HTTP (shared client)
+    HTTP_HTTP2: bool = False
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 20.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+
+    # GitHub response cache (ETag revalidation, shared by workers on a host)
+    GITHUB_CACHE_PATH: Optional[str] = "data/github_cache.sqlite3"
+    GITHUB_CACHE_MAX_ENTRIES: int = 20000
+
+    # GitHub rate-limit scheduling
+    GITHUB_RATE_LIMIT_MAX_WAIT: float = 10.0
+    GITHUB_RATE_LIMIT_BACKGROUND_RESERVE: float = 0.2
+    GITHUB_RATE_LIMIT_SECONDARY_BACKOFF: float = 5.0
+
+    # GitHub identity (GET /user) cache, per session and per token hash
+    GITHUB_IDENTITY_TTL: float = 600.0
+    GITHUB_IDENTITY_MAX_ENTRIES: int = 10000
+
+    # Top-N leaderboard cache; writes in this worker invalidate it, the TTL covers other workers
+    LEADERBOARD_CACHE_TTL: float = 30.0
+
+    # Match result cache, keyed by normalized request inputs and profile hash
+    MATCH_CACHE_TTL: float = 120.0
+    MATCH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Profile harvesting: "graphql" (one or two queries, README blobs inline) or "rest"
+    # (one call per README); graphql falls back to rest if the query fails
+    GITHUB_PROFILE_FETCH: str = "graphql"
+
+    # Per-user profile text cache (stale-while-revalidate)
+    PROFILE_CACHE_TTL: float = 900.0
+    PROFILE_CACHE_MAX_STALE: float = 7 * 24 * 3600.0
+    PROFILE_CACHE_MAX_ENTRIES: int = 5000
+
+    # Issue matching
+    GITHUB_SEARCH_CONCURRENCY: int = 5
+    # Serve matches from the (restored) issue index once it holds this many issues
+    # labelled with the request's search keywords, refreshing those keywords from
+    # GitHub in the background; 0 always searches first
+    MATCH_WARM_MIN_ISSUES: int = 50
+    MATCH_INDEX_REFRESH_INTERVAL: float = 900.0
+    ISSUE_INDEX_MAX_ISSUES: int = 50000
+    # Drop indexed issues not returned by a GitHub search for this many seconds
+    # (closed issues stop appearing in the open-issue searches); 0 disables
+    ISSUE_INDEX_MAX_AGE: float = 2 * 24 * 3600.0
+    # Engine crossover points, see scripts/vector_search_benchmark.py. At 384-d
+    # NumPy beats FAISS flat up to 512 vectors in every run, the two are within
+    # noise from 768 to 1536 and flat is ahead from 2048; 1024 keeps NumPy only
+    # where it is no slower. Re-run the benchmark on the target host.
+    VECTOR_SEARCH_NUMPY_MAX: int = 1024
+    VECTOR_SEARCH_FLAT_MAX: int = 200000
+    VECTOR_SEARCH_HNSW_M: int = 32
+    VECTOR_SEARCH_HNSW_EF_SEARCH: int = 64
+    # Compressed corpus vectors: "none", "fp16", "pca" or "ivfpq"
+    # (compare modes with scripts/evaluate_index_modes.py before switching)
+    ISSUE_INDEX_COMPRESSION: str = "none"
+    ISSUE_INDEX_PCA_DIM: int = 128
+    ISSUE_INDEX_PQ_M: int = 48
+    ISSUE_INDEX_IVF_NLIST: int = 1024
+    ISSUE_INDEX_IVF_NPROBE: int = 16
+    # Versioned on-disk snapshots of the issue index, shared by workers via mmap ("" disables)
+    ISSUE_INDEX_SNAPSHOT_DIR: str = "data/issue_index"
+    ISSUE_INDEX_SNAPSHOT_INTERVAL: float = 600.0  # seconds between saves, 0 saves only on shutdown
+    ISSUE_INDEX_SNAPSHOT_KEEP: int = 2
+    MATCH_EXECUTOR_WORKERS: int = 2
+    MATCH_EXECUTOR_MAX_QUEUE: int = 64
+    MATCH_THREADS_PER_WORKER: Optional[int] = None
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_BACKEND: str = "torch"  # "torch" or "onnx" (int8 quantized, CPU)
+    EMBEDDING_ONNX_FILE: Optional[str] = None
+    EMBEDDING_CACHE_PATH: Optional[str] = "data/embedding_cache.sqlite3"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200000
+    EMBEDDING_CACHE_DTYPE: str = "float16"
+
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
         case_sensitive = True
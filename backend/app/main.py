@@ -1,16 +1,55 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 from contextlib import asynccontextmanager
 
 from .core.config import settings
 from .api.v1.router import api_router as api_router_v1
-from .services.mongodb_service import connect_to_mongo, close_mongo_connection
+from .services.mongodb_service import connect_to_mongo, close_mongo_connection, mongodb
+from .services.mongo_indexes import ensure_indexes
+from .services.http_client import open_http_client, close_http_client
+from .services.github_cache import open_github_cache, close_github_cache
+from .services.github_rate_limit import configure_rate_limiter
+from .services.executor import open_cpu_executor, close_cpu_executor
+from .services.embedding_service import open_embedding_service, close_embedding_service
+from .services.issue_index import open_issue_index, close_issue_index
+from .services.index_snapshot import run_snapshot_loop
+from .services.embedding_cache import open_embedding_cache, close_embedding_cache
+from .services.faiss_search import embedding_model_id
+from .services.registry import registry
+from .services.pagination import NEXT_CURSOR_HEADER
+from .services import vertex_ai_service  # noqa: F401  (registers the language client)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    if mongodb.db is not None and settings.MONGODB_ENSURE_INDEXES:
+        await ensure_indexes(mongodb.db)
+    await open_http_client()
+    open_github_cache()
+    configure_rate_limiter()
+    open_cpu_executor()
+    open_embedding_service()
+    # Restores the latest index snapshot, so a restart needs no GitHub calls to match well
+    open_issue_index(embedding_model_id())
+    open_embedding_cache(embedding_model_id())
+    snapshot_task = None
+    if settings.ISSUE_INDEX_SNAPSHOT_INTERVAL > 0:
+        snapshot_task = asyncio.create_task(run_snapshot_loop(settings.ISSUE_INDEX_SNAPSHOT_INTERVAL))
+    # Load models and cloud clients in the background; /ready reports progress
+    warmup_task = asyncio.create_task(registry.warmup())
     yield
+    warmup_task.cancel()
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    close_embedding_cache()
+    close_issue_index()
+    await close_embedding_service()
+    close_cpu_executor()
+    close_github_cache()
+    await close_http_client()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -36,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.add_middleware(
@@ -47,5 +87,13 @@ app.add_middleware(
 async def read_root():
     return {"message": f"Welcome to {settings.PROJECT_NAME} API"}
 
+@app.get("/ready", tags=["Status"])
+async def readiness():
+    """
+    Readiness probe: 200 once every required service has finished warming up, 503 before.
+    """
+    status = registry.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 app.include_router(api_router_v1, prefix=settings.API_V1_STR)
 
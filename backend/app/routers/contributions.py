@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
+from typing import Optional
 from app.services.mongodb_service import get_database
+from app.services.leaderboard_cache import invalidate_leaderboard
+from app.services.pagination import MAX_PAGE_SIZE, InvalidCursor, clamp_page_size, fetch_page, page_response
+from app.api.v1.endpoints.auth import get_github_user_id
 from datetime import datetime
 
 router = APIRouter(
@@ -16,22 +20,6 @@ class ContributionCreate(BaseModel):
     status: str  # "opened", "merged", "closed"
     difficulty: str  # "easy", "medium", "hard"
 
-async def get_github_user_id(request: Request) -> str:
-    token = request.session.get('github_token')
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    import httpx
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_data = response.json()
-        return str(user_data["id"])
-
 @router.post("/add")
 async def add_contribution(contribution: ContributionCreate, request: Request):
     try:
@@ -73,6 +61,7 @@ async def add_contribution(contribution: ContributionCreate, request: Request):
             },
             upsert=True
         )
+        invalidate_leaderboard()
         
         return {
             "id": str(result.inserted_id),
@@ -85,13 +74,28 @@ async def add_contribution(contribution: ContributionCreate, request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+CONTRIBUTION_LIST_FIELDS = {
+    "issueUrl": 1, "issueTitle": 1, "repoName": 1, "prUrl": 1,
+    "status": 1, "difficulty": 1, "points": 1, "createdAt": 1
+}
+
 @router.get("/my-contributions")
-async def get_my_contributions(request: Request):
+async def get_my_contributions(request: Request, response: Response, limit: Optional[int] = None,
+                               cursor: Optional[str] = None):
+    """
+    Newest contributions first, one page at a time. With limit or cursor the response
+    is {"items", "nextCursor"}; pass nextCursor back as cursor for the next page.
+    Without either it stays a plain list of the first page, as before, with the
+    next cursor in the X-Next-Cursor header.
+    """
     try:
         user_id = await get_github_user_id(request)
         db = get_database()
         
-        contributions = await db.contributions.find({"userId": user_id}).sort("createdAt", -1).to_list(None)
+        contributions, next_cursor = await fetch_page(
+            db.contributions, {"userId": user_id}, CONTRIBUTION_LIST_FIELDS,
+            clamp_page_size(limit, default=MAX_PAGE_SIZE), cursor
+        )
         
         result = []
         for contrib in contributions:
@@ -107,6 +111,10 @@ async def get_my_contributions(request: Request):
                 "createdAt": contrib.get("createdAt")
             })
         
-        return result
+        return page_response(result, next_cursor, limit is not None or cursor is not None, response)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
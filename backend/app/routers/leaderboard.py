@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from app.services.mongodb_service import get_database
+from app.services.pagination import clamp_page_size
+from app.services.leaderboard_cache import MAX_LEADERBOARD_LIMIT, get_leaderboard_cache
 from typing import List, Optional
 
 router = APIRouter(
@@ -7,53 +9,120 @@ router = APIRouter(
     tags=["leaderboard"],
 )
 
+MAX_RANK_WINDOW = 25
+
+LEADERBOARD_FIELDS = {
+    "_id": 0, "githubId": 1, "username": 1, "avatarUrl": 1, "score": 1,
+    "contributions": 1, "mentorships": 1, "referrals": 1, "skills": 1
+}
+
+# Leaderboard order: score descending, ties broken by githubId (see the mongo_indexes spec)
+LEADERBOARD_SORT = [("score", -1), ("githubId", 1)]
+
+def _entry(entry: dict) -> dict:
+    return {
+        "id": entry.get("githubId"),
+        "username": entry.get("username"),
+        "avatarUrl": entry.get("avatarUrl"),
+        "score": entry.get("score", 0),
+        "contributions": entry.get("contributions", 0),
+        "mentorships": entry.get("mentorships", 0),
+        "referrals": entry.get("referrals", 0),
+        "skills": entry.get("skills", [])
+    }
+
+def _ahead_of(score, github_id: str) -> dict:
+    """ Filter for the entries ranked above (score, github_id) in LEADERBOARD_SORT order. """
+    return {"$or": [{"score": {"$gt": score}}, {"score": score, "githubId": {"$lt": github_id}}]}
+
+def _behind(score, github_id: str) -> dict:
+    return {"$or": [{"score": {"$lt": score}}, {"score": score, "githubId": {"$gt": github_id}}]}
+
+async def _rank_of(db, user: dict, base_query: dict) -> dict:
+    """
+    Rank and percentile of a leaderboard entry. Both counts are range counts
+    over the (score, githubId) index, so no documents are fetched.
+    """
+    ahead = await db.leaderboard.count_documents({**base_query, **_ahead_of(user.get("score", 0), user["githubId"])})
+    if base_query:
+        total = await db.leaderboard.count_documents(base_query)
+    else:
+        total = await db.leaderboard.estimated_document_count()
+    rank = ahead + 1
+    total = max(total, rank)
+    return {
+        "rank": rank,
+        "total": total,
+        # Share of users ranked at or below this user
+        "percentile": round(100.0 * (total - rank + 1) / total, 2)
+    }
+
+async def _load_top(skill_filter: Optional[str]) -> List[dict]:
+    db = get_database()
+    
+    query = {}
+    if skill_filter:
+        query["skills"] = skill_filter
+    
+    leaderboard = await (db.leaderboard.find(query, LEADERBOARD_FIELDS).sort(LEADERBOARD_SORT)
+                         .limit(MAX_LEADERBOARD_LIMIT).to_list(MAX_LEADERBOARD_LIMIT))
+    return [_entry(entry) for entry in leaderboard]
+
 @router.get("/")
 async def get_leaderboard(skill_filter: Optional[str] = None, limit: int = 100):
+    """ Top entries, served from the in-process cache until a leaderboard write or the TTL. """
+    try:
+        limit = clamp_page_size(limit, default=MAX_LEADERBOARD_LIMIT, maximum=MAX_LEADERBOARD_LIMIT)
+        return await get_leaderboard_cache().top(skill_filter or None, limit, _load_top)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/user/{user_id}")
+async def get_user_score(user_id: str):
     try:
         db = get_database()
+        user = await db.leaderboard.find_one({"githubId": user_id}, LEADERBOARD_FIELDS)
         
-        query = {}
-        if skill_filter:
-            query["skills"] = skill_filter
-        
-        leaderboard = await db.leaderboard.find(query).sort("score", -1).limit(limit).to_list(limit)
-        
-        result = []
-        for entry in leaderboard:
-            result.append({
-                "id": entry.get("githubId"),
-                "username": entry.get("username"),
-                "avatarUrl": entry.get("avatarUrl"),
-                "score": entry.get("score", 0),
-                "contributions": entry.get("contributions", 0),
-                "mentorships": entry.get("mentorships", 0),
-                "referrals": entry.get("referrals", 0),
-                "skills": entry.get("skills", [])
-            })
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found in leaderboard")
         
-        return result
+        return {**_entry(user), **await _rank_of(db, user, {})}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/user/{user_id}")
-async def get_user_score(user_id: str):
+@router.get("/user/{user_id}/around")
+async def get_user_neighbourhood(user_id: str, skill_filter: Optional[str] = None, window: int = 5):
+    """
+    A user's rank and percentile with up to `window` entries directly above and below,
+    optionally within the users having a skill.
+    """
     try:
         db = get_database()
-        user = await db.leaderboard.find_one({"githubId": user_id})
+        window = clamp_page_size(window, default=5, maximum=MAX_RANK_WINDOW)
         
+        query = {}
+        if skill_filter:
+            query["skills"] = skill_filter
+        
+        user = await db.leaderboard.find_one({**query, "githubId": user_id}, LEADERBOARD_FIELDS)
         if not user:
             raise HTTPException(status_code=404, detail="User not found in leaderboard")
         
-        return {
-            "id": user.get("githubId"),
-            "username": user.get("username"),
-            "avatarUrl": user.get("avatarUrl"),
-            "score": user.get("score", 0),
-            "contributions": user.get("contributions", 0),
-            "mentorships": user.get("mentorships", 0),
-            "referrals": user.get("referrals", 0),
-            "skills": user.get("skills", [])
-        }
+        score = user.get("score", 0)
+        position = await _rank_of(db, user, query)
+        above = await (db.leaderboard.find({**query, **_ahead_of(score, user_id)}, LEADERBOARD_FIELDS)
+                       .sort([("score", 1), ("githubId", -1)]).limit(window).to_list(window))
+        below = await (db.leaderboard.find({**query, **_behind(score, user_id)}, LEADERBOARD_FIELDS)
+                       .sort(LEADERBOARD_SORT).limit(window).to_list(window))
+        
+        rank = position["rank"]
+        entries = [{**_entry(entry), "rank": rank - offset} for offset, entry in enumerate(above, start=1)][::-1]
+        entries.append({**_entry(user), "rank": rank})
+        entries.extend({**_entry(entry), "rank": rank + offset} for offset, entry in enumerate(below, start=1))
+        
+        return {**position, "user": _entry(user), "entries": entries}
     except HTTPException:
         raise
     except Exception as e:
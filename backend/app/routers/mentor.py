@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.services.mongodb_service import get_database
-from typing import List
+from app.api.v1.endpoints.auth import get_github_user_id
+from app.services.pagination import MAX_PAGE_SIZE, InvalidCursor, clamp_page_size, fetch_page, page_response
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -19,22 +21,6 @@ class MentorshipRequest(BaseModel):
     mentorId: str
     message: str
 
-async def get_github_user_id(request: Request) -> str:
-    token = request.session.get('github_token')
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    import httpx
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_data = response.json()
-        return str(user_data["id"])
-
 @router.post("/suggest")
 async def suggest_mentors(request: MentorSuggestionRequest):
     try:
@@ -107,13 +93,28 @@ async def send_mentor_request(mentor_request: MentorshipRequest, request: Reques
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+MENTORSHIP_REQUEST_LIST_FIELDS = {
+    "requesterId": 1, "requesterName": 1, "requesterAvatarUrl": 1, "requesterEmail": 1,
+    "message": 1, "status": 1, "createdAt": 1, "updatedAt": 1
+}
+
 @router.get("/requests")
-async def get_mentorship_requests(request: Request):
+async def get_mentorship_requests(request: Request, response: Response, limit: Optional[int] = None,
+                                  cursor: Optional[str] = None):
+    """
+    Newest requests first, one page at a time. With limit or cursor the response
+    is {"items", "nextCursor"}; pass nextCursor back as cursor for the next page.
+    Without either it stays a plain list of the first page, as before, with the
+    next cursor in the X-Next-Cursor header.
+    """
     try:
         user_id = await get_github_user_id(request)
         db = get_database()
         
-        requests = await db.mentorship_requests.find({"mentorGithubId": user_id}).to_list(None)
+        requests, next_cursor = await fetch_page(
+            db.mentorship_requests, {"mentorGithubId": user_id}, MENTORSHIP_REQUEST_LIST_FIELDS,
+            clamp_page_size(limit, default=MAX_PAGE_SIZE), cursor
+        )
         
         result = []
         for req in requests:
@@ -129,7 +130,9 @@ async def get_mentorship_requests(request: Request):
                 "updatedAt": req.get("updatedAt")
             })
         
-        return result
+        return page_response(result, next_cursor, limit is not None or cursor is not None, response)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
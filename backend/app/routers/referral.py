@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from app.services.mongodb_service import get_database
+from app.services.leaderboard_cache import invalidate_leaderboard
+from app.api.v1.endpoints.auth import get_github_user_id
 import secrets
 from datetime import datetime
 from bson import ObjectId
@@ -24,22 +26,6 @@ class ReferralResponse(BaseModel):
 def generate_referral_code():
     return secrets.token_urlsafe(6).upper().replace('-', '').replace('_', '')[:8]
 
-async def get_github_user_id(request: Request) -> str:
-    token = request.session.get('github_token')
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    import httpx
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_data = response.json()
-        return str(user_data["id"])
-
 @router.post("/generate-code", response_model=dict)
 async def generate_code(request: Request):
     try:
@@ -71,17 +57,26 @@ async def get_referral_stats(request: Request):
         user_id = await get_github_user_id(request)
         db = get_database()
         
-        referrals = await db.referrals.find({"referrerId": user_id}).to_list(None)
-        
-        total_referrals = len(referrals)
-        successful_referrals = sum(1 for r in referrals if r.get("status") == "completed")
-        points_earned = sum(r.get("pointsAwarded", 0) for r in referrals)
+        # Totals are computed by the server over the referrerId index; one document comes back
+        pipeline = [
+            {"$match": {"referrerId": user_id}},
+            {"$group": {
+                "_id": None,
+                "totalReferrals": {"$sum": 1},
+                "successfulReferrals": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                "pointsEarned": {"$sum": {"$ifNull": ["$pointsAwarded", 0]}}
+            }}
+        ]
+        totals = await db.referrals.aggregate(pipeline).to_list(1)
+        totals = totals[0] if totals else {}
         
         return {
-            "totalReferrals": total_referrals,
-            "successfulReferrals": successful_referrals,
-            "pointsEarned": points_earned
+            "totalReferrals": totals.get("totalReferrals", 0),
+            "successfulReferrals": totals.get("successfulReferrals", 0),
+            "pointsEarned": totals.get("pointsEarned", 0)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -144,6 +139,7 @@ async def complete_referral(referral: ReferralCreate, request: Request):
             },
             upsert=True
         )
+        invalidate_leaderboard()
         
         return {
             "id": str(result.inserted_id),
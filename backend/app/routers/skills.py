@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import List
 from app.services.mongodb_service import get_database
+from app.services.leaderboard_cache import invalidate_leaderboard
+from app.api.v1.endpoints.auth import get_github_user, get_github_user_id
 from datetime import datetime
 
 router = APIRouter(
@@ -12,37 +14,13 @@ router = APIRouter(
 class SkillsSubmit(BaseModel):
     skills: List[str]
 
-async def get_github_user_id(request: Request) -> str:
-    token = request.session.get('github_token')
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    import httpx
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_data = response.json()
-        return str(user_data["id"])
-
 @router.post("/submit")
 async def submit_skills(skills_data: SkillsSubmit, request: Request):
     try:
-        user_id = await get_github_user_id(request)
+        github_user = await get_github_user(request)
+        user_id = str(github_user["id"])
         db = get_database()
         
-        token = request.session.get('github_token')
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/user",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            github_user = response.json()
-        
         user = await db.users.find_one({"githubId": user_id})
         referral_code = user.get("referralCode") if user else None
         
@@ -122,6 +100,7 @@ async def submit_skills_with_referral(skills_data: SkillsSubmit, request: Reques
                     },
                     upsert=True
                 )
+                invalidate_leaderboard()
         
         return await submit_skills(skills_data, request)
     except Exception as e:
@@ -0,0 +1,183 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    issue_id INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, issue_id, version)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of issue embeddings backed by SQLite.
+
+    Entries are keyed by (model name, issue id, issue version) and stored as
+    compact float16 or float32 blobs. Opening the cache with a different model
+    drops the old model's entries. When the cache grows past max_entries the
+    least recently used entries are evicted; the size is checked once per
+    1% of max_entries written, so it may overshoot by that much per worker.
+    """
+
+    def __init__(self, path: str, model_name: str, max_entries: int = 200000, dtype: str = "float16"):
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Rows written since the last size check, and how many to allow between checks
+        self._written = 0
+        self._evict_every = max(100, max_entries // 100)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # WAL lets several uvicorn workers read while one writes
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        with self._conn:
+            dropped = self._conn.execute(
+                "DELETE FROM embeddings WHERE model != ?", (model_name,)
+            ).rowcount
+        if dropped:
+            logger.info(f"Dropped {dropped} cached embeddings from other models")
+
+    def get_many(self, keys: List[Tuple[int, str]]) -> Dict[Tuple[int, str], np.ndarray]:
+        """
+        Look up embeddings for (issue id, version) keys.
+
+        Returns:
+            Mapping of the keys that were found to float32 vectors
+        """
+        if not keys:
+            return {}
+        found: Dict[Tuple[int, str], np.ndarray] = {}
+        with self._lock:
+            for issue_id, version in keys:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE model = ? AND issue_id = ? AND version = ?",
+                    (self.model_name, issue_id, version),
+                ).fetchone()
+                if row is not None:
+                    found[(issue_id, version)] = np.frombuffer(row[0], dtype=self.dtype).astype("float32")
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE model = ? AND issue_id = ? AND version = ?",
+                        [(now, self.model_name, issue_id, version) for issue_id, version in found],
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[Tuple[int, str]], vectors: np.ndarray) -> None:
+        """ Store one vector per (issue id, version) key, replacing older versions of the issue. """
+        if not keys:
+            return
+        now = time.time()
+        rows = [
+            (self.model_name, issue_id, version, int(vector.shape[0]),
+             np.asarray(vector, dtype=self.dtype).tobytes(), now)
+            for (issue_id, version), vector in zip(keys, vectors)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM embeddings WHERE model = ? AND issue_id = ?",
+                [(self.model_name, issue_id) for issue_id, _ in keys],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, issue_id, version, dim, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._written += len(rows)
+            if self._written >= self._evict_every:
+                self._written = 0
+                self._evict()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        # The rowid span bounds the row count from above and is two b-tree lookups;
+        # only count exactly when it could be over the cap
+        low, high = self._conn.execute("SELECT MIN(rowid), MAX(rowid) FROM embeddings").fetchone()
+        if high is None or high - low + 1 <= self.max_entries:
+            return
+        entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = entries - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            )
+            logger.info(f"Evicted {overflow} least recently used embeddings")
+
+
+embedding_cache: Optional[EmbeddingCache] = None
+
+
+def open_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """ Open the process-wide embedding cache. Called from the app lifespan. """
+    global embedding_cache
+    from app.core.config import settings
+    if not settings.EMBEDDING_CACHE_PATH:
+        return None
+    try:
+        embedding_cache = EmbeddingCache(
+            settings.EMBEDDING_CACHE_PATH,
+            model_name,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            dtype=settings.EMBEDDING_CACHE_DTYPE,
+        )
+        logger.info(f"Embedding cache opened at {settings.EMBEDDING_CACHE_PATH}")
+    except Exception as e:
+        logger.error(f"Could not open embedding cache: {str(e)}")
+        embedding_cache = None
+    return embedding_cache
+
+
+def close_embedding_cache() -> None:
+    global embedding_cache
+    if embedding_cache is not None:
+        embedding_cache.close()
+        embedding_cache = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    return embedding_cache
@@ -0,0 +1,168 @@
+import asyncio
+import bisect
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .executor import get_cpu_executor
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_WAIT_MS_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 1000]
+
+
+class Histogram:
+    """ Fixed-bucket histogram; the last bucket counts values above the largest bound. """
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.samples = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.samples += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.samples,
+            "mean": self.total / self.samples if self.samples else 0.0,
+        }
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent encode requests and runs them as one batched encode.
+
+    The first queued request waits at most max_wait_ms for others to join;
+    a batch is sent as soon as it reaches max_batch_size texts. Batches run
+    on the CPU executor and each caller's future receives its own rows.
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_concurrent_batches: int = 2):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_MS_BUCKETS)
+        self._max_concurrent_batches = max_concurrent_batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batches = set()
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """ Encode texts, sharing a model batch with concurrent callers. """
+        if not texts:
+            return np.empty((0, 0), dtype="float32")
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future, time.perf_counter()))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_concurrent_batches)
+            self._worker = asyncio.create_task(self._collect())
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            first = await self._queue.get()
+            batch = [first]
+            size = len(first[0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[List[str], asyncio.Future, float]]) -> None:
+        try:
+            started = time.perf_counter()
+            texts = [text for item in batch for text in item[0]]
+            for _, _, enqueued_at in batch:
+                self.queue_wait_ms.observe((started - enqueued_at) * 1000.0)
+            self.batch_sizes.observe(len(texts))
+            try:
+                vectors = await get_cpu_executor().run(self.encode_fn, texts)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            offset = 0
+            for item_texts, future, _ in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+        finally:
+            self._slots.release()
+
+
+embedding_service: Optional[EmbeddingBatcher] = None
+
+
+def open_embedding_service() -> EmbeddingBatcher:
+    """ Create the shared embedding batcher. Called from the app lifespan. """
+    global embedding_service
+    from app.core.config import settings
+    from .faiss_search import encode_texts
+    embedding_service = EmbeddingBatcher(
+        encode_texts,
+        max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+        max_concurrent_batches=max(1, settings.MATCH_EXECUTOR_WORKERS),
+    )
+    return embedding_service
+
+
+async def close_embedding_service() -> None:
+    global embedding_service
+    if embedding_service is not None:
+        await embedding_service.close()
+        embedding_service = None
+
+
+def get_embedding_service() -> EmbeddingBatcher:
+    """ Return the shared embedding batcher, creating it if the lifespan has not run. """
+    if embedding_service is None:
+        return open_embedding_service()
+    return embedding_service
@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class ExecutorBusy(Exception):
+    """ Raised when the CPU executor queue is full. """
+
+
+class CPUExecutor:
+    """
+    Bounded thread pool for CPU-bound matching work (embedding, FAISS).
+
+    Keeps model.encode and index searches off the event loop. Submissions
+    beyond max_queue waiting jobs are rejected with ExecutorBusy so a burst
+    of match requests cannot pile up unbounded work.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="match-cpu")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusy(f"CPU executor queue is full ({self.queued} jobs waiting)")
+            self.queued += 1
+        try:
+            future = self._pool.submit(functools.partial(self._call, fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            raise
+        # _call releases the queue slot when the job starts; a job cancelled
+        # before it starts (caller cancelled, pool shut down) releases it here
+        future.add_done_callback(self._release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _release_if_cancelled(self, future: "Future[Any]") -> None:
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def configure_cpu_threads(threads: int) -> None:
+    """
+    Cap Torch/FAISS/OpenMP threads for this worker so that executor threads
+    times library threads does not oversubscribe the cores.
+
+    The environment variables take effect for libraries imported later (the
+    model loads lazily); libraries that are already imported are set directly.
+    """
+    for var in _THREAD_ENV_VARS:
+        os.environ.setdefault(var, str(threads))
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+    if "faiss" in sys.modules:
+        sys.modules["faiss"].omp_set_num_threads(threads)
+    logger.info(f"CPU library threads per executor thread: {threads}")
+
+
+cpu_executor: Optional[CPUExecutor] = None
+
+
+def open_cpu_executor() -> CPUExecutor:
+    """ Create the CPU executor and size library thread pools. Called from the app lifespan. """
+    global cpu_executor
+    from app.core.config import settings
+    workers = max(1, settings.MATCH_EXECUTOR_WORKERS)
+    threads = settings.MATCH_THREADS_PER_WORKER
+    if not threads:
+        uvicorn_workers = int(os.environ.get("WEB_CONCURRENCY", "1") or 1)
+        threads = max(1, (os.cpu_count() or 1) // (workers * max(1, uvicorn_workers)))
+    configure_cpu_threads(threads)
+    cpu_executor = CPUExecutor(max_workers=workers, max_queue=settings.MATCH_EXECUTOR_MAX_QUEUE)
+    logger.info(f"CPU executor ready with {workers} workers")
+    return cpu_executor
+
+
+def close_cpu_executor() -> None:
+    global cpu_executor
+    if cpu_executor is not None:
+        cpu_executor.shutdown()
+        cpu_executor = None
+
+
+def get_cpu_executor() -> CPUExecutor:
+    """ Return the CPU executor, creating it if the lifespan has not run. """
+    if cpu_executor is None:
+        return open_cpu_executor()
+    return cpu_executor
@@ -1,10 +1,19 @@
-import requests
-from sentence_transformers import SentenceTransformer
-import faiss, re
+import asyncio
+import re
+import time
 import numpy as np
-import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, TYPE_CHECKING
 import logging
+from .issue_index import IssueIndex, get_issue_index, issue_text, issue_version
+from .embedding_cache import get_embedding_cache
+from .github_service import github_get
+from .github_rate_limit import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from .executor import get_cpu_executor, ExecutorBusy
+from .embedding_service import get_embedding_service
+from .registry import registry
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -13,57 +22,124 @@ logger = logging.getLogger(__name__)
 # Constants
 TOP_PER_KEYWORD = 5  # Number of issues to fetch per keyword
 MODEL_NAME = "all-MiniLM-L6-v2"  # Sentence transformer model to use
+EMBEDDING_BACKENDS = ("torch", "onnx")
+DEFAULT_ONNX_FILE = "onnx/model_qint8_avx2.onnx"  # int8 dynamically quantized export shipped with the model
+
+
+def embedding_model_id(backend: Optional[str] = None, onnx_file: Optional[str] = None) -> str:
+    """
+    Identifier of the configured embedding model, used to key cached vectors.
+    Quantized ONNX vectors differ slightly from torch ones, so the backend is part of the id.
+    """
+    if backend is None:
+        from app.core.config import settings
+        backend, onnx_file = settings.EMBEDDING_BACKEND, settings.EMBEDDING_ONNX_FILE
+    if backend == "onnx":
+        return f"{MODEL_NAME}+onnx:{onnx_file or DEFAULT_ONNX_FILE}"
+    return MODEL_NAME
 
-# Global variables
-model = None
 
-# Initialize the model
-try:
-    logger.info(f"Loading sentence transformer model: {MODEL_NAME}")
-    model = SentenceTransformer(MODEL_NAME)
-    logger.info("Model loaded successfully")
-except Exception as e:
-    logger.error(f"Error loading model: {str(e)}")
-    model = None
+def load_embedding_model(backend: str = "torch", onnx_file: Optional[str] = None) -> "SentenceTransformer":
+    """
+    Load MODEL_NAME with the given backend.
 
+    Args:
+        backend: "torch" (PyTorch) or "onnx" (ONNX Runtime on CPU)
+        onnx_file: ONNX file inside the model repo, defaults to the int8 quantized export
 
-def fetch_github_issues(keywords: List[str], top_k: int = TOP_PER_KEYWORD, github_token: Optional[str] = None) -> List[
-    Dict[str, Any]]:
+    Returns:
+        Sentence transformer model; encode() behaves the same for both backends
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
+    # Imported here so that importing the app does not pull in torch
+    from sentence_transformers import SentenceTransformer
+    logger.info(f"Loading sentence transformer model: {MODEL_NAME} (backend: {backend})")
+    if backend == "onnx":
+        # Needs the optional ONNX extras: pip install "sentence-transformers[onnx]"
+        return SentenceTransformer(MODEL_NAME, backend="onnx",
+                                   model_kwargs={"file_name": onnx_file or DEFAULT_ONNX_FILE})
+    return SentenceTransformer(MODEL_NAME)
+
+
+def _load_model() -> "SentenceTransformer":
+    from app.core.config import settings
+    loaded = load_embedding_model(settings.EMBEDDING_BACKEND, settings.EMBEDDING_ONNX_FILE)
+    loaded.encode(["warmup"], convert_to_numpy=True)
+    return loaded
+
+
+registry.register("embedding_model", _load_model)
+
+
+# When each search keyword was last fetched into the index, and background refreshes in flight
+_keyword_refreshed_at: Dict[str, float] = {}
+_refresh_tasks: set = set()
+
+
+async def _fetch_keyword_issues(semaphore: asyncio.Semaphore, keyword: str, top_k: int,
+                                github_token: Optional[str],
+                                priority: int = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
+    """
+    Fetch issues for a single keyword, holding a slot of the concurrency limit.
+    """
+    query = f'label:"{keyword}"+state:open+type:issue'
+    url = f"https://api.github.com/search/issues?q={query}&per_page={top_k}"
+
+    async with semaphore:
+        # logger.info(f"Fetching issues for keyword: {keyword}")
+        response = await github_get(url, github_token, timeout=20.0, priority=priority)
+
+    if response.status_code == 200:
+        items = response.json().get('items', [])
+        # logger.info(f"Found {len(items)} issues for keyword: {keyword}")
+        return items[:top_k]  # Take top N only
+
+    logger.error(f"Error for keyword: {keyword}, Status Code: {response.status_code}")
+    if response.status_code in (403, 429):
+        logger.error("Rate limit exceeded or authentication required")
+    elif response.status_code == 401:
+        logger.error("Unauthorized - check your GitHub token")
+    return []
+
+
+async def fetch_github_issues(keywords: List[str], top_k: int = TOP_PER_KEYWORD, github_token: Optional[str] = None,
+                              concurrency: Optional[int] = None,
+                              priority: int = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
     """
     Fetch GitHub issues based on keywords.
 
+    Keyword searches run concurrently, at most `concurrency` at a time.
+    Keywords whose search fails are skipped so partial results are still returned.
+
     Args:
         keywords: List of keywords to search for
         top_k: Number of issues to fetch per keyword
         github_token: GitHub API token for authentication
+        concurrency: Maximum number of searches in flight (defaults to settings)
+        priority: Rate-limiter priority of the searches
 
     Returns:
         List of GitHub issues
     """
     logger.info(f"Fetching GitHub issues for keywords: {keywords}")
 
-    headers = {"Accept": "application/vnd.github+json"}
-    if github_token:
-        headers["Authorization"] = f"Bearer {github_token}"
+    if concurrency is None:
+        from app.core.config import settings
+        concurrency = settings.GITHUB_SEARCH_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-    all_issues = []
-    for keyword in keywords:
-        query = f'label:"{keyword}"+state:open+type:issue'
-        url = f"https://api.github.com/search/issues?q={query}&per_page={top_k}"
+    results = await asyncio.gather(
+        *[_fetch_keyword_issues(semaphore, keyword, top_k, github_token, priority) for keyword in keywords],
+        return_exceptions=True
+    )
 
-        # logger.info(f"Fetching issues for keyword: {keyword}")
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            items = response.json().get('items', [])
-            # logger.info(f"Found {len(items)} issues for keyword: {keyword}")
-            all_issues.extend(items[:top_k])  # Take top N only
-        else:
-            logger.error(f"Error for keyword: {keyword}, Status Code: {response.status_code}")
-            if response.status_code == 403:
-                logger.error("Rate limit exceeded or authentication required")
-            elif response.status_code == 401:
-                logger.error("Unauthorized - check your GitHub token")
+    all_issues = []
+    for keyword, result in zip(keywords, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error for keyword: {keyword}: {str(result)}")
+            continue
+        all_issues.extend(result)
 
     # Deduplicate by URL
     unique_issues = list({issue['html_url']: issue for issue in all_issues}.values())
@@ -72,7 +148,7 @@ def fetch_github_issues(keywords: List[str], top_k: int = TOP_PER_KEYWORD, githu
     return unique_issues
 
 
-def embed_texts(texts: List[str], model: SentenceTransformer) -> np.ndarray:
+def embed_texts(texts: List[str], model: "SentenceTransformer") -> np.ndarray:
     """
     Embed texts using the sentence transformer model.
 
@@ -87,54 +163,76 @@ def embed_texts(texts: List[str], model: SentenceTransformer) -> np.ndarray:
     return model.encode(texts, convert_to_numpy=True)
 
 
-def build_faiss_index(embeddings: np.ndarray) -> faiss.Index:
+def get_model() -> "SentenceTransformer":
+    """ Return the sentence transformer model, loading it on first use. """
+    return registry.get("embedding_model")
+
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """ Embed texts with the shared model as float32. Used by the embedding batcher. """
+    return np.asarray(embed_texts(texts, get_model()), dtype="float32")
+
+
+async def embed_issues(issues: List[Dict[str, Any]]) -> np.ndarray:
     """
-    Build a FAISS index from embeddings.
+    Embed issues, reusing vectors from the on-disk embedding cache.
+    Cache misses are encoded through the shared embedding batcher.
 
     Args:
-        embeddings: Array of embeddings
+        issues: GitHub issues to embed
 
     Returns:
-        FAISS index
+        Array of embeddings, one row per issue
     """
-    logger.info("Building FAISS index")
-    dim = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dim)
-    index.add(embeddings)
-    logger.info(f"FAISS index built with {index.ntotal} vectors of dimension {dim}")
-    return index
-
-
-def search_similar_issues(query_text: str, model: SentenceTransformer, index: faiss.Index,
-                          all_issues: List[Dict[str, Any]], top_k: int = 5) -> List[Dict[str, Any]]:
+    service = get_embedding_service()
+    cache = get_embedding_cache()
+    if cache is None:
+        return await service.encode([issue_text(issue) for issue in issues])
+
+    keys = [(issue['id'], issue_version(issue)) for issue in issues]
+    cached = await asyncio.to_thread(cache.get_many, keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    logger.info(f"Embedding cache: {len(cached)} hits, {len(missing)} misses")
+
+    fresh = None
+    if missing:
+        fresh = await service.encode([issue_text(issues[i]) for i in missing])
+        await asyncio.to_thread(cache.put_many, [keys[i] for i in missing], fresh)
+
+    dim = fresh.shape[1] if fresh is not None else next(iter(cached.values())).shape[0]
+    embeddings = np.empty((len(issues), dim), dtype="float32")
+    for i, key in enumerate(keys):
+        if key in cached:
+            embeddings[i] = cached[key]
+    if fresh is not None:
+        embeddings[missing] = fresh
+    return embeddings
+
+
+def search_similar_issues(query_vector: np.ndarray, index: IssueIndex,
+                          candidate_ids: Optional[List[int]], top_k: int = 5) -> List[Dict[str, Any]]:
     """
-    Search for similar issues using the FAISS index.
+    Search for similar issues in the shared issue index.
 
     Args:
-        query_text: Query text
-        model: Sentence transformer model
-        index: FAISS index
-        all_issues: List of all issues
+        query_vector: Embedded query text
+        index: Shared issue index
+        candidate_ids: GitHub issue ids the search is restricted to, or None for the whole corpus
         top_k: Number of top matches to return
 
     Returns:
         List of similar issues
     """
-    # logger.info(f"Searching for similar issues to: {query_text[:100]}...")
-    query_vector = model.encode([query_text], convert_to_numpy=True)
-    distances, indices = index.search(query_vector, top_k)
+    matches = index.search(query_vector, top_k, candidate_ids=candidate_ids)
 
-    # Log the distances for debugging
-    logger.info(f"Search distances: {distances[0]}")
+    # Log the scores for debugging
+    logger.info(f"Search scores: {[score for _, score in matches]}")
 
-    # Get the issues corresponding to the indices
+    # Copy the issues so the shared corpus is never mutated per request
     similar_issues = []
-    for i, idx in enumerate(indices[0]):
-        if idx < 0 or idx >= len(all_issues):
-            logger.warning(f"Invalid index: {idx}, skipping")
-            continue
-        issue = all_issues[idx]
-        issue['similarity_score'] = float(1.0 - distances[0][i] / 2.0)  # Convert L2 distance to similarity score
+    for issue, score in matches:
+        issue = dict(issue)
+        issue['similarity_score'] = score  # Cosine similarity of normalized embeddings
         similar_issues.append(issue)
 
     # logger.info(f"Found {len(similar_issues)} similar issues")
@@ -176,55 +274,242 @@ def format_issues_json(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return results
 
 
-def get_top_matched_issues(
+def _index_and_search(stale_issues: List[Dict[str, Any]], stale_embeddings: Optional[np.ndarray],
+                      query_vector: np.ndarray, candidate_ids: List[int], top_k: int) -> List[Dict[str, Any]]:
+    """
+    Upsert freshly embedded issues and rank the candidates against the query.
+    Runs on the CPU executor.
+    """
+    index = get_issue_index()
+    if stale_issues:
+        index.upsert(stale_issues, stale_embeddings)
+    index.touch(candidate_ids)
+    top_matches = search_similar_issues(query_vector, index, candidate_ids, top_k=top_k)
+    return format_issues_json(top_matches)
+
+
+async def rank_issues(query_text: str, issues: List[Dict[str, Any]], top_k: int = 10,
+                      query_vector: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    Index the fetched issues and rank them against the query.
+
+    The query and any new or changed issues are encoded concurrently through
+    the embedding batcher; the index update and search run on the CPU executor.
+
+    Args:
+        query_text: Query text
+        issues: Candidate GitHub issues
+        top_k: Number of top matches to return
+        query_vector: Precomputed query embedding; skips encoding query_text
+
+    Returns:
+        List of formatted issues, best match first
+    """
+    # Only embed issues that are new to the index or changed since indexed
+    index = get_issue_index()
+    stale_issues = [issue for issue in issues if not index.is_current(issue)]
+
+    encode_query = _encode_query(query_text, query_vector)
+    if stale_issues:
+        query_vectors, stale_embeddings = await asyncio.gather(encode_query, embed_issues(stale_issues))
+    else:
+        query_vectors, stale_embeddings = await encode_query, None
+
+    candidate_ids = [issue['id'] for issue in issues]
+    return await get_cpu_executor().run(
+        _index_and_search, stale_issues, stale_embeddings, query_vectors, candidate_ids, top_k
+    )
+
+
+async def _encode_query(query_text: str, query_vector: Optional[np.ndarray] = None) -> np.ndarray:
+    if query_vector is not None:
+        return query_vector
+    return await get_embedding_service().encode([query_text])
+
+
+async def rank_indexed_issues(query_text: str, candidate_ids: List[int], top_k: int = 10,
+                              query_vector: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    Rank indexed issues against the query, without calling GitHub.
+
+    Args:
+        query_text: Query text
+        candidate_ids: Indexed issue ids to rank (see indexed_candidates)
+        top_k: Number of top matches to return
+        query_vector: Precomputed query embedding; skips encoding query_text
+
+    Returns:
+        List of formatted issues, best match first
+    """
+    query_vectors = await _encode_query(query_text, query_vector)
+
+    def search() -> List[Dict[str, Any]]:
+        return format_issues_json(search_similar_issues(query_vectors, get_issue_index(), candidate_ids, top_k=top_k))
+
+    return await get_cpu_executor().run(search)
+
+
+async def refresh_indexed_issues(keywords: List[str], github_token: Optional[str] = None) -> int:
+    """
+    Fetch issues for keywords at background priority, upsert new or changed
+    ones into the index and mark the unchanged ones as seen.
+
+    Returns:
+        Number of issues embedded and upserted
+    """
+    issues = await fetch_github_issues(keywords, top_k=TOP_PER_KEYWORD, github_token=github_token,
+                                       priority=PRIORITY_BACKGROUND)
+    index = get_issue_index()
+    stale_issues = [issue for issue in issues if not index.is_current(issue)]
+    index.touch([issue['id'] for issue in issues if index.is_current(issue)])
+    if stale_issues:
+        embeddings = await embed_issues(stale_issues)
+        await get_cpu_executor().run(index.upsert, stale_issues, embeddings)
+    return len(stale_issues)
+
+
+def schedule_index_refresh(keywords: List[str], github_token: Optional[str], interval: float) -> bool:
+    """
+    Start a background refresh of the keywords not fetched within `interval` seconds.
+
+    Returns:
+        True if a refresh was started
+    """
+    now = time.monotonic()
+    stale = [keyword for keyword in keywords if now - _keyword_refreshed_at.get(keyword, -interval) >= interval]
+    if not stale:
+        return False
+    # Claimed up front so concurrent requests do not start the same refresh
+    for keyword in stale:
+        _keyword_refreshed_at[keyword] = now
+
+    async def refresh() -> None:
+        try:
+            updated = await refresh_indexed_issues(stale, github_token)
+            logger.info(f"Background refresh of {len(stale)} keywords updated {updated} issues")
+        except Exception as e:
+            logger.warning(f"Background index refresh failed: {str(e)}")
+            for keyword in stale:
+                _keyword_refreshed_at.pop(keyword, None)
+
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+    return True
+
+
+def build_search_keywords(keywords: List[str], languages: Optional[List[str]] = None) -> List[str]:
+    """
+    Keywords to run GitHub issue searches for: the given keywords, the
+    languages and general beginner-friendly labels, without duplicates.
+    """
+    # Prepare search keywords
+    search_keywords = keywords.copy()
+
+    # Add language-specific keywords
+    if languages:
+        for lang in languages:
+            search_keywords.append(f"{lang}")
+
+    # Add general keywords for good first issues
+    search_keywords.extend(["good first issue", "beginner friendly", "easy"])
+
+    # Remove duplicates
+    search_keywords = list(set(search_keywords))
+    logger.info(f"Search keywords: {search_keywords}")
+    return search_keywords
+
+
+def indexed_candidates(search_keywords: List[str]) -> List[int]:
+    """
+    Indexed issues the request's GitHub searches would select: those labelled
+    with one of the search keywords (the searches query label:"<keyword>").
+    """
+    return get_issue_index().ids_with_labels(search_keywords)
+
+
+def warm_candidates(keywords: List[str], languages: Optional[List[str]],
+                    search_keywords: List[str]) -> Optional[List[int]]:
+    """
+    Candidates for answering from the index before GitHub is searched, or None
+    when the index does not hold MATCH_WARM_MIN_ISSUES of them, or none for
+    the request's own keywords and languages (only general beginner labels).
+    """
+    from app.core.config import settings
+    if not settings.MATCH_WARM_MIN_ISSUES:
+        return None
+    candidates = indexed_candidates(search_keywords)
+    if len(candidates) < settings.MATCH_WARM_MIN_ISSUES:
+        return None
+    specific = list(keywords) + list(languages or [])
+    if specific and not get_issue_index().ids_with_labels(specific):
+        return None
+    return candidates
+
+
+async def get_top_matched_issues(
         query_text: str,
         keywords: List[str],
         languages: List[str] = None,
         top_k: int = 10,
-        github_token: Optional[str] = None
+        github_token: Optional[str] = None,
+        query_vector: Optional[np.ndarray] = None
 ) -> Dict[str, Any]:
     """
     Get top matched issues for a query.
 
+    Once the issue index holds MATCH_WARM_MIN_ISSUES issues labelled with the
+    search keywords (e.g. after a snapshot restore), those are ranked without
+    waiting on GitHub, and keywords not fetched within
+    MATCH_INDEX_REFRESH_INTERVAL are refreshed in the background; the result
+    then carries "refreshing": True. Otherwise GitHub is searched first and the
+    fetched issues are ranked.
+
     Args:
         query_text: Query text
         keywords: List of keywords to search for
         languages: List of programming languages (used to refine keywords)
         top_k: Number of top matches to return
         github_token: GitHub API token for authentication
+        query_vector: Precomputed embedding of query_text (e.g. a cached profile vector)
 
     Returns:
         Dictionary with recommendations, counts, and status message
     """
-    global model
-
     try:
         # logger.info(f"Getting top matched issues for query: {query_text[:100]}...")
 
-        # Check if model is loaded
-        if model is None:
-            logger.info(f"Loading sentence transformer model: {MODEL_NAME}")
-            model = SentenceTransformer(MODEL_NAME)
-
-        # Prepare search keywords
-        search_keywords = keywords.copy()
+        from app.core.config import settings
+        search_keywords = build_search_keywords(keywords, languages)
 
-        # Add language-specific keywords
-        if languages:
-            for lang in languages:
-                search_keywords.append(f"{lang}")
-
-        # Add general keywords for good first issues
-        search_keywords.extend(["good first issue", "beginner friendly", "easy"])
-
-        # Remove duplicates
-        search_keywords = list(set(search_keywords))
-        logger.info(f"Search keywords: {search_keywords}")
+        candidates = warm_candidates(keywords, languages, search_keywords)
+        if candidates is not None:
+            # Warm index (e.g. restored from a snapshot): answer from it and refresh from GitHub behind the response
+            refreshing = schedule_index_refresh(search_keywords, github_token, settings.MATCH_INDEX_REFRESH_INTERVAL)
+            return {
+                "recommendations": await rank_indexed_issues(query_text, candidates, top_k, query_vector),
+                "issues_fetched": 0,
+                "issues_indexed": len(candidates),
+                "message": "Matched against indexed issues",
+                "refreshing": refreshing
+            }
 
         # Fetch issues
-        issues = fetch_github_issues(search_keywords, top_k=TOP_PER_KEYWORD, github_token=github_token)
+        issues = await fetch_github_issues(search_keywords, top_k=TOP_PER_KEYWORD, github_token=github_token)
+        now = time.monotonic()
+        _keyword_refreshed_at.update((keyword, now) for keyword in search_keywords)
 
         if not issues:
+            candidates = indexed_candidates(search_keywords)
+            if candidates:
+                # GitHub returned nothing (e.g. rate limited): fall back to the indexed issues for these keywords
+                logger.warning(f"No issues fetched, matching against {len(candidates)} indexed issues")
+                return {
+                    "recommendations": await rank_indexed_issues(query_text, candidates, top_k, query_vector),
+                    "issues_fetched": 0,
+                    "issues_indexed": len(candidates),
+                    "message": "Matched against previously indexed issues"
+                }
             logger.warning("No issues fetched")
             return {
                 "recommendations": [],
@@ -233,28 +518,18 @@ def get_top_matched_issues(
                 "message": "No issues found for the given keywords"
             }
 
-        # Prepare issue texts for embedding
-        issue_texts = [f"{issue['title']} {issue.get('body', '')}" for issue in issues]
-
-        # Embed issues
-        embeddings = embed_texts(issue_texts, model)
-
-        # Build FAISS index
-        index = build_faiss_index(np.array(embeddings))
-
-        # Search for similar issues
-        top_matches = search_similar_issues(query_text, model, index, issues, top_k=top_k)
-
-        # Format issues for output
-        formatted_issues = format_issues_json(top_matches)
+        # Embedding and search run off the event loop
+        formatted_issues = await rank_issues(query_text, issues, top_k, query_vector)
 
         return {
             "recommendations": formatted_issues,
             "issues_fetched": len(issues),
-            "issues_indexed": index.ntotal,
+            "issues_indexed": len(issues),
             "message": "Successfully matched issues"
         }
 
+    except ExecutorBusy:
+        raise
     except Exception as e:
         logger.error(f"Error in get_top_matched_issues: {str(e)}")
         import traceback
@@ -264,4 +539,106 @@ def get_top_matched_issues(
             "issues_fetched": 0,
             "issues_indexed": 0,
             "message": f"Error matching issues: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+async def stream_top_matched_issues(
+        query_text: str,
+        keywords: List[str],
+        languages: List[str] = None,
+        top_k: int = 10,
+        github_token: Optional[str] = None,
+        query_vector: Optional[np.ndarray] = None,
+        concurrency: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of get_top_matched_issues.
+
+    Candidates are ranked as keyword searches complete, instead of after all
+    of them. Searches that finish while a ranking runs are folded into the
+    next one.
+
+    Yields:
+        {"event": "provisional"} for the first ranking, then {"event": "refined"}
+        for each ranking after more issues arrived (both with recommendations,
+        issues_fetched, keywords_done, keywords_total), and finally
+        {"event": "final"} with the same fields as get_top_matched_issues.
+        With a warm index the provisional ranking is taken from the index
+        before any search completes.
+    """
+    from app.core.config import settings
+    search_keywords = build_search_keywords(keywords, languages)
+    if concurrency is None:
+        concurrency = settings.GITHUB_SEARCH_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    query_vectors = await _encode_query(query_text, query_vector)
+    event = "provisional"
+    candidates = warm_candidates(keywords, languages, search_keywords)
+    if candidates is not None:
+        # Warm index: the first ranking comes from it, before any GitHub search returns
+        yield {
+            "event": event,
+            "recommendations": await rank_indexed_issues(query_text, candidates, top_k, query_vectors),
+            "issues_fetched": 0,
+            "keywords_done": 0,
+            "keywords_total": len(search_keywords),
+        }
+        event = "refined"
+    tasks = {
+        asyncio.create_task(_fetch_keyword_issues(semaphore, keyword, TOP_PER_KEYWORD, github_token)): keyword
+        for keyword in search_keywords
+    }
+    issues: Dict[str, Dict[str, Any]] = {}
+    recommendations: List[Dict[str, Any]] = []
+    keywords_done = 0
+    try:
+        pending = set(tasks)
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            added = False
+            for task in finished:
+                keywords_done += 1
+                if task.exception() is not None:
+                    logger.error(f"Error for keyword: {tasks[task]}: {str(task.exception())}")
+                    continue
+                for issue in task.result():
+                    if issue['html_url'] not in issues:
+                        issues[issue['html_url']] = issue
+                        added = True
+            if not added:
+                continue
+            recommendations = await rank_issues(query_text, list(issues.values()), top_k, query_vectors)
+            yield {
+                "event": event,
+                "recommendations": recommendations,
+                "issues_fetched": len(issues),
+                "keywords_done": keywords_done,
+                "keywords_total": len(tasks),
+            }
+            event = "refined"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    logger.info(f"Total unique issues fetched: {len(issues)}")
+    now = time.monotonic()
+    _keyword_refreshed_at.update((keyword, now) for keyword in search_keywords)
+    candidates = indexed_candidates(search_keywords) if not issues else []
+    if issues:
+        message = "Successfully matched issues"
+        indexed = len(issues)
+    elif candidates:
+        # GitHub returned nothing (e.g. rate limited): fall back to the indexed issues for these keywords
+        recommendations = await rank_indexed_issues(query_text, candidates, top_k, query_vectors)
+        message = "Matched against previously indexed issues"
+        indexed = len(candidates)
+    else:
+        message = "No issues found for the given keywords"
+        indexed = 0
+    yield {
+        "event": "final",
+        "recommendations": recommendations,
+        "issues_fetched": len(issues),
+        "issues_indexed": indexed,
+        "message": message,
+    }
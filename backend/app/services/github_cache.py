@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    scope TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (scope, url)
+);
+CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at);
+"""
+
+# Response headers worth replaying when a cached body is served on 304
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+def token_scope(token: Optional[str]) -> str:
+    """ Cache scope for a token: a short hash, never the token itself. """
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+class CachedResponse:
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], headers: Dict[str, str], body: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.body = body
+
+    def validator_headers(self) -> Dict[str, str]:
+        """ Conditional request headers for revalidating this entry. """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class GitHubResponseCache:
+    """
+    Store of GitHub REST response bodies and their validators.
+
+    Entries are keyed by (token scope, URL). The store is a SQLite file so
+    every uvicorn worker on the host revalidates against the same entries.
+    GitHub does not count 304 responses against the rate limit.
+    Methods block on SQLite (up to the busy timeout under write contention);
+    async callers run them with asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self.revalidated = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, scope: str, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE scope = ? AND url = ?",
+                (scope, url),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[3])
+
+    def put(self, scope: str, url: str, headers: Dict[str, str], body: bytes) -> None:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        kept = {name: headers[name] for name in _KEPT_HEADERS if name in headers}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (scope, url, etag, last_modified, headers, body, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (scope, url, etag, last_modified, json.dumps(kept), body, time.time()),
+            )
+            self.stored += 1
+            if self.stored % 100 == 0:
+                self._evict()
+
+    def touch(self, scope: str, url: str) -> None:
+        """ Record a successful revalidation so the entry stays warm. """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ? WHERE scope = ? AND url = ?",
+                (time.time(), scope, url),
+            )
+            self.revalidated += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"entries": entries, "max_entries": self.max_entries,
+                "stored": self.stored, "revalidated": self.revalidated}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = entries - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE rowid IN "
+                "(SELECT rowid FROM responses ORDER BY stored_at LIMIT ?)",
+                (overflow,),
+            )
+
+
+github_cache: Optional[GitHubResponseCache] = None
+
+
+def open_github_cache() -> Optional[GitHubResponseCache]:
+    """ Open the shared GitHub response cache. Called from the app lifespan. """
+    global github_cache
+    from app.core.config import settings
+    if not settings.GITHUB_CACHE_PATH:
+        return None
+    try:
+        github_cache = GitHubResponseCache(settings.GITHUB_CACHE_PATH, max_entries=settings.GITHUB_CACHE_MAX_ENTRIES)
+        logger.info(f"GitHub response cache opened at {settings.GITHUB_CACHE_PATH}")
+    except Exception as e:
+        logger.error(f"Could not open GitHub response cache: {str(e)}")
+        github_cache = None
+    return github_cache
+
+
+def close_github_cache() -> None:
+    global github_cache
+    if github_cache is not None:
+        github_cache.close()
+        github_cache = None
+
+
+def get_github_cache() -> Optional[GitHubResponseCache]:
+    return github_cache
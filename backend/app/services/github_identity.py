@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .github_cache import token_scope
+from .github_service import GITHUB_API_URL, github_get
+
+# Fields of GET /user kept in the identity snapshot (what the routers store on users)
+USER_SNAPSHOT_FIELDS = (
+    "id", "login", "name", "email", "avatar_url", "bio", "location", "company",
+    "public_repos", "total_private_repos", "followers", "following",
+)
+
+
+def user_snapshot(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """ Compact copy of a GitHub /user payload. """
+    return {field: profile.get(field) for field in USER_SNAPSHOT_FIELDS}
+
+
+class IdentityCache:
+    """
+    Bounded TTL map from token hash (see github_cache.token_scope) to the
+    GitHub user snapshot, shared by all requests in the worker.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(scope)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            self._entries.pop(scope, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(scope)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, scope: str, user: Dict[str, Any]) -> None:
+        self._entries[scope] = (time.monotonic(), user)
+        self._entries.move_to_end(scope)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str) -> None:
+        self._entries.pop(scope, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+identity_cache: Optional[IdentityCache] = None
+
+
+def get_identity_cache() -> IdentityCache:
+    global identity_cache
+    if identity_cache is None:
+        from app.core.config import settings
+        identity_cache = IdentityCache(settings.GITHUB_IDENTITY_TTL, settings.GITHUB_IDENTITY_MAX_ENTRIES)
+    return identity_cache
+
+
+async def resolve_github_user(token: str) -> Dict[str, Any]:
+    """
+    Return the user snapshot for a token, calling GET /user only on a cache miss.
+
+    Raises:
+        HTTPException: 401 if GitHub rejects the token, 503 if GitHub is rate limited or failing
+    """
+    cache = get_identity_cache()
+    scope = token_scope(token)
+    user = cache.get(scope)
+    if user is not None:
+        return user
+
+    response = await github_get(f"{GITHUB_API_URL}/user", token, timeout=10.0)
+    if response.status_code == 429 or response.status_code >= 500:
+        print(f"WARN [GitHub Identity]: GitHub /user returned {response.status_code}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="GitHub is unavailable, please retry")
+    if response.status_code != 200:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = user_snapshot(response.json())
+    cache.put(scope, user)
+    return user
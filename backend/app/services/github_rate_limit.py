@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+MAX_BUCKETS = 10000
+
+
+def resource_for_url(url: str) -> str:
+    """ GitHub rate-limit resource a REST/GraphQL URL is billed against. """
+    path = httpx.URL(url).path
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class RateLimitWaitTooLong(Exception):
+    def __init__(self, resource: str, retry_after: float):
+        super().__init__(f"GitHub {resource} rate limit exhausted, retry in {retry_after:.0f}s")
+        self.resource = resource
+        self.retry_after = retry_after
+
+
+class _Bucket:
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self.in_flight = 0
+        self.waiters: List[Tuple[int, int]] = []
+        self.cond = asyncio.Condition()
+
+    def delay(self, priority: int, background_reserve: float) -> float:
+        """ Seconds to wait before a request of this priority may be sent, 0 if it may go now. """
+        now = time.time()
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.remaining is None or now >= self.reset_at:
+            return 0.0
+        available = self.remaining - self.in_flight
+        if priority != PRIORITY_INTERACTIVE and self.limit:
+            # Background work leaves a share of the budget for interactive requests
+            available -= int(self.limit * background_reserve)
+        if available > 0:
+            return 0.0
+        return self.reset_at - now
+
+
+class GitHubRateLimiter:
+    """
+    Schedules outbound GitHub requests against per-token, per-resource budgets.
+
+    Budgets are learned from X-RateLimit-* response headers. When a bucket is
+    empty, requests queue until it resets; interactive requests are served
+    before background ones, and background requests never consume the last
+    background_reserve share of a budget. Secondary rate limits (403/429 with
+    Retry-After) block the bucket with exponential backoff.
+    """
+
+    def __init__(self, max_wait: float = 10.0, background_reserve: float = 0.2,
+                 secondary_backoff: float = 5.0, max_backoff: float = 300.0):
+        self.max_wait = max_wait
+        self.background_reserve = background_reserve
+        self.secondary_backoff = secondary_backoff
+        self.max_backoff = max_backoff
+        self.throttled = 0
+        self.rejected = 0
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._seq = itertools.count()
+
+    async def acquire(self, scope: str, resource: str, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """
+        Wait for budget in the (scope, resource) bucket and reserve one request.
+
+        Raises:
+            RateLimitWaitTooLong: if the wait would exceed max_wait
+        """
+        bucket = self._bucket(scope, resource)
+        entry = (priority, next(self._seq))
+        async with bucket.cond:
+            heapq.heappush(bucket.waiters, entry)
+            waited = False
+            try:
+                while True:
+                    delay = None
+                    if bucket.waiters[0] == entry:
+                        delay = bucket.delay(priority, self.background_reserve)
+                        if delay <= 0:
+                            break
+                        if delay > self.max_wait:
+                            self.rejected += 1
+                            raise RateLimitWaitTooLong(resource, delay)
+                    waited = True
+                    try:
+                        await asyncio.wait_for(bucket.cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                bucket.waiters.remove(entry)
+                heapq.heapify(bucket.waiters)
+                bucket.cond.notify_all()
+            bucket.in_flight += 1
+            if waited:
+                self.throttled += 1
+
+    async def release(self, scope: str, resource: str, response: Optional[httpx.Response]) -> None:
+        """ Return the reservation and update the bucket from the response headers. """
+        bucket = self._bucket(scope, resource)
+        async with bucket.cond:
+            bucket.in_flight = max(0, bucket.in_flight - 1)
+            if response is not None:
+                self._update(bucket, response)
+            bucket.cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ Remaining budget per bucket, for metrics. Token scopes are truncated hashes. """
+        now = time.time()
+        buckets = []
+        for (scope, resource), bucket in self._buckets.items():
+            buckets.append({
+                "scope": scope[:8],
+                "resource": resource,
+                "limit": bucket.limit,
+                "remaining": bucket.remaining,
+                "reset_in": max(0.0, bucket.reset_at - now),
+                "blocked_for": max(0.0, bucket.blocked_until - now),
+                "in_flight": bucket.in_flight,
+                "waiting": len(bucket.waiters),
+            })
+        return {"throttled": self.throttled, "rejected": self.rejected, "buckets": buckets}
+
+    def _bucket(self, scope: str, resource: str) -> _Bucket:
+        key = (scope, resource)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune()
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def _prune(self) -> None:
+        now = time.time()
+        idle = [key for key, bucket in self._buckets.items()
+                if not bucket.waiters and not bucket.in_flight
+                and bucket.reset_at <= now and bucket.blocked_until <= now]
+        for key in idle:
+            del self._buckets[key]
+
+    def _update(self, bucket: _Bucket, response: httpx.Response) -> None:
+        headers = response.headers
+        try:
+            if "x-ratelimit-remaining" in headers:
+                bucket.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-limit" in headers:
+                bucket.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-reset" in headers:
+                bucket.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            pass
+
+        if response.status_code in (403, 429):
+            retry_after = headers.get("retry-after")
+            secondary = (retry_after is not None or response.status_code == 429
+                         or "secondary rate limit" in response.text.lower())
+            if secondary:
+                # Secondary rate limit: honour Retry-After, otherwise back off exponentially
+                bucket.backoff = min(self.max_backoff, max(self.secondary_backoff, bucket.backoff * 2))
+                try:
+                    wait = float(retry_after) if retry_after is not None else bucket.backoff
+                except ValueError:
+                    wait = bucket.backoff
+                bucket.blocked_until = time.time() + wait
+                logger.warning(f"GitHub secondary rate limit hit, backing off {wait:.0f}s")
+        elif response.status_code < 400:
+            bucket.backoff = 0.0
+
+
+rate_limiter = GitHubRateLimiter()
+
+
+def configure_rate_limiter() -> GitHubRateLimiter:
+    """ Apply settings to the shared rate limiter. Called from the app lifespan. """
+    from app.core.config import settings
+    rate_limiter.max_wait = settings.GITHUB_RATE_LIMIT_MAX_WAIT
+    rate_limiter.background_reserve = settings.GITHUB_RATE_LIMIT_BACKGROUND_RESERVE
+    rate_limiter.secondary_backoff = settings.GITHUB_RATE_LIMIT_SECONDARY_BACKOFF
+    return rate_limiter
+
+
+def get_rate_limiter() -> GitHubRateLimiter:
+    return rate_limiter
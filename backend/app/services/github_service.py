@@ -5,84 +5,190 @@ import re
 import os
 import traceback
 from fastapi import HTTPException, status
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Tuple
+from .http_client import get_http_client
+from .github_cache import get_github_cache, token_scope
+from .github_rate_limit import (get_rate_limiter, resource_for_url, RateLimitWaitTooLong, PRIORITY_INTERACTIVE,
+                                PRIORITY_BACKGROUND)
+from .swr_cache import StaleWhileRevalidateCache
 
 # --- GitHub API Constants ---
 GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
 MAX_REPOS_FOR_README = 7
+PROFILE_REPO_COUNT = 30
+MAX_README_LENGTH = 2000
+DEFAULT_GITHUB_HEADERS = {"Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}
+
+# In-flight GETs by (token scope, URL, extra headers), shared by concurrent identical callers
+_inflight_gets: Dict[Tuple[str, str, Tuple[Tuple[str, str], ...]], asyncio.Task] = {}
+_single_flight_stats = {"requests": 0, "coalesced": 0}
+# Headers describing the wire encoding of a body, dropped when a decoded body is handed out again
+_DECODED_BODY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+async def github_get(url: str, token: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None, timeout: float = 20.0,
+                     priority: int = PRIORITY_INTERACTIVE) -> httpx.Response:
+    """
+    GET a GitHub REST URL over the shared client, revalidating cached bodies.
+
+    A cached response for the same token scope and URL is revalidated with
+    If-None-Match / If-Modified-Since. On 304 the cached body is returned as
+    a regular 200 response, so callers never see the difference.
+    Requests are scheduled by the rate limiter; if the token's budget for the
+    resource will not reset soon enough, a 429 response is returned without
+    calling GitHub.
+    Concurrent calls for the same URL, token scope and headers share one
+    outbound request (single flight); each caller gets its own copy of the
+    response. The first caller's priority and timeout apply to the shared request.
+    """
+    full_url = str(httpx.URL(url, params=params)); scope = token_scope(token)
+    key = (scope, full_url, tuple(sorted(headers.items())) if headers else ())
+    _single_flight_stats["requests"] += 1
+    task = _inflight_gets.get(key)
+    if task is None:
+        task = asyncio.create_task(_github_get_once(full_url, token, scope, headers, timeout, priority))
+        _inflight_gets[key] = task
+        task.add_done_callback(lambda _, key=key: _inflight_gets.pop(key, None))
+    else:
+        _single_flight_stats["coalesced"] += 1
+    # Shielded so a cancelled caller does not cancel the request the others are waiting on
+    response = await asyncio.shield(task)
+    # The shared body is already decoded; replaying the transfer headers would make httpx decode it again
+    replay_headers = [(name, value) for name, value in response.headers.multi_items()
+                      if name.lower() not in _DECODED_BODY_HEADERS]
+    return httpx.Response(response.status_code, headers=replay_headers, content=response.content,
+                          request=response.request)
+
+
+def get_single_flight_stats() -> Dict[str, int]:
+    return {**_single_flight_stats, "in_flight": len(_inflight_gets)}
+
+
+async def _github_get_once(full_url: str, token: Optional[str], scope: str, headers: Optional[Dict[str, str]],
+                           timeout: float, priority: int) -> httpx.Response:
+    request_headers = dict(DEFAULT_GITHUB_HEADERS)
+    if token: request_headers["Authorization"] = f"Bearer {token}"
+    if headers: request_headers.update(headers)
+    client = get_http_client()
+
+    cache = get_github_cache()
+    cached = await asyncio.to_thread(cache.get, scope, full_url) if cache is not None else None
+    if cached is not None: request_headers.update(cached.validator_headers())
+
+    limiter = get_rate_limiter(); resource = resource_for_url(full_url)
+    try:
+        await limiter.acquire(scope, resource, priority)
+    except RateLimitWaitTooLong as exc:
+        print(f"WARN [GitHub Service]: {exc}")
+        return httpx.Response(429, headers={"Retry-After": str(int(exc.retry_after) + 1)},
+                              json={"message": str(exc)}, request=httpx.Request("GET", full_url))
+    response = None
+    try:
+        response = await client.get(full_url, headers=request_headers, timeout=timeout)
+    finally:
+        await limiter.release(scope, resource, response)
+
+    if response.status_code == 304 and cached is not None:
+        await asyncio.to_thread(cache.touch, scope, full_url)
+        return httpx.Response(200, headers=cached.headers, content=cached.body, request=response.request)
+    if response.status_code == 200 and cache is not None:
+        await asyncio.to_thread(cache.put, scope, full_url, dict(response.headers), response.content)
+    return response
+
+
+class GitHubGraphQLError(Exception):
+    """ GraphQL request that returned errors instead of data. """
+
+
+async def github_graphql(query: str, variables: Dict[str, Any], token: str, timeout: float = 20.0,
+                         priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+    """
+    POST a GraphQL query over the shared client, scheduled against the
+    token's graphql rate-limit budget. Returns the "data" object.
+    """
+    request_headers = dict(DEFAULT_GITHUB_HEADERS); request_headers["Authorization"] = f"Bearer {token}"
+    client = get_http_client(); limiter = get_rate_limiter(); scope = token_scope(token)
+    try:
+        await limiter.acquire(scope, "graphql", priority)
+    except RateLimitWaitTooLong as exc:
+        raise GitHubGraphQLError(str(exc)) from exc
+    response = None
+    try:
+        response = await client.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables},
+                                     headers=request_headers, timeout=timeout)
+    finally:
+        await limiter.release(scope, "graphql", response)
+    response.raise_for_status(); payload = response.json()
+    if payload.get("errors"):
+        raise GitHubGraphQLError("; ".join(error.get("message", "") for error in payload["errors"]))
+    return payload["data"]
 
 
 async def get_user_profile(token: str) -> Dict[str, Any]:
     """ Fetches the authenticated user's GitHub profile. """
     if not token: raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="GitHub token not provided for get_user_profile")
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}
-        url = f"{GITHUB_API_URL}/user"
-        try:
-            print(f"DEBUG [GitHub Service]: Fetching user profile from {url}")
-            response = await client.get(url, headers=headers, timeout=10.0)
-            response.raise_for_status(); profile = response.json()
-            print(f"DEBUG [GitHub Service]: Successfully fetched profile for user {profile.get('login')}"); return profile
-        except httpx.HTTPStatusError as exc:
-            detail = f"GitHub API error fetching user profile: {exc.response.status_code}"; status_code = exc.response.status_code
-            if status_code == 401: detail = "GitHub token invalid or expired."
-            elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for user profile."
-            print(f"ERROR [GitHub Service]: {detail}"); raise HTTPException(status_code=status_code, detail=detail) from exc
-        except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for user profile: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
-        except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error fetching user profile: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred fetching user profile.") from exc
-
-
-async def get_user_repos(token: str, per_page: int = 30) -> List[Dict[str, Any]]:
+    url = f"{GITHUB_API_URL}/user"
+    try:
+        print(f"DEBUG [GitHub Service]: Fetching user profile from {url}")
+        response = await github_get(url, token, timeout=10.0)
+        response.raise_for_status(); profile = response.json()
+        print(f"DEBUG [GitHub Service]: Successfully fetched profile for user {profile.get('login')}"); return profile
+    except httpx.HTTPStatusError as exc:
+        detail = f"GitHub API error fetching user profile: {exc.response.status_code}"; status_code = exc.response.status_code
+        if status_code == 401: detail = "GitHub token invalid or expired."
+        elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for user profile."
+        print(f"ERROR [GitHub Service]: {detail}"); raise HTTPException(status_code=status_code, detail=detail) from exc
+    except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for user profile: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
+    except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error fetching user profile: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred fetching user profile.") from exc
+
+
+async def get_user_repos(token: str, per_page: int = 30, priority: int = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
     """ Fetches the authenticated user's repositories, sorted by recent push date. """
     if not token: raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="GitHub token not provided for get_user_repos")
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}
-        repos_url = f"{GITHUB_API_URL}/user/repos?sort=pushed&per_page={per_page}"
-        try:
-            # print(f"DEBUG [GitHub Service]: Fetching user repos from {repos_url}")
-            repo_response = await client.get(repos_url, headers=headers, timeout=15.0)
-            repo_response.raise_for_status(); repos_data = repo_response.json()
-            if not isinstance(repos_data, list): print(f"Warning [GitHub Service]: Unexpected repo data format: {type(repos_data)}"); return []
-            print(f"DEBUG [GitHub Service]: Fetched {len(repos_data)} repos."); return repos_data
-        except httpx.HTTPStatusError as exc:
-            detail = f"GitHub API error fetching user repos: {exc.response.status_code}"; status_code = exc.response.status_code
-            if status_code == 401: detail = "GitHub token invalid or expired."
-            elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for user repos."
-            print(f"ERROR [GitHub Service]: {detail}"); raise HTTPException(status_code=status_code, detail=detail) from exc
-        except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for user repos: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
-        except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error fetching user repos: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred fetching user repos.") from exc
+    repos_url = f"{GITHUB_API_URL}/user/repos?sort=pushed&per_page={per_page}"
+    try:
+        # print(f"DEBUG [GitHub Service]: Fetching user repos from {repos_url}")
+        repo_response = await github_get(repos_url, token, timeout=15.0, priority=priority)
+        repo_response.raise_for_status(); repos_data = repo_response.json()
+        if not isinstance(repos_data, list): print(f"Warning [GitHub Service]: Unexpected repo data format: {type(repos_data)}"); return []
+        print(f"DEBUG [GitHub Service]: Fetched {len(repos_data)} repos."); return repos_data
+    except httpx.HTTPStatusError as exc:
+        detail = f"GitHub API error fetching user repos: {exc.response.status_code}"; status_code = exc.response.status_code
+        if status_code == 401: detail = "GitHub token invalid or expired."
+        elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for user repos."
+        print(f"ERROR [GitHub Service]: {detail}"); raise HTTPException(status_code=status_code, detail=detail) from exc
+    except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for user repos: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
+    except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error fetching user repos: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred fetching user repos.") from exc
 
 
 async def search_issues(token: Optional[str], query: str, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
     """ Searches for issues on GitHub using the provided query string. """
-    headers = {"Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}
-    if token: headers["Authorization"] = f"Bearer {token}"
-    else: print("WARN [GitHub Service]: Performing GitHub issue search without authentication. Rate limits are stricter.")
+    if not token: print("WARN [GitHub Service]: Performing GitHub issue search without authentication. Rate limits are stricter.")
     params = {"q": query, "per_page": per_page, "page": page}; url = f"{GITHUB_API_URL}/search/issues"
-    async with httpx.AsyncClient() as client:
-        try:
-            print(f"DEBUG [GitHub Service]: Searching issues with query: '{query}' page: {page}, per_page: {per_page}")
-            response = await client.get(url, headers=headers, params=params, timeout=20.0)
-            response.raise_for_status(); search_results = response.json()
-            print(f"DEBUG [GitHub Service]: Found {search_results.get('total_count', 0)} total issues matching query."); return search_results
-        except httpx.HTTPStatusError as exc:
-            detail = f"GitHub API error searching issues: {exc.response.status_code}"; status_code = exc.response.status_code
-            if status_code == 401: detail = "GitHub token invalid or expired (if provided)."
-            elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for search."
-            elif status_code == 422: detail = "GitHub query validation failed. Check query syntax."
-            print(f"ERROR [GitHub Service]: {detail}. Query was: '{query}'"); raise HTTPException(status_code=status_code, detail=detail) from exc
-        except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for issue search: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
-        except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error searching issues: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred searching issues.") from exc
-
-
-async def _fetch_readme_content(repo_url: str, headers: dict, client: httpx.AsyncClient) -> Optional[str]:
+    try:
+        print(f"DEBUG [GitHub Service]: Searching issues with query: '{query}' page: {page}, per_page: {per_page}")
+        response = await github_get(url, token, params=params, timeout=20.0)
+        response.raise_for_status(); search_results = response.json()
+        print(f"DEBUG [GitHub Service]: Found {search_results.get('total_count', 0)} total issues matching query."); return search_results
+    except httpx.HTTPStatusError as exc:
+        detail = f"GitHub API error searching issues: {exc.response.status_code}"; status_code = exc.response.status_code
+        if status_code == 401: detail = "GitHub token invalid or expired (if provided)."
+        elif status_code == 403: detail = "GitHub API rate limit likely exceeded or token lacks permissions for search."
+        elif status_code == 422: detail = "GitHub query validation failed. Check query syntax."
+        print(f"ERROR [GitHub Service]: {detail}. Query was: '{query}'"); raise HTTPException(status_code=status_code, detail=detail) from exc
+    except httpx.RequestError as exc: print(f"ERROR [GitHub Service]: Could not connect to GitHub API for issue search: {exc}"); raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to GitHub API: {exc}") from exc
+    except Exception as exc: print(f"ERROR [GitHub Service]: Unexpected error searching issues: {exc}"); print(traceback.format_exc()); raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred searching issues.") from exc
+
+
+async def _fetch_readme_content(repo_url: str, token: str, priority: int = PRIORITY_INTERACTIVE) -> Optional[str]:
     """
     Fetches README metadata from repo URL, decodes base64 content.
-    Expects headers with Accept: application/vnd.github.v3+json
     """
     readme_url = f"{repo_url}/readme"
     try:
-        readme_response = await client.get(readme_url, headers=headers, timeout=10.0)
+        readme_response = await github_get(readme_url, token, timeout=10.0, priority=priority)
         if readme_response.status_code == 404:
             print(f"DEBUG [GitHub Service][_fetch_readme_content]: No README found (404) for {repo_url}")
             return None
@@ -93,8 +199,7 @@ async def _fetch_readme_content(repo_url: str, headers: dict, client: httpx.Asyn
         if readme_data.get("encoding") == "base64" and readme_data.get("content"):
             decoded_content = base64.b64decode(readme_data["content"]).decode('utf-8', errors='ignore')
             cleaned_content = re.sub(r'\n{3,}', '\n\n', decoded_content)
-            max_readme_len = 2000
-            return cleaned_content[:max_readme_len]
+            return cleaned_content[:MAX_README_LENGTH]
         else:
             print(f"WARN [GitHub Service][_fetch_readme_content]: README found but no base64 content for {repo_url}")
             return None
@@ -111,25 +216,158 @@ async def _fetch_readme_content(repo_url: str, headers: dict, client: httpx.Asyn
         return None
 
 
-async def get_profile_text_data(token: str, max_repos_for_readme: int = MAX_REPOS_FOR_README) -> Dict[str, List[str] | str]:
+_profile_cache: Optional[StaleWhileRevalidateCache] = None
+
+
+def get_profile_cache() -> StaleWhileRevalidateCache:
+    """ Per-user cache of get_profile_text_data results, created on first use. """
+    global _profile_cache
+    if _profile_cache is None:
+        from app.core.config import settings
+        _profile_cache = StaleWhileRevalidateCache(
+            ttl=settings.PROFILE_CACHE_TTL,
+            max_stale=settings.PROFILE_CACHE_MAX_STALE,
+            max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+            name="profile text",
+        )
+    return _profile_cache
+
+
+async def get_profile_text_data(token: str, max_repos_for_readme: int = MAX_REPOS_FOR_README,
+                                refresh: bool = False) -> Dict[str, List[str] | str]:
     """
     Fetches repository data (languages, topics, descriptions) and
     README content, and combines text. Does NOT generate keywords.
+
+    Results are cached per user (token scope). After PROFILE_CACHE_TTL the
+    cached result is still returned immediately while it is refetched in the
+    background at background rate-limit priority; refresh=True waits for a
+    fresh fetch instead.
     """
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="GitHub token not found")
 
+    async def load(background: bool) -> Dict[str, List[str] | str]:
+        priority = PRIORITY_BACKGROUND if background else PRIORITY_INTERACTIVE
+        return await _fetch_profile_text_data(token, max_repos_for_readme, priority)
+
+    profile_data = await get_profile_cache().get((token_scope(token), max_repos_for_readme), load, refresh=refresh)
+    # Callers get their own lists; the cached result stays untouched
+    return {key: list(value) if isinstance(value, list) else value for key, value in profile_data.items()}
+
+
+async def _fetch_profile_text_data(token: str, max_repos_for_readme: int,
+                                   priority: int = PRIORITY_INTERACTIVE) -> Dict[str, List[str] | str]:
+    """ Uncached body of get_profile_text_data: harvest repos and READMEs, then combine. """
+    from app.core.config import settings
+    if settings.GITHUB_PROFILE_FETCH == "graphql":
+        try:
+            repos_data, readme_contents = await _harvest_profile_graphql(token, max_repos_for_readme, priority)
+        except (GitHubGraphQLError, httpx.HTTPError) as exc:
+            print(f"WARN [GitHub Service]: GraphQL profile harvest failed ({exc}), falling back to REST")
+            repos_data, readme_contents = await _harvest_profile_rest(token, max_repos_for_readme, priority)
+    else:
+        repos_data, readme_contents = await _harvest_profile_rest(token, max_repos_for_readme, priority)
+    return _combine_profile_text(repos_data, readme_contents)
+
+
+async def _harvest_profile_rest(token: str, max_repos_for_readme: int,
+                                priority: int = PRIORITY_INTERACTIVE) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """ Repos from /user/repos plus one /readme call per top repo. """
     # Fetch user repos first
-    repos_data = await get_user_repos(token, per_page=30) # Use the helper
+    repos_data = await get_user_repos(token, per_page=PROFILE_REPO_COUNT, priority=priority) # Use the helper
 
+    readme_tasks = []
+    for i, repo in enumerate(repos_data):
+         # Schedule README fetch task preparation (tasks created below)
+         if isinstance(repo, dict) and i < max_repos_for_readme and repo.get("url"):
+             readme_tasks.append({"url": repo['url']}) # Store URL for task creation later
+
+    # Fetch READMEs concurrently over the shared client
+    readme_contents = []
+    if readme_tasks:
+        tasks_to_run = [
+            _fetch_readme_content(task_info['url'], token, priority)
+            for task_info in readme_tasks
+        ]
+
+        if tasks_to_run:
+             print(f"DEBUG [GitHub Service]: Fetching {len(tasks_to_run)} READMEs concurrently...")
+             results = await asyncio.gather(*tasks_to_run, return_exceptions=True)
+             for res in results:
+                 if isinstance(res, Exception):
+                     # Log errors from gather explicitly
+                     print(f"WARN [GitHub Service]: Error during asyncio.gather for README fetch task: {res}")
+                 elif res is not None:
+                     readme_contents.append(res)
+             print(f"DEBUG [GitHub Service]: Fetched {len(readme_contents)} non-empty READMEs.")
+    return repos_data, readme_contents
+
+
+# README file names tried by the GraphQL harvest, in order (REST /readme resolves any of them)
+_README_EXPRESSIONS = ("HEAD:README.md", "HEAD:readme.md", "HEAD:README.rst", "HEAD:README")
+
+PROFILE_GRAPHQL_QUERY = """
+query ProfileRepos($first: Int!, $after: String, $withReadme: Boolean!) {
+  viewer {
+    repositories(first: $first, after: $after, orderBy: {field: PUSHED_AT, direction: DESC},
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        description
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+%s
+      }
+    }
+  }
+}
+""" % "\n".join(
+    f'        readme{i}: object(expression: "{expression}") @include(if: $withReadme) {{ ... on Blob {{ text }} }}'
+    for i, expression in enumerate(_README_EXPRESSIONS)
+)
+
+
+async def _harvest_profile_graphql(token: str, max_repos_for_readme: int,
+                                   priority: int = PRIORITY_INTERACTIVE) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Same data as _harvest_profile_rest from at most two GraphQL queries: the top
+    repos with their README blobs inline, then the remaining repos without.
+    Repos are returned in the REST shape the combine step expects.
+    """
+    repos_data: List[Dict[str, Any]] = []; readme_contents: List[str] = []
+    pages = [(max_repos_for_readme, True), (PROFILE_REPO_COUNT - max_repos_for_readme, False)]
+    after = None
+    for first, with_readme in pages:
+        if first <= 0: continue
+        data = await github_graphql(PROFILE_GRAPHQL_QUERY, {"first": first, "after": after, "withReadme": with_readme},
+                                    token, priority=priority)
+        repositories = data["viewer"]["repositories"]
+        for node in repositories["nodes"]:
+            repos_data.append({
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "topics": [item["topic"]["name"] for item in node["repositoryTopics"]["nodes"]],
+                "description": node.get("description"),
+            })
+            readme = next((node[f"readme{i}"]["text"] for i in range(len(_README_EXPRESSIONS))
+                           if (node.get(f"readme{i}") or {}).get("text")), None)
+            if readme:
+                readme_contents.append(re.sub(r'\n{3,}', '\n\n', readme)[:MAX_README_LENGTH])
+        if not repositories["pageInfo"]["hasNextPage"]: break
+        after = repositories["pageInfo"]["endCursor"]
+    print(f"DEBUG [GitHub Service]: GraphQL harvested {len(repos_data)} repos and {len(readme_contents)} READMEs.")
+    return repos_data, readme_contents
+
+
+def _combine_profile_text(repos_data: List[Dict[str, Any]], readme_contents: List[str]) -> Dict[str, List[str] | str]:
+    """ Extracts languages, topics and descriptions from repos and combines them with README text. """
     languages: Set[str] = set()
     topics: Set[str] = set()
     descriptions: List[str] = []
-    readme_tasks = []
     print("DEBUG [GitHub Service]: Starting GitHub data processing...")
 
-    # Process repos data (extract info, prepare tasks)
-    for i, repo in enumerate(repos_data):
+    # Process repos data (extract info)
+    for repo in repos_data:
          if not isinstance(repo, dict): continue
          lang = repo.get("language")
          if lang and lang not in ['null', 'none']: languages.add(lang.lower())
@@ -137,36 +375,6 @@ async def get_profile_text_data(token: str, max_repos_for_readme: int = MAX_REPO
          if repo_topics: topics.update([topic.lower() for topic in repo_topics])
          desc = repo.get("description")
          if desc: descriptions.append(desc)
-         # Schedule README fetch task preparation (client/headers added below)
-         if i < max_repos_for_readme and repo.get("url"):
-             readme_tasks.append({"url": repo['url']}) # Store URL for task creation later
-
-    # Fetch READMEs concurrently using a single client session
-    readme_contents = []
-    if readme_tasks:
-        async with httpx.AsyncClient() as client:
-            # Define standard headers for fetching README JSON metadata
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github.v3+json", # <<< Correct Accept header for metadata
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
-            # Create actual tasks with client and correct headers
-            tasks_to_run = [
-                _fetch_readme_content(task_info['url'], headers, client)
-                for task_info in readme_tasks
-            ]
-
-            if tasks_to_run:
-                 print(f"DEBUG [GitHub Service]: Fetching {len(tasks_to_run)} READMEs concurrently...")
-                 results = await asyncio.gather(*tasks_to_run, return_exceptions=True)
-                 for res in results:
-                     if isinstance(res, Exception):
-                         # Log errors from gather explicitly
-                         print(f"WARN [GitHub Service]: Error during asyncio.gather for README fetch task: {res}")
-                     elif res is not None:
-                         readme_contents.append(res)
-                 print(f"DEBUG [GitHub Service]: Fetched {len(readme_contents)} non-empty READMEs.")
 
     # Combine Text
     text_blob = "\n".join(descriptions + readme_contents)
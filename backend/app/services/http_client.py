@@ -0,0 +1,57 @@
+import httpx
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    client: Optional[httpx.AsyncClient] = None
+
+http = HTTPClient()
+
+
+def _build_client() -> httpx.AsyncClient:
+    from app.core.config import settings
+
+    http2 = settings.HTTP_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP_HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+
+
+async def open_http_client():
+    """ Create the shared outbound HTTP client. Called from the app lifespan. """
+    http.client = _build_client()
+    logger.info("Shared HTTP client opened")
+
+
+async def close_http_client():
+    if http.client is not None:
+        await http.client.aclose()
+        http.client = None
+        logger.info("Shared HTTP client closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client. Usable directly or as a FastAPI dependency.
+    Outside the app lifespan (scripts, shells) a client is created on first use.
+    """
+    if http.client is None:
+        logger.warning("Shared HTTP client requested before startup, creating one lazily")
+        http.client = _build_client()
+    return http.client
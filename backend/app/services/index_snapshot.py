@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+# Issue fields kept in snapshot metadata: what the match results and re-embedding checks need
+_ISSUE_FIELDS = ("id", "html_url", "repository_url", "title", "state", "created_at", "updated_at")
+_BODY_CHARS = 1000
+
+
+def compact_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """ Reduce a GitHub issue payload to the fields the match results use. """
+    compact = {field: issue.get(field) for field in _ISSUE_FIELDS if issue.get(field) is not None}
+    compact["body"] = (issue.get("body") or "")[:_BODY_CHARS]
+    compact["user"] = {"login": (issue.get("user") or {}).get("login")}
+    compact["labels"] = [{"name": label.get("name")} for label in issue.get("labels", [])]
+    return compact
+
+
+class IndexSnapshot:
+    """
+    A saved issue index, opened read-only through memory maps.
+
+    Layout of a snapshot directory:
+        manifest.json   format, embedding model, compression, dimension, counts
+        ids.npy         int64 issue ids in store row order
+        vectors.npy     stored rows (float32 vectors or codec codes)
+        lru.npy         issue ids, least recently seen first
+        seen.npy        float64 wall-clock time each lru entry was last seen on GitHub
+        versions.json   issue version per store row
+        labels.json     label name -> ids of the issues carrying it
+        metadata.bin    compact issue JSON records, concatenated
+        offsets.npy     int64 byte offsets of each record in metadata.bin
+        codec.faiss     trained storage codec (compressed modes only)
+        engine.faiss    corpus engine index (when one was in use)
+
+    Vectors are mapped copy-on-write and the FAISS engine with IO_FLAG_MMAP,
+    so every worker opening the same snapshot shares the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+        self.ids = np.load(os.path.join(path, "ids.npy"))
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="c")
+        self.lru = np.load(os.path.join(path, "lru.npy"))
+        seen_path = os.path.join(path, "seen.npy")
+        self.seen: Optional[np.ndarray] = np.load(seen_path) if os.path.exists(seen_path) else None
+        with open(os.path.join(path, "versions.json"), "r", encoding="utf-8") as f:
+            self.versions: List[str] = json.load(f)
+        labels_path = os.path.join(path, "labels.json")
+        self.labels: Optional[Dict[str, List[int]]] = None
+        if os.path.exists(labels_path):
+            with open(labels_path, "r", encoding="utf-8") as f:
+                self.labels = json.load(f)
+        self._offsets = np.load(os.path.join(path, "offsets.npy"))
+        self._metadata_file = open(os.path.join(path, "metadata.bin"), "rb")
+        self._metadata = (mmap.mmap(self._metadata_file.fileno(), 0, access=mmap.ACCESS_READ)
+                          if self._offsets[-1] > 0 else b"")
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    def issue(self, row: int) -> Dict[str, Any]:
+        """ Decode the metadata record of a snapshot row. """
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json.loads(self._metadata[start:end])
+
+    def read_faiss(self, name: str):
+        """ Memory-map a FAISS index stored in the snapshot, or None if absent. """
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            return None
+        import faiss
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+
+    def close(self) -> None:
+        if isinstance(self._metadata, mmap.mmap):
+            self._metadata.close()
+        self._metadata_file.close()
+
+
+def write_snapshot(root: str, state: Dict[str, Any], keep: int = 2) -> str:
+    """
+    Write an index state (see IssueIndex.snapshot_state) as a new snapshot version.
+
+    The snapshot is written to a temporary directory, renamed into place and
+    then published by atomically replacing the CURRENT pointer, so readers
+    never see a partial snapshot. Only the newest `keep` versions are kept.
+
+    Returns:
+        Path of the new snapshot directory
+    """
+    os.makedirs(root, exist_ok=True)
+    now = time.time()
+    version = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}.{int(now * 1e6) % 1000000:06d}-{os.getpid()}"
+    tmp_path = os.path.join(root, f".tmp-{version}")
+    path = os.path.join(root, version)
+    os.makedirs(tmp_path)
+    try:
+        np.save(os.path.join(tmp_path, "ids.npy"), state["ids"])
+        np.save(os.path.join(tmp_path, "vectors.npy"), state["vectors"])
+        np.save(os.path.join(tmp_path, "lru.npy"), state["lru"])
+        np.save(os.path.join(tmp_path, "seen.npy"), state["seen"])
+        with open(os.path.join(tmp_path, "versions.json"), "w", encoding="utf-8") as f:
+            json.dump(state["versions"], f)
+        with open(os.path.join(tmp_path, "labels.json"), "w", encoding="utf-8") as f:
+            json.dump(state.get("labels", {}), f)
+
+        offsets = [0]
+        with open(os.path.join(tmp_path, "metadata.bin"), "wb") as f:
+            for issue in state["issues"]:
+                record = json.dumps(compact_issue(issue), separators=(",", ":")).encode("utf-8")
+                f.write(record)
+                offsets.append(offsets[-1] + len(record))
+        np.save(os.path.join(tmp_path, "offsets.npy"), np.array(offsets, dtype="int64"))
+
+        for name in ("codec", "engine"):
+            if state.get(name) is not None:
+                with open(os.path.join(tmp_path, f"{name}.faiss"), "wb") as f:
+                    f.write(state[name].tobytes())
+
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": version,
+            "created_at": time.time(),
+            "model": state["model"],
+            "compression": state["compression"],
+            "dimension": state["dimension"],
+            "encoded": state["encoded"],
+            "engine": state["engine_choice"] if state.get("engine") is not None else None,
+            "count": len(state["ids"]),
+        }
+        with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    pointer = os.path.join(root, f".{CURRENT_FILE}-{version}")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+    _prune(root, keep)
+    logger.info(f"Wrote issue index snapshot {version} ({manifest['count']} issues)")
+    return path
+
+
+def _prune(root: str, keep: int) -> None:
+    versions = sorted(name for name in os.listdir(root)
+                      if not name.startswith(".") and os.path.isdir(os.path.join(root, name)))
+    for name in versions[:-keep] if keep > 0 else []:
+        # Workers that still map files from an old snapshot keep their inodes alive
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def load_latest_snapshot(root: str, model: str, compression: str) -> Optional[IndexSnapshot]:
+    """
+    Open the current snapshot if it matches the embedding model and compression mode.
+
+    Returns:
+        The snapshot, or None if there is none or it is incompatible or unreadable
+    """
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    try:
+        snapshot = IndexSnapshot(os.path.join(root, version))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable issue index snapshot {version}: {e}")
+        return None
+
+    manifest = snapshot.manifest
+    expected = {"format": SNAPSHOT_FORMAT, "model": model, "compression": compression}
+    mismatched = {key: manifest.get(key) for key, value in expected.items() if manifest.get(key) != value}
+    if mismatched:
+        logger.info(f"Ignoring issue index snapshot {version}, built with {mismatched} (want {expected})")
+        snapshot.close()
+        return None
+    return snapshot
+
+
+async def run_snapshot_loop(interval: float) -> None:
+    """ Save the issue index every `interval` seconds while it has unsaved changes. """
+    from .issue_index import save_issue_index
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(save_issue_index)
+        except Exception as e:
+            logger.error(f"Issue index snapshot failed: {e}")
@@ -0,0 +1,589 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .index_snapshot import IndexSnapshot, load_latest_snapshot, write_snapshot
+from .vector_search import (
+    COMPRESSION_MODES,
+    COMPRESSION_NONE,
+    ENGINE_NUMPY,
+    choose_engine,
+    create_codec,
+    create_engine,
+    normalize,
+    numpy_top_k,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ISSUES = 50000
+DEFAULT_NUMPY_MAX = 1024
+DEFAULT_FLAT_MAX = 200000
+DEFAULT_MAX_AGE = 0.0
+
+
+def issue_labels(issue: Dict[str, Any]) -> Tuple[str, ...]:
+    """ Lowercased label names of an issue (GitHub's label: search qualifier ignores case). """
+    return tuple(sorted({str(label.get("name", "")).lower() for label in issue.get("labels", []) or []} - {""}))
+
+
+def is_open(issue: Dict[str, Any]) -> bool:
+    """ False for issue payloads GitHub reports as closed. """
+    return issue.get("state", "open") == "open"
+
+
+def issue_text(issue: Dict[str, Any]) -> str:
+    """ Text that is embedded for an issue. """
+    return f"{issue.get('title', '')} {issue.get('body', '') or ''}"
+
+
+def issue_version(issue: Dict[str, Any]) -> str:
+    """
+    Version tag for an issue: GitHub's updated_at when present,
+    otherwise a hash of the embedded text.
+    """
+    updated_at = issue.get("updated_at")
+    if updated_at:
+        return str(updated_at)
+    return hashlib.sha1(issue_text(issue).encode("utf-8")).hexdigest()
+
+
+class IssueIndex:
+    """
+    Long-lived corpus of GitHub issues and their embeddings.
+
+    Issues are keyed by GitHub issue id, so fetching the same issue again
+    only re-embeds it when its version changed. Least recently seen issues
+    are evicted once the corpus grows past max_issues, and with max_age set,
+    issues not seen in a GitHub result for max_age seconds expire (closed
+    issues drop out of the open-issue searches, so they stop being seen).
+    Payloads that report an issue as closed remove it right away.
+
+    Issues are also indexed by label, which is how the search keywords select
+    them (label:"<keyword>"), so matches can be restricted to the issues a
+    request's keywords would have fetched (see ids_with_labels).
+
+    Embeddings are L2-normalized and scored by inner product (cosine).
+    Small candidate sets are scored exactly with NumPy; whole-corpus or large
+    candidate searches go through an engine chosen by corpus size
+    (see vector_search.choose_engine).
+
+    With compression other than "none", stored vectors are kept as codec
+    codes (float16, PCA or PQ) once the codec is trained, and decoded on the
+    fly for exact candidate scoring; the corpus engine is compressed too.
+
+    An index restored from a snapshot (see index_snapshot) serves vectors and
+    issue metadata straight from the snapshot's memory maps until they change.
+    """
+
+    def __init__(self, max_issues: int = DEFAULT_MAX_ISSUES, numpy_max: int = DEFAULT_NUMPY_MAX,
+                 flat_max: int = DEFAULT_FLAT_MAX, compression: str = COMPRESSION_NONE,
+                 max_age: float = DEFAULT_MAX_AGE):
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown compression mode '{compression}', expected one of {COMPRESSION_MODES}")
+        self.max_issues = max_issues
+        self.numpy_max = numpy_max
+        self.flat_max = flat_max
+        self.compression = compression
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        # None values are issues still served from the snapshot metadata
+        self._issues: "OrderedDict[int, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._versions: Dict[int, str] = {}
+        # Label name -> ids of the issues carrying it, and the reverse map
+        self._label_ids: Dict[str, Set[int]] = {}
+        self._issue_labels: Dict[int, Tuple[str, ...]] = {}
+        # Wall-clock time each issue was last seen in a GitHub result (same order as _issues)
+        self._seen_at: Dict[int, float] = {}
+        # Vector store: row i of _matrix holds the embedding (or its codec code) of issue _ids[i]
+        self._matrix: Optional[np.ndarray] = None
+        self._dim: Optional[int] = None
+        self._codec = None
+        self._encoded = False
+        self._ids: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._engine = None
+        # Engine choice for the current corpus size; several choices map to one compressed engine
+        self._engine_choice = ENGINE_NUMPY
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._snapshot_rows: Dict[int, int] = {}
+        # Engine mutations made while a new engine is built outside the lock (None: no build running)
+        self._rebuild_log: Optional[List[Tuple[str, np.ndarray, Optional[np.ndarray]]]] = None
+        # Bumped on every mutation, so unchanged indexes are not saved again
+        self.changes = 0
+        self._saved_changes = 0
+
+    def __len__(self) -> int:
+        return len(self._issues)
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._dim
+
+    @property
+    def engine_name(self) -> str:
+        return self._engine.name if self._engine is not None else ENGINE_NUMPY
+
+    @property
+    def snapshot_version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot is not None else None
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self.changes != self._saved_changes
+
+    @property
+    def bytes_per_vector(self) -> int:
+        """ Bytes each stored vector currently occupies in the store. """
+        if self._matrix is None:
+            return 0
+        return self._matrix.shape[1] * self._matrix.itemsize
+
+    def is_current(self, issue: Dict[str, Any]) -> bool:
+        """ True if the issue is indexed with the same version. """
+        issue_id = issue.get("id")
+        return issue_id is not None and self._versions.get(issue_id) == issue_version(issue)
+
+    def touch(self, issue_ids: Iterable[int]) -> None:
+        """ Mark issues as recently seen so they are not evicted or expired. """
+        now = time.time()
+        with self._lock:
+            for issue_id in issue_ids:
+                if issue_id in self._issues:
+                    self._issues.move_to_end(issue_id)
+                    self._seen_at[issue_id] = now
+
+    def upsert(self, issues: List[Dict[str, Any]], embeddings: np.ndarray) -> None:
+        """
+        Insert or replace issues and their embeddings. Issues whose payload
+        reports them closed are removed instead.
+
+        Args:
+            issues: GitHub issue payloads (must carry an "id")
+            embeddings: Array of shape (len(issues), dim)
+        """
+        closed = [issue["id"] for issue in issues if not is_open(issue)]
+        if closed:
+            self.delete(closed)
+            keep = [i for i, issue in enumerate(issues) if is_open(issue)]
+            issues, embeddings = [issues[i] for i in keep], np.asarray(embeddings)[keep]
+        if not issues:
+            return
+        vectors = normalize(embeddings)
+        ids = np.array([issue["id"] for issue in issues], dtype="int64")
+
+        now = time.time()
+        with self._lock:
+            for issue, vector in zip(issues, vectors):
+                self._store(issue["id"], vector)
+                self._issues[issue["id"]] = issue
+                self._issues.move_to_end(issue["id"])
+                self._versions[issue["id"]] = issue_version(issue)
+                self._seen_at[issue["id"]] = now
+                self._set_labels(issue["id"], issue_labels(issue))
+            self._maybe_encode()
+            if self._engine is not None:
+                self._engine.add(ids, vectors)
+            if self._rebuild_log is not None:
+                self._rebuild_log.append(("add", ids, vectors))
+            self._evict()
+            self.expire(now)
+            rebuild = self._plan_rebuild()
+            self.changes += 1
+        logger.info(f"Upserted {len(issues)} issues, corpus size is now {len(self._issues)}")
+        if rebuild is not None:
+            self._rebuild(*rebuild)
+
+    def delete(self, issue_ids: Iterable[int]) -> int:
+        """ Remove issues by GitHub issue id. Returns the number removed. """
+        with self._lock:
+            present = [issue_id for issue_id in issue_ids if issue_id in self._issues]
+            if not present:
+                return 0
+            for issue_id in present:
+                self._unstore(issue_id)
+                self._issues.pop(issue_id, None)
+                self._versions.pop(issue_id, None)
+                self._seen_at.pop(issue_id, None)
+                self._set_labels(issue_id, ())
+            removed = np.array(present, dtype="int64")
+            if self._engine is not None:
+                self._engine.remove(removed)
+            if self._rebuild_log is not None:
+                self._rebuild_log.append(("remove", removed, None))
+            self.changes += 1
+            return len(present)
+
+    def ids_with_labels(self, labels: Iterable[str]) -> List[int]:
+        """ Ids of indexed issues carrying any of the labels (case-insensitive). """
+        with self._lock:
+            ids: Set[int] = set()
+            for label in labels:
+                ids.update(self._label_ids.get(label.lower(), ()))
+            return list(ids)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Remove issues not seen for max_age seconds (no-op when max_age is 0).
+
+        Returns:
+            Number of issues removed
+        """
+        if self.max_age <= 0:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.max_age
+        with self._lock:
+            # _issues is ordered by last seen, so expired issues are at the front
+            expired = []
+            for issue_id in self._issues:
+                if self._seen_at.get(issue_id, 0.0) >= cutoff:
+                    break
+                expired.append(issue_id)
+            if not expired:
+                return 0
+            self.delete(expired)
+        logger.info(f"Expired {len(expired)} issues not seen for {self.max_age:.0f}s from the index")
+        return len(expired)
+
+    def search(self, query_vector: np.ndarray, top_k: int,
+               candidate_ids: Optional[List[int]] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Search the corpus, optionally restricted to a set of issue ids.
+
+        Returns:
+            List of (issue, cosine similarity) pairs, best first
+        """
+        query = normalize(query_vector)[0]
+        with self._lock:
+            self.expire()
+            if not self._ids:
+                return []
+            if candidate_ids is not None:
+                rows = [self._rows[i] for i in dict.fromkeys(candidate_ids) if i in self._rows]
+                if not rows:
+                    return []
+                if len(rows) <= self.numpy_max or self._engine is None:
+                    positions, scores = numpy_top_k(self._vectors(rows), query, top_k)
+                    hits = [(self._ids[rows[p]], float(s)) for p, s in zip(positions, scores)]
+                else:
+                    selected = np.array([self._ids[row] for row in rows], dtype="int64")
+                    hits = self._engine.search(query, top_k, candidate_ids=selected)
+            elif self._engine is None:
+                positions, scores = numpy_top_k(self._vectors(slice(0, len(self._ids))), query, top_k)
+                hits = [(self._ids[p], float(s)) for p, s in zip(positions, scores)]
+            else:
+                hits = self._engine.search(query, top_k)
+
+            issues = ((self._issue(issue_id), score) for issue_id, score in hits if issue_id in self._issues)
+            return [(issue, score) for issue, score in issues if is_open(issue)]
+
+    def snapshot_state(self, model: str) -> Dict[str, Any]:
+        """
+        Consistent copy of the index for index_snapshot.write_snapshot.
+        Expired issues are dropped first so they are not carried across restarts.
+
+        Args:
+            model: Embedding model id the vectors were produced with
+        """
+        with self._lock:
+            self.expire()
+            count = len(self._ids)
+            engine = self._engine.snapshot_index() if self._engine is not None else None
+            if engine is not None:
+                import faiss
+                engine = faiss.serialize_index(engine)
+            return {
+                "model": model,
+                "compression": self.compression,
+                "dimension": self._dim,
+                "encoded": self._encoded,
+                "engine_choice": self._engine_choice,
+                "ids": np.array(self._ids, dtype="int64"),
+                "vectors": (np.array(self._matrix[:count]) if self._matrix is not None
+                            else np.zeros((0, 0), dtype="float32")),
+                "lru": np.fromiter(self._issues.keys(), dtype="int64", count=len(self._issues)),
+                "seen": np.fromiter((self._seen_at.get(issue_id, 0.0) for issue_id in self._issues),
+                                    dtype="float64", count=len(self._issues)),
+                "versions": [self._versions[issue_id] for issue_id in self._ids],
+                "issues": [self._issue(issue_id) for issue_id in self._ids],
+                "labels": {label: sorted(ids) for label, ids in self._label_ids.items()},
+                "codec": self._codec.serialize() if self._encoded else None,
+                "engine": engine,
+                "changes": self.changes,
+            }
+
+    def mark_saved(self, changes: int) -> None:
+        self._saved_changes = changes
+
+    def restore_snapshot(self, snapshot: IndexSnapshot) -> None:
+        """ Replace the index contents with a snapshot opened by load_latest_snapshot. """
+        manifest = snapshot.manifest
+        with self._lock:
+            self.clear()
+            count = manifest["count"]
+            if not count:
+                snapshot.close()
+                return
+            self._snapshot = snapshot
+            self._dim = manifest["dimension"]
+            self._matrix = snapshot.vectors
+            self._ids = [int(i) for i in snapshot.ids]
+            self._rows = {issue_id: row for row, issue_id in enumerate(self._ids)}
+            self._snapshot_rows = dict(self._rows)
+            self._versions = dict(zip(self._ids, snapshot.versions))
+            self._issues = OrderedDict((int(issue_id), None) for issue_id in snapshot.lru)
+            if snapshot.seen is not None:
+                self._seen_at = dict(zip(self._issues, (float(seen) for seen in snapshot.seen)))
+            else:
+                # Snapshots written before seen times were saved: count issues as seen when it was written
+                created_at = manifest.get("created_at", time.time())
+                self._seen_at = {issue_id: created_at for issue_id in self._issues}
+            if snapshot.labels is not None:
+                for label, ids in snapshot.labels.items():
+                    self._label_ids[label] = set(ids)
+                    for issue_id in ids:
+                        self._issue_labels[issue_id] = self._issue_labels.get(issue_id, ()) + (label,)
+            else:
+                # Snapshots written before the label map: read it from the issue metadata
+                for issue_id, row in self._snapshot_rows.items():
+                    self._set_labels(issue_id, issue_labels(snapshot.issue(row)))
+
+            self._codec = create_codec(self.compression, self._dim)
+            self._encoded = manifest["encoded"]
+            if self._encoded:
+                self._codec.restore(snapshot.read_faiss("codec.faiss"))
+
+            engine_index = snapshot.read_faiss("engine.faiss") if manifest["engine"] else None
+            if engine_index is not None:
+                self._engine_choice = manifest["engine"]
+                self._engine = create_engine(self._engine_choice, self._dim, self.compression)
+                self._engine.restore(engine_index, snapshot.ids)
+            # Issues that went unseen while the service was down are not served
+            self.expire()
+            rebuild = self._plan_rebuild()
+        if rebuild is not None:
+            self._rebuild(*rebuild)
+        logger.info(f"Restored {count} issues from snapshot {snapshot.version} "
+                    f"with the '{self.engine_name}' engine")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._issues.clear()
+            self._versions.clear()
+            self._seen_at.clear()
+            self._label_ids.clear()
+            self._issue_labels.clear()
+            self._matrix = None
+            self._dim = None
+            self._codec = None
+            self._encoded = False
+            self._ids = []
+            self._rows = {}
+            self._engine = None
+            self._engine_choice = ENGINE_NUMPY
+            if self._snapshot is not None:
+                self._snapshot.close()
+            self._snapshot = None
+            self._snapshot_rows = {}
+            # A build in progress belongs to the old contents; drop it when it finishes
+            self._rebuild_log = None
+
+    def _store(self, issue_id: int, vector: np.ndarray) -> None:
+        if self._matrix is None:
+            self._dim = vector.shape[0]
+            self._matrix = np.zeros((64, vector.shape[0]), dtype="float32")
+            self._codec = create_codec(self.compression, self._dim)
+        if self._encoded:
+            vector = self._codec.encode(vector.reshape(1, -1))[0]
+        row = self._rows.get(issue_id)
+        if row is None:
+            if len(self._ids) == self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=self._matrix.dtype)
+                grown[:len(self._ids)] = self._matrix
+                self._matrix = grown
+            row = len(self._ids)
+            self._ids.append(issue_id)
+            self._rows[issue_id] = row
+        self._matrix[row] = vector
+
+    def _set_labels(self, issue_id: int, labels: Tuple[str, ...]) -> None:
+        for label in self._issue_labels.pop(issue_id, ()):
+            ids = self._label_ids.get(label)
+            if ids is not None:
+                ids.discard(issue_id)
+                if not ids:
+                    del self._label_ids[label]
+        if labels:
+            self._issue_labels[issue_id] = labels
+            for label in labels:
+                self._label_ids.setdefault(label, set()).add(issue_id)
+
+    def _issue(self, issue_id: int) -> Dict[str, Any]:
+        issue = self._issues[issue_id]
+        if issue is None:
+            issue = self._snapshot.issue(self._snapshot_rows[issue_id])
+        return issue
+
+    def _vectors(self, rows) -> np.ndarray:
+        """ Float32 vectors for store rows, decoded when the store holds codes. """
+        stored = self._matrix[rows]
+        return self._codec.decode(stored) if self._encoded else stored
+
+    def _maybe_encode(self) -> None:
+        """ Switch the store to codec codes once enough vectors exist to train the codec. """
+        if self._codec is None or self._encoded or len(self._ids) < max(self._codec.train_size, 1):
+            return
+        vectors = self._matrix[:len(self._ids)]
+        if not self._codec.is_trained:
+            self._codec.train(vectors)
+        self._matrix = self._codec.encode(vectors)
+        self._encoded = True
+        logger.info(f"Issue index store compressed with '{self.compression}' "
+                    f"({self._dim * 4} -> {self._codec.code_size} bytes per vector)")
+
+    def _unstore(self, issue_id: int) -> None:
+        # Swap-remove: move the last row into the freed slot
+        row = self._rows.pop(issue_id)
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def _plan_rebuild(self):
+        """
+        Decide whether the engine must change (the corpus crossed a size
+        threshold, or the engine is stale). Called under the lock.
+
+        Returns:
+            None, or (engine, choice, ids, vectors, log) for _rebuild: a new
+            empty engine, a copy of the store to build it from and the log
+            collecting mutations made during the build
+        """
+        wanted = choose_engine(len(self._ids), self.numpy_max, self.flat_max)
+        if wanted == self._engine_choice and not (self._engine is not None and self._engine.needs_rebuild):
+            return None
+        if self._rebuild_log is not None:
+            return None  # a build is already running; the next mutation checks again
+        engine = create_engine(wanted, self._dim, self.compression)
+        if engine is None:
+            self._engine = None
+            self._engine_choice = wanted
+            logger.info(f"Issue index now searches {len(self._ids)} vectors with the '{ENGINE_NUMPY}' engine")
+            return None
+        log = self._rebuild_log = []
+        ids = np.array(self._ids, dtype="int64")
+        vectors = np.array(self._vectors(slice(0, len(self._ids))), dtype="float32")
+        return engine, wanted, ids, vectors, log
+
+    def _rebuild(self, engine, choice: str, ids: np.ndarray, vectors: np.ndarray, log: list) -> None:
+        """
+        Build a planned engine without holding the lock, so searches keep using
+        the current engine, then replay the mutations made meanwhile and swap
+        the new engine in.
+        """
+        try:
+            engine.build(ids, vectors)
+        except BaseException:
+            with self._lock:
+                if self._rebuild_log is log:
+                    self._rebuild_log = None
+            raise
+        with self._lock:
+            if self._rebuild_log is not log:
+                return  # the index was cleared or restored during the build
+            self._rebuild_log = None
+            for operation, op_ids, op_vectors in log:
+                if operation == "add":
+                    engine.add(op_ids, op_vectors)
+                else:
+                    engine.remove(op_ids)
+            self._engine = engine
+            self._engine_choice = choice
+        logger.info(f"Issue index now searches {len(ids)} vectors with the '{engine.name}' engine")
+
+    def _evict(self) -> None:
+        overflow = len(self._issues) - self.max_issues
+        if overflow <= 0:
+            return
+        oldest = [issue_id for issue_id, _ in zip(self._issues.keys(), range(overflow))]
+        self.delete(oldest)
+        logger.info(f"Evicted {len(oldest)} least recently seen issues from the index")
+
+
+issue_index: Optional[IssueIndex] = None
+_snapshot_model: Optional[str] = None
+
+
+def open_issue_index(model: Optional[str] = None) -> IssueIndex:
+    """
+    Create the process-wide issue index. Called from the app lifespan.
+
+    Args:
+        model: Embedding model id; when given, the latest compatible snapshot is restored
+    """
+    global issue_index, _snapshot_model
+    from app.core.config import settings
+    issue_index = IssueIndex(
+        max_issues=settings.ISSUE_INDEX_MAX_ISSUES,
+        numpy_max=settings.VECTOR_SEARCH_NUMPY_MAX,
+        flat_max=settings.VECTOR_SEARCH_FLAT_MAX,
+        compression=settings.ISSUE_INDEX_COMPRESSION,
+        max_age=settings.ISSUE_INDEX_MAX_AGE,
+    )
+    _snapshot_model = model
+    if model is not None and settings.ISSUE_INDEX_SNAPSHOT_DIR:
+        snapshot = load_latest_snapshot(settings.ISSUE_INDEX_SNAPSHOT_DIR, model, issue_index.compression)
+        if snapshot is not None:
+            try:
+                issue_index.restore_snapshot(snapshot)
+            except Exception as e:
+                logger.error(f"Failed to restore issue index snapshot {snapshot.version}: {e}")
+                issue_index.clear()
+    logger.info(f"Issue index ready (max {issue_index.max_issues} issues, {len(issue_index)} loaded)")
+    return issue_index
+
+
+def save_issue_index() -> Optional[str]:
+    """
+    Write a snapshot of the shared issue index if it changed since the last save.
+
+    Returns:
+        Path of the new snapshot, or None if nothing was written
+    """
+    from app.core.config import settings
+    index = issue_index
+    if index is None or _snapshot_model is None or not settings.ISSUE_INDEX_SNAPSHOT_DIR:
+        return None
+    if not index.has_unsaved_changes or not len(index):
+        return None
+    state = index.snapshot_state(_snapshot_model)
+    path = write_snapshot(settings.ISSUE_INDEX_SNAPSHOT_DIR, state, keep=settings.ISSUE_INDEX_SNAPSHOT_KEEP)
+    index.mark_saved(state["changes"])
+    return path
+
+
+def close_issue_index() -> None:
+    """ Save a final snapshot and drop the index. """
+    global issue_index
+    if issue_index is not None:
+        try:
+            save_issue_index()
+        except Exception as e:
+            logger.error(f"Failed to save issue index snapshot: {e}")
+        issue_index.clear()
+        issue_index = None
+
+
+def get_issue_index() -> IssueIndex:
+    """ Return the shared issue index, creating it if the lifespan has not run. """
+    if issue_index is None:
+        return open_issue_index()
+    return issue_index
@@ -0,0 +1,76 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Largest leaderboard page; every cache bucket holds this many entries
+MAX_LEADERBOARD_LIMIT = 100
+
+# Loader of the top entries of one skill bucket (None: whole leaderboard)
+Loader = Callable[[Optional[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+class LeaderboardCache:
+    """
+    In-process cache of the top leaderboard entries per skill filter.
+
+    Each bucket holds the top `size` entries; smaller limits are served as a
+    prefix of the same bucket. Writers to the leaderboard call invalidate(),
+    which drops every bucket and bumps a generation counter so a read that
+    started before the write does not store its (now stale) result. The TTL
+    bounds staleness from writes made by other workers.
+    """
+
+    def __init__(self, ttl: float, size: int, max_entries: int = 256):
+        self.ttl = ttl
+        self.size = size
+        self.max_entries = max_entries
+        self._buckets: Dict[Optional[str], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def top(self, skill: Optional[str], limit: int, loader: Loader) -> List[Dict[str, Any]]:
+        """
+        Top `limit` entries (at most `size`) for a skill filter, loading the bucket on a miss.
+        """
+        bucket = self._buckets.get(skill)
+        if bucket is not None and time.monotonic() - bucket[0] < self.ttl:
+            self.hits += 1
+            return bucket[1][:limit]
+        self.misses += 1
+        generation = self._generation
+        entries = await loader(skill)
+        if generation == self._generation:
+            if skill not in self._buckets and len(self._buckets) >= self.max_entries:
+                self._buckets.pop(next(iter(self._buckets)))
+            self._buckets[skill] = (time.monotonic(), entries)
+        return entries[:limit]
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._buckets.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self._buckets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+leaderboard_cache: Optional[LeaderboardCache] = None
+
+
+def get_leaderboard_cache() -> LeaderboardCache:
+    global leaderboard_cache
+    if leaderboard_cache is None:
+        from app.core.config import settings
+        leaderboard_cache = LeaderboardCache(settings.LEADERBOARD_CACHE_TTL, MAX_LEADERBOARD_LIMIT)
+    return leaderboard_cache
+
+
+def invalidate_leaderboard() -> None:
+    """ Called after every leaderboard write. """
+    get_leaderboard_cache().invalidate()
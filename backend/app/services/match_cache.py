@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def match_cache_key(keywords: List[str], languages: List[str], topics: List[str], max_results: int,
+                    profile_hash: str) -> str:
+    """
+    Canonical key of a match request: order and case of keywords, languages
+    and topics do not matter, and the profile is represented by its hash.
+    """
+    def canonical(values: List[str]) -> List[str]:
+        return sorted({value.strip().lower() for value in values if value and value.strip()})
+
+    payload = json.dumps({
+        "keywords": canonical(keywords),
+        "languages": canonical(languages),
+        "topics": canonical(topics),
+        "max_results": max_results,
+        "profile": profile_hash,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MatchResultCache:
+    """
+    In-process TTL cache of match results with a memory cap.
+
+    Entry size is estimated from the JSON encoding of the result; least
+    recently used entries are evicted once the total passes max_bytes.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), size, result)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+match_cache: Optional[MatchResultCache] = None
+
+
+def get_match_cache() -> MatchResultCache:
+    """ Return the shared match result cache, creating it from settings on first use. """
+    global match_cache
+    if match_cache is None:
+        from app.core.config import settings
+        match_cache = MatchResultCache(settings.MATCH_CACHE_TTL, settings.MATCH_CACHE_MAX_BYTES)
+    return match_cache
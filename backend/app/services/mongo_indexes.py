@@ -0,0 +1,197 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Index options compared for drift detection (everything else is ignored)
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Declarative index spec per collection. Each entry mirrors the arguments of
+# create_index: "keys" plus any options in _COMPARED_OPTIONS.
+INDEX_SPECS: Dict[str, List[Dict[str, Any]]] = {
+    "users": [
+        {"name": "githubId_unique", "keys": [("githubId", ASCENDING)], "unique": True},
+        # Only users that generated a code carry one, so missing codes must not collide
+        {"name": "referralCode_unique", "keys": [("referralCode", ASCENDING)], "unique": True,
+         "partialFilterExpression": {"referralCode": {"$type": "string"}}},
+    ],
+    "leaderboard": [
+        {"name": "githubId_unique", "keys": [("githubId", ASCENDING)], "unique": True},
+        # Ranking order (score desc, githubId); also serves the rank and window range counts
+        {"name": "score_desc_githubId", "keys": [("score", DESCENDING), ("githubId", ASCENDING)]},
+        {"name": "skills_score_desc_githubId",
+         "keys": [("skills", ASCENDING), ("score", DESCENDING), ("githubId", ASCENDING)]},
+    ],
+    "contributions": [
+        {"name": "userId_createdAt_desc",
+         "keys": [("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]},
+    ],
+    "referrals": [
+        {"name": "referredUserId", "keys": [("referredUserId", ASCENDING)]},
+        # Covers the referral stats totals without fetching documents
+        {"name": "referrerId_status_points",
+         "keys": [("referrerId", ASCENDING), ("status", ASCENDING), ("pointsAwarded", ASCENDING)]},
+    ],
+    "mentorship_requests": [
+        {"name": "mentorGithubId_createdAt_desc",
+         "keys": [("mentorGithubId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]},
+        {"name": "requesterId_mentorGithubId_status",
+         "keys": [("requesterId", ASCENDING), ("mentorGithubId", ASCENDING), ("status", ASCENDING)]},
+    ],
+    "mentors": [
+        {"name": "githubId", "keys": [("githubId", ASCENDING)]},
+        {"name": "availability", "keys": [("availability", ASCENDING)]},
+    ],
+}
+
+# Representative router queries, explained by explain_router_queries with placeholder values
+ROUTER_QUERIES: List[Dict[str, Any]] = [
+    {"name": "users by githubId", "collection": "users", "filter": {"githubId": "0"}, "limit": 1},
+    {"name": "users by referralCode", "collection": "users", "filter": {"referralCode": "ABCDEFGH"}, "limit": 1},
+    {"name": "leaderboard top", "collection": "leaderboard", "filter": {},
+     "sort": [("score", DESCENDING), ("githubId", ASCENDING)], "limit": 100},
+    {"name": "leaderboard top by skill", "collection": "leaderboard", "filter": {"skills": "python"},
+     "sort": [("score", DESCENDING), ("githubId", ASCENDING)], "limit": 100},
+    {"name": "leaderboard entries ahead", "collection": "leaderboard",
+     "filter": {"$or": [{"score": {"$gt": 100}}, {"score": 100, "githubId": {"$lt": "0"}}]},
+     "projection": {"_id": 0, "score": 1, "githubId": 1}},
+    {"name": "leaderboard by githubId", "collection": "leaderboard", "filter": {"githubId": "0"}, "limit": 1},
+    {"name": "contributions page", "collection": "contributions", "filter": {"userId": "0"},
+     "sort": [("createdAt", DESCENDING), ("_id", DESCENDING)], "limit": 21},
+    {"name": "referrals by referredUserId", "collection": "referrals", "filter": {"referredUserId": "0"}, "limit": 1},
+    {"name": "referral stats", "collection": "referrals", "filter": {"referrerId": "0"},
+     "projection": {"_id": 0, "status": 1, "pointsAwarded": 1}},
+    {"name": "mentorship requests page", "collection": "mentorship_requests", "filter": {"mentorGithubId": "0"},
+     "sort": [("createdAt", DESCENDING), ("_id", DESCENDING)], "limit": 21},
+    {"name": "open mentorship request", "collection": "mentorship_requests",
+     "filter": {"requesterId": "0", "mentorGithubId": "0", "status": {"$in": ["pending", "accepted"]}}, "limit": 1},
+    {"name": "available mentors", "collection": "mentors", "filter": {"availability": {"$ne": "unavailable"}},
+     "limit": 20},
+    {"name": "mentor by githubId", "collection": "mentors", "filter": {"githubId": "0"}, "limit": 1},
+]
+
+# Report of the last ensure_indexes run (served by /metrics)
+index_report: Optional[Dict[str, Any]] = None
+
+
+def _key_of(keys) -> List[List[Any]]:
+    return [[field, direction if isinstance(direction, str) else int(direction)] for field, direction in keys]
+
+
+def _options_of(index: Dict[str, Any]) -> Dict[str, Any]:
+    return {option: index[option] for option in _COMPARED_OPTIONS if index.get(option)}
+
+
+def diff_indexes(collection: str, existing: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Compare the indexes of a collection with INDEX_SPECS.
+
+    Args:
+        collection: Collection name
+        existing: Index documents from list_indexes()
+
+    Returns:
+        Spec names grouped as "present", "missing" or "drifted" (same name or
+        keys but different definition), plus "extra" indexes not in the spec
+    """
+    by_name = {index["name"]: index for index in existing}
+    by_key = {str(_key_of(index["key"].items())): index for index in existing}
+    report: Dict[str, List[str]] = {"present": [], "missing": [], "drifted": [], "extra": []}
+    matched = {"_id_"}
+    for spec in INDEX_SPECS.get(collection, []):
+        key = _key_of(spec["keys"])
+        index = by_name.get(spec["name"]) or by_key.get(str(key))
+        if index is None:
+            report["missing"].append(spec["name"])
+            continue
+        matched.add(index["name"])
+        if _key_of(index["key"].items()) != key or _options_of(index) != _options_of(spec):
+            report["drifted"].append(spec["name"])
+        else:
+            report["present"].append(spec["name"])
+    report["extra"] = sorted(name for name in by_name if name not in matched)
+    return report
+
+
+async def ensure_indexes(db) -> Dict[str, Any]:
+    """
+    Create missing indexes from INDEX_SPECS and report drift.
+
+    Drifted indexes are only reported, never dropped: rebuilding an index on
+    a live collection is left to an operator. A failed build (for example a
+    unique index over existing duplicates) is logged and does not stop the others.
+
+    Returns:
+        Per-collection report from diff_indexes, plus "created" and "failed" names
+    """
+    global index_report
+    report: Dict[str, Any] = {}
+    for collection, specs in INDEX_SPECS.items():
+        try:
+            existing = [index async for index in db[collection].list_indexes()]
+        except PyMongoError as e:
+            logger.error(f"Could not list indexes of {collection}: {e}")
+            report[collection] = {"error": str(e)}
+            continue
+        result: Dict[str, Any] = diff_indexes(collection, existing)
+        result["created"], result["failed"] = [], []
+        for spec in specs:
+            if spec["name"] not in result["missing"]:
+                continue
+            options = {option: spec[option] for option in _COMPARED_OPTIONS if option in spec}
+            try:
+                await db[collection].create_index(spec["keys"], name=spec["name"], **options)
+                result["created"].append(spec["name"])
+            except PyMongoError as e:
+                logger.error(f"Could not create index {collection}.{spec['name']}: {e}")
+                result["failed"].append(spec["name"])
+        if result["drifted"]:
+            logger.warning(f"Indexes of {collection} differ from the spec: {result['drifted']}")
+        if result["created"]:
+            logger.info(f"Created indexes on {collection}: {result['created']}")
+        report[collection] = result
+    index_report = report
+    return report
+
+
+def _plan_summary(explained: Dict[str, Any]) -> Dict[str, Any]:
+    planner = explained.get("queryPlanner", {})
+    stages, indexes = [], []
+    stage = planner.get("winningPlan", {})
+    while stage:
+        # Newer servers wrap the classic plan in "queryPlan"
+        stage = stage.get("queryPlan", stage)
+        stages.append(stage.get("stage"))
+        if stage.get("indexName"):
+            indexes.append(stage["indexName"])
+        stage = stage.get("inputStage") or (stage.get("inputStages") or [None])[0]
+    stats = explained.get("executionStats", {})
+    return {
+        "stages": stages,
+        "indexes": indexes,
+        "collection_scan": "COLLSCAN" in stages,
+        "in_memory_sort": "SORT" in stages,
+        "returned": stats.get("nReturned"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+    }
+
+
+async def explain_router_queries(db) -> List[Dict[str, Any]]:
+    """ Run explain() for each of ROUTER_QUERIES and summarize the winning plans. """
+    results = []
+    for query in ROUTER_QUERIES:
+        cursor = db[query["collection"]].find(query["filter"], query.get("projection"))
+        if query.get("sort"):
+            cursor = cursor.sort(query["sort"])
+        if query.get("limit"):
+            cursor = cursor.limit(query["limit"])
+        try:
+            summary = _plan_summary(await cursor.explain())
+        except PyMongoError as e:
+            summary = {"error": str(e)}
+        results.append({"name": query["name"], "collection": query["collection"], **summary})
+    return results
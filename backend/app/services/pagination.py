@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import Response
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Carries the next cursor when a listing is returned as a plain list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """ A cursor that was not produced by encode_cursor. """
+
+
+def clamp_page_size(limit: Optional[int], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    if limit is None:
+        return default
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(document: Dict[str, Any], sort_field: str) -> str:
+    """ Opaque cursor pointing just past a document in (sort_field desc, _id desc) order. """
+    payload = json.dumps({"v": document.get(sort_field), "id": str(document["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return payload["v"], ObjectId(payload["id"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def page_response(items: List[Dict[str, Any]], next_cursor: Optional[str], envelope: bool,
+                  response: Response) -> Any:
+    """
+    Shape a page for a list endpoint.
+
+    Clients that pass limit or cursor get {"items", "nextCursor"}. Other
+    clients keep the original plain list (the first page) and find the next
+    cursor, if any, in the X-Next-Cursor header.
+    """
+    if envelope:
+        return {"items": items, "nextCursor": next_cursor}
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+async def fetch_page(collection, query: Dict[str, Any], projection: Dict[str, int], limit: int,
+                     cursor: Optional[str] = None, sort_field: str = "createdAt") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of a collection in (sort_field desc, _id desc) order using keyset pagination.
+
+    Instead of skipping, the next page starts strictly after the last
+    document returned, so every page costs the same with an index on
+    (filter fields, sort_field).
+
+    Args:
+        collection: Motor collection
+        query: Filter of the listing
+        projection: Fields to return
+        limit: Page size (already clamped)
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        The documents of the page and the cursor of the next page (None on the last page)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": last_id}},
+        ]}]}
+    documents = await (collection.find(query, projection)
+                       .sort([(sort_field, -1), ("_id", -1)])
+                       .limit(limit + 1)
+                       .to_list(limit + 1))
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1], sort_field)
+    return documents, next_cursor
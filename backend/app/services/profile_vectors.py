@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from bson.binary import Binary
+
+from .embedding_service import get_embedding_service
+from .faiss_search import embedding_model_id
+from .mongodb_service import get_database
+
+logger = logging.getLogger(__name__)
+
+# Field of the users document holding the cached profile embedding
+PROFILE_VECTOR_FIELD = "profileVector"
+
+# Background writes in flight (kept referenced until done)
+_pending_writes: set = set()
+
+
+def profile_hash(text: str, model: Optional[str] = None) -> str:
+    """ Content hash of a profile query text for the current embedding model. """
+    model = model or embedding_model_id()
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+async def load_profile_vector(github_id: str, text_hash: str) -> Optional[np.ndarray]:
+    """
+    Return the stored profile embedding of a user if it was computed from the same content.
+
+    Args:
+        github_id: GitHub user id (users.githubId)
+        text_hash: Hash from profile_hash for the current profile text
+
+    Returns:
+        The float32 embedding, or None on a miss
+    """
+    db = get_database()
+    user = await db.users.find_one({"githubId": github_id}, {PROFILE_VECTOR_FIELD: 1})
+    cached = (user or {}).get(PROFILE_VECTOR_FIELD)
+    if not cached or cached.get("hash") != text_hash:
+        return None
+    return np.frombuffer(cached["vector"], dtype="float16").astype("float32")
+
+
+async def store_profile_vector(github_id: str, text_hash: str, vector: np.ndarray) -> None:
+    """
+    Store a profile embedding as float16 on the user's document.
+    Users without a document (no skills submitted yet) are not cached.
+    """
+    db = get_database()
+    vector = np.asarray(vector, dtype="float16").reshape(-1)
+    await db.users.update_one(
+        {"githubId": github_id},
+        {"$set": {PROFILE_VECTOR_FIELD: {
+            "hash": text_hash,
+            "model": embedding_model_id(),
+            "dim": int(vector.shape[0]),
+            "vector": Binary(vector.tobytes()),
+            "updatedAt": datetime.utcnow().isoformat(),
+        }}}
+    )
+
+
+async def get_profile_vector(github_id: Optional[str], text: str) -> np.ndarray:
+    """
+    Embedding of a user's profile query text, reused from Mongo while the content is unchanged.
+
+    Args:
+        github_id: GitHub user id, or None to skip the cache
+        text: Profile query text
+
+    Returns:
+        Array of shape (1, dim)
+    """
+    text_hash = profile_hash(text)
+    if github_id is not None:
+        try:
+            cached = await load_profile_vector(github_id, text_hash)
+            if cached is not None:
+                logger.info(f"Profile vector cache hit for user {github_id}")
+                return cached.reshape(1, -1)
+        except Exception as e:
+            logger.warning(f"Profile vector lookup failed: {e}")
+
+    vectors = await get_embedding_service().encode([text])
+    if github_id is not None:
+        # Persist in the background; the response does not wait on Mongo
+        task = asyncio.create_task(_store_quietly(github_id, text_hash, vectors[0]))
+        _pending_writes.add(task)
+        task.add_done_callback(_pending_writes.discard)
+    return vectors
+
+
+async def _store_quietly(github_id: str, text_hash: str, vector: np.ndarray) -> None:
+    try:
+        await store_profile_vector(github_id, text_hash, vector)
+    except Exception as e:
+        logger.warning(f"Could not store profile vector for user {github_id}: {e}")
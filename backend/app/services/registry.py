@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+# Backoff between warmup retries of a failed required service (seconds)
+WARMUP_RETRY_BASE = 2.0
+WARMUP_RETRY_MAX = 60.0
+
+
+class _Service:
+    def __init__(self, name: str, loader: Callable[[], Any], required: bool):
+        self.name = name
+        self.loader = loader
+        self.required = required
+        self.instance: Any = None
+        self.state = STATE_PENDING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.attempts = 0
+        self.next_retry_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ServiceRegistry:
+    """
+    Lazily initialized heavy services (models, cloud clients).
+
+    Nothing is loaded at import time. A service is loaded on first get(), or
+    ahead of traffic by warmup() from the app lifespan. A failed load is
+    retried on the next get(), and warmup() keeps retrying failed required
+    services with exponential backoff. Required services gate readiness.
+    """
+
+    def __init__(self):
+        self._services: Dict[str, _Service] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], required: bool = True) -> None:
+        self._services[name] = _Service(name, loader, required)
+
+    def get(self, name: str) -> Any:
+        service = self._services[name]
+        if service.state == STATE_READY:
+            return service.instance
+        with service.lock:
+            if service.state == STATE_READY:
+                return service.instance
+            service.state = STATE_LOADING
+            service.attempts += 1
+            started = time.perf_counter()
+            try:
+                service.instance = service.loader()
+            except Exception as e:
+                service.state = STATE_FAILED
+                service.error = str(e)
+                logger.error(f"Failed to initialize {name}: {str(e)}")
+                raise
+            service.load_seconds = time.perf_counter() - started
+            service.state = STATE_READY
+            service.error = None
+            logger.info(f"Initialized {name} in {service.load_seconds:.2f}s")
+            return service.instance
+
+    async def warmup(self, retry_base: float = WARMUP_RETRY_BASE, retry_max: float = WARMUP_RETRY_MAX) -> None:
+        """
+        Load every registered service in worker threads. Failures are recorded,
+        not raised; required services are retried with exponential backoff
+        (retry_base doubling up to retry_max) until they load, so a transient
+        failure does not leave readiness failing for good.
+        """
+        async def load(name: str) -> None:
+            service = self._services[name]
+            delay = retry_base
+            while True:
+                try:
+                    await asyncio.to_thread(self.get, name)
+                    service.next_retry_at = None
+                    return
+                except Exception:
+                    if not service.required:
+                        return
+                service.next_retry_at = time.time() + delay
+                logger.warning(f"Retrying {name} in {delay:.0f}s (attempt {service.attempts} failed)")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, retry_max)
+
+        await asyncio.gather(*[load(name) for name in self._services])
+
+    def is_ready(self) -> bool:
+        return all(service.state == STATE_READY for service in self._services.values() if service.required)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "services": {
+                name: {
+                    "state": service.state,
+                    "required": service.required,
+                    "load_seconds": service.load_seconds,
+                    "error": service.error,
+                    "attempts": service.attempts,
+                    "next_retry_at": service.next_retry_at,
+                }
+                for name, service in self._services.items()
+            },
+        }
+
+
+registry = ServiceRegistry()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Loader argument: True when called for a background revalidation
+Loader = Callable[[bool], Awaitable[Any]]
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process async cache with stale-while-revalidate semantics.
+
+    Entries younger than ttl are served as is. Older entries (up to max_stale)
+    are still served immediately while a single background task refreshes
+    them; entries older than that, missing entries and forced refreshes wait
+    for the loader. Concurrent loads of one key share a single loader call,
+    run as its own task so a cancelled caller does not cancel it for the others.
+    Least recently used entries are evicted past max_entries.
+    """
+
+    def __init__(self, ttl: float, max_stale: float, max_entries: int, name: str = "cache"):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    async def get(self, key: Hashable, loader: Loader, refresh: bool = False) -> Any:
+        """
+        Return the cached value for key, loading or revalidating it as needed.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a fresh value
+            refresh: Skip the cache and wait for a fresh value
+        """
+        entry = self._entries.get(key)
+        if entry is not None and not refresh:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._refreshing and key not in self._inflight:
+                    task = asyncio.create_task(self._revalidate(key, loader))
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda _, key=key: self._refreshing.pop(key, None))
+                return entry[1]
+        self.misses += 1
+        return await self._load(key, loader, background=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshing),
+            "refresh_errors": self.refresh_errors,
+        }
+
+    async def _load(self, key: Hashable, loader: Loader, background: bool) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_loader(key, loader, background))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._load_done(key, done))
+        # Shielded so a cancelled caller does not cancel the load the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _call_loader(self, key: Hashable, loader: Loader, background: bool) -> Any:
+        value = await loader(background)
+        self._store(key, value)
+        return value
+
+    def _load_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so a load whose callers were all cancelled does not log "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def _revalidate(self, key: Hashable, loader: Loader) -> None:
+        try:
+            await self._load(key, loader, background=True)
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Background refresh of {self.name} entry failed, serving stale data: {e}")
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,365 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENGINE_NUMPY = "numpy"
+ENGINE_FLAT = "flat"
+ENGINE_HNSW = "hnsw"
+ENGINE_COMPRESSED = "compressed"
+
+COMPRESSION_NONE = "none"
+COMPRESSION_FP16 = "fp16"
+COMPRESSION_PCA = "pca"
+COMPRESSION_IVFPQ = "ivfpq"
+COMPRESSION_MODES = (COMPRESSION_NONE, COMPRESSION_FP16, COMPRESSION_PCA, COMPRESSION_IVFPQ)
+# FAISS wants 39 training points per PQ centroid (256 per sub-quantizer)
+IVFPQ_MIN_TRAIN = 256 * 39
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """ L2-normalize rows so inner product equals cosine similarity. Zero rows stay zero. """
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def numpy_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact inner-product top-k with a matmul and argpartition.
+
+    Returns:
+        (row positions, scores), best first
+    """
+    if matrix.shape[0] == 0 or k <= 0:
+        return np.empty(0, dtype="int64"), np.empty(0, dtype="float32")
+    scores = matrix @ query.reshape(-1)
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(scores.shape[0])
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top, scores[top]
+
+
+def choose_engine(corpus_size: int, numpy_max: int, flat_max: int) -> str:
+    """ Pick the search engine for a corpus of the given size. """
+    if corpus_size <= numpy_max:
+        return ENGINE_NUMPY
+    if corpus_size <= flat_max:
+        return ENGINE_FLAT
+    return ENGINE_HNSW
+
+
+class FlatIPEngine:
+    """ Exact inner-product search with FAISS, updated incrementally by id. """
+
+    name = ENGINE_FLAT
+
+    def __init__(self, dim: int):
+        import faiss
+        self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    @property
+    def ntotal(self) -> int:
+        return self._index.ntotal
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return False
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self._index.reset()
+        if len(ids):
+            self._index.add_with_ids(vectors, ids)
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self._index.remove_ids(ids)
+        self._index.add_with_ids(vectors, ids)
+
+    def remove(self, ids: np.ndarray) -> None:
+        self._index.remove_ids(ids)
+
+    def snapshot_index(self):
+        """ FAISS index to save in a snapshot. """
+        return self._index
+
+    def restore(self, index, ids: np.ndarray) -> None:
+        self._index = index
+
+    def search(self, query: np.ndarray, k: int, candidate_ids: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        import faiss
+        params = None
+        if candidate_ids is not None:
+            selector = faiss.IDSelectorBatch(len(candidate_ids), faiss.swig_ptr(candidate_ids))
+            params = faiss.SearchParameters(sel=selector)
+        scores, labels = self._index.search(query.reshape(1, -1), k, params=params)
+        return [(int(label), float(score)) for label, score in zip(labels[0], scores[0]) if label >= 0]
+
+
+class HNSWEngine:
+    """
+    Approximate inner-product search with a FAISS HNSW graph.
+
+    HNSW cannot delete, so the graph is an immutable base plus an exact
+    "delta" of vectors added or changed since it was built. Removed and
+    changed ids are filtered out of base results. The owner rebuilds the
+    base once the delta grows past rebuild_fraction of it.
+    """
+
+    name = ENGINE_HNSW
+
+    def __init__(self, dim: int, m: int = 32, ef_construction: int = 80, ef_search: int = 64,
+                 rebuild_fraction: float = 0.1):
+        self.dim = dim
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.rebuild_fraction = rebuild_fraction
+        self._base = None
+        self._base_size = 0
+        self._base_ids: set = set()
+        self._stale: set = set()
+        self._delta: Dict[int, np.ndarray] = {}
+
+    @property
+    def ntotal(self) -> int:
+        return self._base_size - len(self._stale) + len(self._delta)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        changed = len(self._stale) + len(self._delta)
+        return changed > max(1000, self.rebuild_fraction * self._base_size)
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        import faiss
+        index = faiss.IndexHNSWFlat(self.dim, self.m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self.ef_construction
+        index = faiss.IndexIDMap(index)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._base = index
+        self._base_size = len(ids)
+        self._base_ids = set(int(i) for i in ids)
+        self._stale.clear()
+        self._delta.clear()
+        logger.info(f"Built HNSW index over {len(ids)} vectors")
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        for issue_id, vector in zip(ids, vectors):
+            issue_id = int(issue_id)
+            if self._base is not None and issue_id in self._base_ids:
+                self._stale.add(issue_id)
+            self._delta[issue_id] = vector
+
+    def remove(self, ids: np.ndarray) -> None:
+        for issue_id in ids:
+            issue_id = int(issue_id)
+            self._delta.pop(issue_id, None)
+            if self._base is not None and issue_id in self._base_ids:
+                self._stale.add(issue_id)
+
+    def snapshot_index(self):
+        """ The base graph, when it has no pending delta; otherwise a restore rebuilds it. """
+        if self._stale or self._delta:
+            return None
+        return self._base
+
+    def restore(self, index, ids: np.ndarray) -> None:
+        self._base = index
+        self._base_size = index.ntotal
+        self._base_ids = set(int(i) for i in ids)
+        self._stale.clear()
+        self._delta.clear()
+
+    def search(self, query: np.ndarray, k: int, candidate_ids: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        import faiss
+        results: Dict[int, float] = {}
+        if self._base is not None and self._base_size:
+            params = faiss.SearchParametersHNSW(efSearch=max(self.ef_search, k))
+            if candidate_ids is not None:
+                selector = faiss.IDSelectorBatch(len(candidate_ids), faiss.swig_ptr(candidate_ids))
+                params.sel = selector
+            fetch = min(self._base_size, k + len(self._stale))
+            scores, labels = self._base.search(query.reshape(1, -1), fetch, params=params)
+            for label, score in zip(labels[0], scores[0]):
+                if label >= 0 and int(label) not in self._stale:
+                    results[int(label)] = float(score)
+        if self._delta:
+            allowed = set(int(i) for i in candidate_ids) if candidate_ids is not None else None
+            delta_ids = [i for i in self._delta if allowed is None or i in allowed]
+            if delta_ids:
+                matrix = np.stack([self._delta[i] for i in delta_ids])
+                rows, scores = numpy_top_k(matrix, query, k)
+                for row, score in zip(rows, scores):
+                    results[delta_ids[row]] = float(score)
+        return sorted(results.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+class VectorCodec:
+    """
+    FAISS standalone codec used to keep corpus vectors compact in memory.
+
+    fp16 halves storage and needs no training; pca projects to pca_dim
+    dimensions; ivfpq stores product-quantized codes of pq_m bytes. PCA and
+    PQ must be trained, so vectors stay float32 until train_size are seen.
+    """
+
+    def __init__(self, mode: str, dim: int, pca_dim: int = 128, pq_m: int = 48):
+        import faiss
+        if mode not in COMPRESSION_MODES or mode == COMPRESSION_NONE:
+            raise ValueError(f"Unknown compression mode '{mode}'")
+        self.mode = mode
+        self.dim = dim
+        pca_dim = min(pca_dim, dim)
+        factory = {
+            COMPRESSION_FP16: "SQfp16",
+            COMPRESSION_PCA: f"PCA{pca_dim},Flat",
+            COMPRESSION_IVFPQ: f"PQ{pq_m}",
+        }[mode]
+        self._index = faiss.index_factory(dim, factory, faiss.METRIC_INNER_PRODUCT)
+        # PCA needs comfortably more points than dimensions
+        self.train_size = {COMPRESSION_FP16: 0, COMPRESSION_PCA: 4 * dim, COMPRESSION_IVFPQ: IVFPQ_MIN_TRAIN}[mode]
+
+    @property
+    def is_trained(self) -> bool:
+        return self._index.is_trained
+
+    @property
+    def code_size(self) -> int:
+        return self._index.sa_code_size()
+
+    def train(self, vectors: np.ndarray) -> None:
+        self._index.train(np.ascontiguousarray(vectors, dtype="float32"))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return self._index.sa_encode(np.ascontiguousarray(vectors, dtype="float32"))
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self._index.sa_decode(np.ascontiguousarray(codes))
+
+    def serialize(self) -> np.ndarray:
+        import faiss
+        return faiss.serialize_index(self._index)
+
+    def restore(self, index) -> None:
+        """ Replace the codec with a trained one loaded from a snapshot. """
+        self._index = index
+
+
+class CompressedEngine:
+    """
+    Whole-corpus search over compressed vectors: float16 flat, PCA flat,
+    or IVF-PQ. PCA and IVF-PQ are trained on the corpus when built.
+    """
+
+    name = ENGINE_COMPRESSED
+
+    def __init__(self, mode: str, dim: int, pca_dim: int = 128, pq_m: int = 48,
+                 nlist: int = 1024, nprobe: int = 16):
+        if mode not in COMPRESSION_MODES or mode == COMPRESSION_NONE:
+            raise ValueError(f"Unknown compression mode '{mode}'")
+        self.mode = mode
+        self.dim = dim
+        self.pca_dim = min(pca_dim, dim)
+        self.pq_m = pq_m
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._index = None
+        self._ivf = False
+
+    @property
+    def ntotal(self) -> int:
+        return self._index.ntotal if self._index is not None else 0
+
+    @property
+    def needs_rebuild(self) -> bool:
+        # IVF-PQ starts out as float16 flat until there is enough data to train it
+        return self.mode == COMPRESSION_IVFPQ and not self._ivf and self.ntotal >= IVFPQ_MIN_TRAIN
+
+    def bytes_per_vector(self) -> float:
+        import faiss
+        if not self.ntotal:
+            return 0.0
+        return len(faiss.serialize_index(self._index)) / self.ntotal
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        import faiss
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        self._ivf = self.mode == COMPRESSION_IVFPQ and len(ids) >= IVFPQ_MIN_TRAIN
+        if self._ivf:
+            # About 4 * sqrt(n) lists, and at least 39 training points per list
+            nlist = max(1, min(self.nlist, int(4 * np.sqrt(max(len(ids), 1))), len(ids) // 39))
+            index = faiss.index_factory(self.dim, f"IVF{nlist},PQ{self.pq_m}", faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = min(self.nprobe, nlist)
+        else:
+            factory = f"PCA{self.pca_dim},Flat" if self.mode == COMPRESSION_PCA else "SQfp16"
+            index = faiss.IndexIDMap2(faiss.index_factory(self.dim, factory, faiss.METRIC_INNER_PRODUCT))
+        if not index.is_trained:
+            index.train(vectors)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._index = index
+        fallback = " (float16 until IVF-PQ can be trained)" if self.mode == COMPRESSION_IVFPQ and not self._ivf else ""
+        logger.info(f"Built {self.mode} index over {len(ids)} vectors{fallback}")
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self._index.remove_ids(ids)
+        self._index.add_with_ids(np.ascontiguousarray(vectors, dtype="float32"), ids)
+
+    def remove(self, ids: np.ndarray) -> None:
+        self._index.remove_ids(ids)
+
+    def snapshot_index(self):
+        """ FAISS index to save in a snapshot. """
+        return self._index
+
+    def restore(self, index, ids: np.ndarray) -> None:
+        import faiss
+        self._index = index
+        self._ivf = isinstance(index, faiss.IndexIVF)
+
+    def search(self, query: np.ndarray, k: int, candidate_ids: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        import faiss
+        if self._ivf:
+            params = faiss.SearchParametersIVF(nprobe=self._index.nprobe)
+        else:
+            params = faiss.SearchParameters()
+        if candidate_ids is not None:
+            selector = faiss.IDSelectorBatch(len(candidate_ids), faiss.swig_ptr(candidate_ids))
+            params.sel = selector
+        scores, labels = self._index.search(query.reshape(1, -1), k, params=params)
+        return [(int(label), float(score)) for label, score in zip(labels[0], scores[0]) if label >= 0]
+
+
+def create_engine(name: str, dim: int, compression: str = COMPRESSION_NONE):
+    """
+    Create a corpus search engine; None means plain NumPy over the store.
+    With compression enabled, every non-NumPy engine is a CompressedEngine.
+    """
+    if name == ENGINE_NUMPY:
+        return None
+    from app.core.config import settings
+    if compression != COMPRESSION_NONE:
+        return CompressedEngine(compression, dim, pca_dim=settings.ISSUE_INDEX_PCA_DIM,
+                                pq_m=settings.ISSUE_INDEX_PQ_M, nlist=settings.ISSUE_INDEX_IVF_NLIST,
+                                nprobe=settings.ISSUE_INDEX_IVF_NPROBE)
+    if name == ENGINE_FLAT:
+        return FlatIPEngine(dim)
+    if name == ENGINE_HNSW:
+        return HNSWEngine(dim, m=settings.VECTOR_SEARCH_HNSW_M, ef_search=settings.VECTOR_SEARCH_HNSW_EF_SEARCH)
+    raise ValueError(f"Unknown vector search engine '{name}'")
+
+
+def create_codec(compression: str, dim: int) -> Optional[VectorCodec]:
+    """ Storage codec for a compression mode; None keeps float32 vectors. """
+    if compression == COMPRESSION_NONE:
+        return None
+    from app.core.config import settings
+    return VectorCodec(compression, dim, pca_dim=settings.ISSUE_INDEX_PCA_DIM, pq_m=settings.ISSUE_INDEX_PQ_M)
@@ -1,11 +1,10 @@
 import os
-from google.cloud import language_v1
-from google.oauth2 import service_account
-from google.api_core import exceptions as google_exceptions
-from typing import Dict, List, Set, Optional
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationResponse, Candidate
-from vertexai.generative_models._generative_models import SafetyRating
+from typing import Dict, List, Set, Optional, TYPE_CHECKING
+from .registry import registry
+
+if TYPE_CHECKING:
+    from google.cloud import language_v1
+    from vertexai.generative_models import GenerativeModel
 
 
 VERTEX_AI_PROJECT_ID: Optional[str] = None
@@ -14,39 +13,61 @@ GEMINI_MODEL_NAME = "gemini-2.0-flash-001"
 
 key_path = os.path.join(os.path.dirname(__file__), '.', 'keys.json')
 
-credentials = None
-client: Optional[language_v1.LanguageServiceClient] = None
-gen_model: Optional[GenerativeModel] = None
+gen_model: Optional["GenerativeModel"] = None
 initialization_error: Optional[str] = None
 
-try:
-    if not os.path.isabs(key_path):
-        script_dir = os.path.dirname(__file__)
-        key_path_abs = os.path.join(script_dir, '..', key_path)
-    else:
-        key_path_abs = key_path
 
-    print(f"DEBUG: Attempting to load credentials from absolute path: {key_path_abs}")
-    if not os.path.exists(key_path_abs):
-        raise FileNotFoundError(f"Service account key file not found at calculated path: {key_path_abs} (original path was '{key_path}')")
+def _load_language_client() -> "language_v1.LanguageServiceClient":
+    """
+    Loads service account credentials and builds the Cloud Natural Language client.
+    Runs on first use or during warmup, never at import time.
+    """
+    global initialization_error
+    # Imported here: the Google Cloud SDKs are slow to import
+    from google.cloud import language_v1
+    from google.oauth2 import service_account
+    from google.api_core import exceptions as google_exceptions
+
+    try:
+        if not os.path.isabs(key_path):
+            script_dir = os.path.dirname(__file__)
+            key_path_abs = os.path.join(script_dir, '..', key_path)
+        else:
+            key_path_abs = key_path
+
+        print(f"DEBUG: Attempting to load credentials from absolute path: {key_path_abs}")
+        if not os.path.exists(key_path_abs):
+            raise FileNotFoundError(f"Service account key file not found at calculated path: {key_path_abs} (original path was '{key_path}')")
+
+        credentials = service_account.Credentials.from_service_account_file(key_path_abs)
+        print(f"DEBUG: Successfully loaded credentials from: {key_path_abs}")
+        print(f"DEBUG: Using Project ID from credentials: {credentials.project_id}")
+
+        print("DEBUG: Initializing Google Cloud Language client...")
+        language_client = language_v1.LanguageServiceClient(credentials=credentials)
+        print("DEBUG: Google Cloud Language client initialized successfully with explicit credentials.")
+        initialization_error = None
+        return language_client
+
+    except FileNotFoundError as e:
+        initialization_error = f"CRITICAL ERROR: {e}. Please ensure the 'key_path' variable points to the correct file location relative to the project structure."
+    except google_exceptions.GoogleAPICallError as e:
+        initialization_error = f"CRITICAL ERROR: Failed to initialize Google Cloud Language client (API Call Error): {e}. Check permissions and network."
+    except Exception as e:
+        initialization_error = f"CRITICAL ERROR: Failed to load credentials or initialize Google Cloud Language client: {e}"
+    print(initialization_error)
+    raise RuntimeError(initialization_error)
+
 
-    credentials = service_account.Credentials.from_service_account_file(key_path_abs)
-    print(f"DEBUG: Successfully loaded credentials from: {key_path_abs}")
-    print(f"DEBUG: Using Project ID from credentials: {credentials.project_id}")
+registry.register("language_client", _load_language_client, required=False)
 
-    print("DEBUG: Initializing Google Cloud Language client...")
-    client = language_v1.LanguageServiceClient(credentials=credentials)
-    print("DEBUG: Google Cloud Language client initialized successfully with explicit credentials.")
 
-except FileNotFoundError as e:
-    initialization_error = f"CRITICAL ERROR: {e}. Please ensure the 'key_path' variable points to the correct file location relative to the project structure."
-    print(initialization_error)
-except google_exceptions.GoogleAPICallError as e:
-    initialization_error = f"CRITICAL ERROR: Failed to initialize Google Cloud Language client (API Call Error): {e}. Check permissions and network."
-    print(initialization_error)
-except Exception as e:
-    initialization_error = f"CRITICAL ERROR: Failed to load credentials or initialize Google Cloud Language client: {e}"
-    print(initialization_error)
+def get_language_client() -> Optional["language_v1.LanguageServiceClient"]:
+    """ Returns the Cloud Natural Language client, or None if it cannot be initialized. """
+    try:
+        return registry.get("language_client")
+    except Exception:
+        return None
 
 # --- Service Function ---
 
@@ -56,6 +77,7 @@ def analyze_profile_text(text_blob: str) -> Dict[str, List[str]]:
     to extract relevant keywords/entities.
     (Implementation details omitted for brevity - assume it's the same as your provided code)
     """
+    client = get_language_client()
     if client is None:
         print(f"ERROR in analyze_profile_text: Language client was not initialized. Initialization error was: {initialization_error}")
         return {"keywords_entities": []}
@@ -63,6 +85,9 @@ def analyze_profile_text(text_blob: str) -> Dict[str, List[str]]:
         print("Warning: Text blob provided to analyze_profile_text was empty.")
         return {"keywords_entities": []}
 
+    from google.cloud import language_v1
+    from google.api_core import exceptions as google_exceptions
+
     # --- Filtering Configuration ---
     RELEVANT_ENTITY_TYPES = {
         language_v1.Entity.Type.ORGANIZATION, language_v1.Entity.Type.CONSUMER_GOOD,
@@ -137,6 +162,9 @@ def generate_github_query_with_genai(
         print(f"ERROR in generate_github_query_with_genai: Generative model client not initialized. Error: {initialization_error}")
         return None # Return None if model itself failed to load
 
+    from google.api_core import exceptions as google_exceptions
+    from vertexai.generative_models import GenerationResponse, Candidate
+
     generated_queries: List[str] = [] # Initialize list to store results
 
     # --- Define Prompt Variations ---
@@ -0,0 +1,64 @@
+"""
+Import-time regression check for the API.
+
+Imports app.main in a fresh interpreter and fails if it takes longer than the
+budget or pulls in heavy libraries that must only load lazily (torch, the
+sentence-transformers model, FAISS, Google Cloud SDKs).
+
+Usage (from backend/):
+    python scripts/check_import_time.py [--budget SECONDS]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "faiss", "google.cloud.language_v1", "vertexai"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# Settings requires these; dummy values are enough to import the app
+REQUIRED_ENV = {
+    "GITHUB_CLIENT_ID": "import-check",
+    "GITHUB_CLIENT_SECRET": "import-check",
+    "SECRET_KEY": "import-check",
+    "MONGODB_URI": "mongodb://localhost:27017",
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("IMPORT_TIME_BUDGET", "2.0")),
+                        help="Maximum seconds allowed for 'import app.main' (default 2.0)")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**REQUIRED_ENV, **os.environ}
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=backend_dir, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        print("FAIL: 'import app.main' raised", file=sys.stderr)
+        return 1
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"import app.main: {report['seconds']:.2f}s (budget {args.budget:.2f}s)")
+    failed = False
+    if report["loaded"]:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(report['loaded'])}")
+        failed = True
+    if report["seconds"] > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
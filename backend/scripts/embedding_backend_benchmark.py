@@ -0,0 +1,124 @@
+"""
+Parity check and benchmark for the embedding backends.
+
+Encodes the same texts with the torch backend and the quantized ONNX backend,
+each in its own subprocess so peak RSS is measured per backend, then reports
+throughput, peak RSS and cosine agreement between the two sets of vectors.
+Exits non-zero if the minimum cosine similarity is below --min-cosine.
+
+Usage (from backend/):
+    python scripts/embedding_backend_benchmark.py [--texts FILE] [--count N] [--onnx-file PATH]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = (
+    "fix bug crash error typo docs documentation readme add support feature test tests "
+    "python javascript typescript react api endpoint cli config parser build ci workflow "
+    "refactor improve performance memory leak windows linux macos install dependency update "
+    "good first issue beginner help wanted ui button layout css accessibility translation"
+).split()
+
+
+def synthetic_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 80))) for _ in range(count)]
+
+
+def run_backend(backend: str, onnx_file, texts_path: str, out_path: str, batch_size: int) -> None:
+    """ Child mode: load one backend, encode the texts, save vectors and print stats as JSON. """
+    sys.path.insert(0, BACKEND_DIR)
+    from app.services.faiss_search import load_embedding_model
+
+    with open(texts_path) as f:
+        texts = json.load(f)
+    started = time.perf_counter()
+    model = load_embedding_model(backend, onnx_file)
+    load_seconds = time.perf_counter() - started
+
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    started = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    encode_seconds = time.perf_counter() - started
+    np.save(out_path, np.asarray(vectors, dtype="float32"))
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+    print(json.dumps({
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "texts_per_second": len(texts) / encode_seconds,
+        "peak_rss_mb": peak_rss_mb,
+    }))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare torch and ONNX embedding backends")
+    parser.add_argument("--texts", help="JSON file with a list of texts (default: synthetic issue-like texts)")
+    parser.add_argument("--count", type=int, default=2000, help="Number of synthetic texts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--onnx-file", default=None, help="ONNX file inside the model repo")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="Minimum per-text cosine agreement")
+    parser.add_argument("--child", nargs=3, metavar=("BACKEND", "TEXTS", "OUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.child[0], args.onnx_file, args.child[1], args.child[2], args.batch_size)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        texts_path = os.path.join(tmp, "texts.json")
+        if args.texts:
+            with open(args.texts) as f:
+                texts = json.load(f)
+        else:
+            texts = synthetic_texts(args.count)
+        with open(texts_path, "w") as f:
+            json.dump(texts, f)
+
+        reports, vectors = {}, {}
+        for backend in ("torch", "onnx"):
+            out_path = os.path.join(tmp, f"{backend}.npy")
+            command = [sys.executable, __file__, "--batch-size", str(args.batch_size),
+                       "--child", backend, texts_path, out_path]
+            if args.onnx_file:
+                command += ["--onnx-file", args.onnx_file]
+            result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(result.stderr, file=sys.stderr)
+                print(f"FAIL: {backend} backend could not run")
+                return 1
+            reports[backend] = json.loads(result.stdout.strip().splitlines()[-1])
+            vectors[backend] = np.load(out_path)
+
+    a, b = vectors["torch"], vectors["onnx"]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+    print(f"{len(texts)} texts, batch size {args.batch_size}")
+    print(f"{'backend':<8} {'load s':>8} {'texts/s':>10} {'peak RSS MB':>12}")
+    for backend, report in reports.items():
+        print(f"{backend:<8} {report['load_seconds']:>8.2f} {report['texts_per_second']:>10.1f} {report['peak_rss_mb']:>12.0f}")
+    speedup = reports["onnx"]["texts_per_second"] / reports["torch"]["texts_per_second"]
+    print(f"onnx speedup: {speedup:.2f}x")
+    print(f"cosine agreement: mean {cosine.mean():.4f}, min {cosine.min():.4f}")
+
+    if cosine.min() < args.min_cosine:
+        print(f"FAIL: minimum cosine {cosine.min():.4f} below {args.min_cosine}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
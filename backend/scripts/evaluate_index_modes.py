@@ -0,0 +1,108 @@
+"""
+Offline evaluation of the issue index compression modes.
+
+For each ISSUE_INDEX_COMPRESSION mode, builds the corpus engine the issue
+index would use and reports recall@k against exact float32 search, queries
+per second and index bytes per vector. Also reports the stored code size of
+the matching storage codec and the recall of exact scoring over decoded
+codes (the candidate-set path of IssueIndex.search).
+
+Random vectors understate how well PCA and PQ do on real embeddings; pass
+--corpus with a .npy snapshot of issue embeddings before picking a mode.
+
+Usage (from backend/):
+    python scripts/evaluate_index_modes.py [--size 50000] [--dim 384] [--modes none,fp16,pca,ivfpq]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.vector_search import (  # noqa: E402
+    COMPRESSION_MODES,
+    COMPRESSION_NONE,
+    CompressedEngine,
+    FlatIPEngine,
+    VectorCodec,
+    normalize,
+    numpy_top_k,
+)
+
+
+def recall(approx, exact, k: int) -> float:
+    return float(np.mean([len(set(a[:k]) & set(e[:k])) / k for a, e in zip(approx, exact)]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare recall, QPS and memory of index compression modes")
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--modes", default=",".join(COMPRESSION_MODES))
+    parser.add_argument("--pca-dim", type=int, default=128)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--corpus", help=".npy file of embeddings to sample the corpus and queries from")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.corpus:
+        source = normalize(np.load(args.corpus))
+        args.dim = source.shape[1]
+        picked = rng.permutation(len(source))
+        corpus = source[picked[:args.size]]
+        queries = source[picked[args.size:args.size + args.queries]]
+        if len(queries) < args.queries:
+            # Not enough held-out rows: perturb corpus rows instead
+            noise = 0.1 * rng.standard_normal((args.queries, args.dim)).astype("float32")
+            queries = normalize(corpus[rng.integers(0, len(corpus), args.queries)] + noise)
+    else:
+        corpus = normalize(rng.standard_normal((args.size, args.dim)).astype("float32"))
+        queries = normalize(rng.standard_normal((args.queries, args.dim)).astype("float32"))
+    ids = np.arange(len(corpus), dtype="int64")
+    exact = [numpy_top_k(corpus, q, args.k)[0].tolist() for q in queries]
+
+    print(f"corpus {len(corpus)} x {args.dim}, {len(queries)} queries, k={args.k}")
+    print(f"{'mode':>6} {'recall@k':>9} {'qps':>9} {'index B/vec':>12} {'build s':>8} "
+          f"{'store B/vec':>12} {'store recall':>13}")
+    for mode in args.modes.split(","):
+        if mode == COMPRESSION_NONE:
+            engine = FlatIPEngine(args.dim)
+        else:
+            engine = CompressedEngine(mode, args.dim, pca_dim=args.pca_dim, pq_m=args.pq_m,
+                                      nlist=args.nlist, nprobe=args.nprobe)
+        started = time.perf_counter()
+        engine.build(ids, corpus)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        approx = [[i for i, _ in engine.search(q, args.k)] for q in queries]
+        qps = len(queries) / (time.perf_counter() - started)
+        if mode == COMPRESSION_NONE:
+            index_bytes = args.dim * 4
+        else:
+            index_bytes = engine.bytes_per_vector()
+
+        if mode == COMPRESSION_NONE:
+            store_bytes, store_recall = args.dim * 4, 1.0
+        else:
+            codec = VectorCodec(mode, args.dim, pca_dim=args.pca_dim, pq_m=args.pq_m)
+            if not codec.is_trained:
+                codec.train(corpus[:max(codec.train_size, min(len(corpus), 50000))])
+            decoded = codec.decode(codec.encode(corpus))
+            store_bytes = codec.code_size
+            store_recall = recall([numpy_top_k(decoded, q, args.k)[0].tolist() for q in queries], exact, args.k)
+
+        print(f"{mode:>6} {recall(approx, exact, args.k):>9.3f} {qps:>9.0f} {index_bytes:>12.1f} {build_s:>8.2f} "
+              f"{store_bytes:>12} {store_recall:>13.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Report MongoDB index drift and the query plans of the router queries.
+
+Connects with MONGODB_URI, compares each collection's indexes with
+app/services/mongo_indexes.INDEX_SPECS and runs explain() for every entry
+of ROUTER_QUERIES, flagging collection scans and in-memory sorts.
+With --apply, missing indexes are created first (as at app startup).
+
+Usage (from backend/):
+    python scripts/explain_mongo_queries.py [--apply] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.mongo_indexes import INDEX_SPECS, diff_indexes, ensure_indexes, explain_router_queries  # noqa: E402
+from app.services.mongodb_service import close_mongo_connection, connect_to_mongo, mongodb  # noqa: E402
+
+
+async def main(apply: bool, as_json: bool) -> int:
+    await connect_to_mongo()
+    if mongodb.db is None:
+        return 1
+    db = mongodb.db
+    try:
+        if apply:
+            drift = await ensure_indexes(db)
+        else:
+            drift = {}
+            for collection in INDEX_SPECS:
+                existing = [index async for index in db[collection].list_indexes()]
+                drift[collection] = diff_indexes(collection, existing)
+        plans = await explain_router_queries(db)
+    finally:
+        await close_mongo_connection()
+
+    if as_json:
+        print(json.dumps({"indexes": drift, "plans": plans}, indent=2, default=str))
+    else:
+        print("Index drift:")
+        for collection, report in drift.items():
+            print(f"  {collection}: " + ", ".join(f"{kind}={names}" for kind, names in report.items() if names))
+        print("\nQuery plans:")
+        for plan in plans:
+            if "error" in plan:
+                print(f"  {plan['name']:<32} ERROR {plan['error']}")
+                continue
+            flags = [flag for flag, on in (("COLLSCAN", plan["collection_scan"]),
+                                           ("IN-MEMORY SORT", plan["in_memory_sort"])) if on]
+            print(f"  {plan['name']:<32} {' > '.join(plan['stages']):<28} "
+                  f"index={','.join(plan['indexes']) or '-'} keys={plan['keys_examined']} "
+                  f"docs={plan['docs_examined']} returned={plan['returned']} {' '.join(flags)}")
+    return 1 if any(plan.get("collection_scan") for plan in plans) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="Create missing indexes before explaining")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.apply, args.json)))
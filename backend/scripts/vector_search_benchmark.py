@@ -0,0 +1,111 @@
+"""
+Benchmark of the vector search engines used by the issue index.
+
+For a range of corpus sizes, measures per-query latency of NumPy
+(matmul + argpartition), FAISS flat inner product and FAISS HNSW on random
+normalized vectors, plus HNSW recall@k against exact search. Prints the
+fastest engine per size and the observed crossover points, which are what
+VECTOR_SEARCH_NUMPY_MAX and VECTOR_SEARCH_FLAT_MAX should be set to.
+HNSW only counts as the winner when its recall@k reaches --min-recall.
+Random vectors are a worst case for HNSW recall; pass --corpus with a
+.npy snapshot of real issue embeddings for representative numbers.
+
+Usage (from backend/):
+    python scripts/vector_search_benchmark.py [--sizes 100,1000,...] [--dim 384] [--queries 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.vector_search import FlatIPEngine, HNSWEngine, normalize, numpy_top_k  # noqa: E402
+
+DEFAULT_SIZES = "64,256,1024,2048,4096,16384,65536,200000,500000"
+
+
+def time_queries(search, queries: np.ndarray) -> float:
+    """ Mean seconds per query. """
+    started = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - started) / len(queries)
+
+
+def recall(approx, exact, k: int) -> float:
+    return float(np.mean([len(set(a[:k]) & set(e[:k])) / k for a, e in zip(approx, exact)]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Find the NumPy / flat / HNSW crossover points")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated corpus sizes")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--hnsw-min-size", type=int, default=4096,
+                        help="Skip HNSW below this size (build cost dominates)")
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    parser.add_argument("--corpus", help=".npy file of embeddings to sample corpora and queries from")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    source = None
+    if args.corpus:
+        source = normalize(np.load(args.corpus))
+        args.dim = source.shape[1]
+
+    def sample(count: int) -> np.ndarray:
+        if source is None:
+            return normalize(rng.standard_normal((count, args.dim)).astype("float32"))
+        return source[rng.integers(0, len(source), count)]
+
+    queries = sample(args.queries)
+
+    print(f"{'size':>8} {'numpy ms':>9} {'flat ms':>9} {'hnsw ms':>9} {'hnsw build s':>12} {'recall@k':>9}  fastest")
+    winners = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        corpus = sample(size)
+        ids = np.arange(size, dtype="int64")
+
+        numpy_ms = time_queries(lambda q: numpy_top_k(corpus, q, args.k), queries) * 1000
+
+        flat = FlatIPEngine(args.dim)
+        flat.build(ids, corpus)
+        flat_ms = time_queries(lambda q: flat.search(q, args.k), queries) * 1000
+
+        hnsw_ms = build_s = hnsw_recall = None
+        if size >= args.hnsw_min_size:
+            hnsw = HNSWEngine(args.dim)
+            started = time.perf_counter()
+            hnsw.build(ids, corpus)
+            build_s = time.perf_counter() - started
+            hnsw_ms = time_queries(lambda q: hnsw.search(q, args.k), queries) * 1000
+            exact = [numpy_top_k(corpus, q, args.k)[0].tolist() for q in queries[:50]]
+            approx = [[i for i, _ in hnsw.search(q, args.k)] for q in queries[:50]]
+            hnsw_recall = recall(approx, exact, args.k)
+
+        timings = {"numpy": numpy_ms, "flat": flat_ms}
+        if hnsw_ms is not None and hnsw_recall >= args.min_recall:
+            timings["hnsw"] = hnsw_ms
+        fastest = min(timings, key=timings.get)
+        winners.append((size, fastest))
+
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else "-"
+        print(f"{size:>8} {numpy_ms:>9.3f} {flat_ms:>9.3f} {fmt(hnsw_ms, '>9.3f'):>9} "
+              f"{fmt(build_s, '>12.2f'):>12} {fmt(hnsw_recall, '>9.3f'):>9}  {fastest}")
+
+    print()
+    previous = None
+    for size, fastest in winners:
+        if previous is not None and fastest != previous[1]:
+            print(f"crossover {previous[1]} -> {fastest} between {previous[0]} and {size} vectors")
+        previous = (size, fastest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
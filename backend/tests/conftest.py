@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Settings require these; the tests never talk to GitHub or MongoDB
+for name, value in (("GITHUB_CLIENT_ID", "test"), ("GITHUB_CLIENT_SECRET", "test"),
+                    ("SECRET_KEY", "test"), ("MONGODB_URI", "mongodb://localhost:27017")):
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
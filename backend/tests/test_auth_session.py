@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from app.api.v1.endpoints import auth
+from app.services.github_cache import token_scope
+
+
+class FakeRequest:
+    def __init__(self, session):
+        self.session = session
+
+
+def _resolver(monkeypatch):
+    calls = []
+
+    async def resolve_github_user(token):
+        calls.append(token)
+        return {"id": 42, "login": "octocat", "email": "octo@example.com", "avatar_url": "https://avatar"}
+
+    monkeypatch.setattr(auth, "resolve_github_user", resolve_github_user)
+    return calls
+
+
+def test_session_keeps_only_user_id_and_token_hash(monkeypatch):
+    _resolver(monkeypatch)
+    request = FakeRequest({
+        "github_token": "gho_token",
+        # Snapshot left behind by an older cookie is replaced
+        auth.SESSION_USER_KEY: {"scope": token_scope("gho_token"), "cachedAt": time.time(), "user": {"id": 42}},
+    })
+
+    user = asyncio.run(auth.get_github_user(request))
+
+    assert user["login"] == "octocat"
+    stored = request.session[auth.SESSION_USER_KEY]
+    assert set(stored) == {"scope", "id", "cachedAt"}
+    assert stored["id"] == 42 and stored["scope"] == token_scope("gho_token")
+
+
+def test_user_id_served_from_session_for_matching_token(monkeypatch):
+    calls = _resolver(monkeypatch)
+    request = FakeRequest({"github_token": "gho_token"})
+
+    assert asyncio.run(auth.get_github_user_id(request)) == "42"
+    assert asyncio.run(auth.get_github_user_id(request)) == "42"
+    assert len(calls) == 1
+
+    # A new token in the same session is resolved again
+    request.session["github_token"] = "gho_other"
+    asyncio.run(auth.get_github_user_id(request))
+    assert calls == ["gho_token", "gho_other"]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+
+
+def _put(cache, start, count):
+    keys = [(issue_id, "v1") for issue_id in range(start, start + count)]
+    cache.put_many(keys, np.ones((count, 4), dtype="float32"))
+
+
+def test_eviction_is_batched_and_keeps_most_recent(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"), "model", max_entries=100)
+    try:
+        _put(cache, 0, 90)
+        _put(cache, 90, 40)
+        # 130 rows written: one size check, trimmed back to the cap
+        assert cache.stats()["entries"] == 100
+        assert cache.get_many([(0, "v1")]) == {}
+        assert (129, "v1") in cache.get_many([(129, "v1")])
+
+        # Below the next check the cache may overshoot, by at most one batch interval
+        _put(cache, 130, 50)
+        assert cache.stats()["entries"] == 150
+        _put(cache, 180, 50)
+        assert cache.stats()["entries"] == 100
+    finally:
+        cache.close()
+
+
+def test_replacing_a_version_keeps_one_row_per_issue(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"), "model", max_entries=100)
+    try:
+        cache.put_many([(1, "v1")], np.ones((1, 4), dtype="float32"))
+        cache.put_many([(1, "v2")], np.full((1, 4), 2.0, dtype="float32"))
+        assert cache.stats()["entries"] == 1
+        assert cache.get_many([(1, "v1")]) == {}
+        assert cache.get_many([(1, "v2")])[(1, "v2")][0] == 2.0
+    finally:
+        cache.close()
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from app.services.executor import CPUExecutor
+
+
+def test_cancelled_queued_jobs_release_their_slots():
+    executor = CPUExecutor(max_workers=1, max_queue=4)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(blocking))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        waiting = [asyncio.ensure_future(executor.run(lambda: "never")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert executor.stats()["queued"] == 3
+
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+        assert executor.stats()["queued"] == 0
+
+        release.set()
+        assert await running == "done"
+        # The full queue is available again
+        assert await asyncio.gather(*(executor.run(lambda: 1) for _ in range(4))) == [1, 1, 1, 1]
+
+    try:
+        asyncio.run(scenario())
+        stats = executor.stats()
+        assert stats["queued"] == 0 and stats["running"] == 0 and stats["completed"] == 5
+    finally:
+        executor.shutdown()
@@ -0,0 +1,35 @@
+import asyncio
+
+import httpx
+
+from app.services import github_cache, github_service, http_client
+
+
+def test_not_modified_response_replays_cached_body(tmp_path):
+    seen_validators = []
+
+    async def handler(request):
+        seen_validators.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"etag": '"v1"'}, json={"login": "octocat"})
+
+    async def fetch_twice():
+        http_client.http.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        github_cache.github_cache = github_cache.GitHubResponseCache(str(tmp_path / "github.sqlite3"))
+        try:
+            url = f"{github_service.GITHUB_API_URL}/user"
+            first = await github_service.github_get(url, "token")
+            second = await github_service.github_get(url, "token")
+            return first, second, github_cache.github_cache.stats()
+        finally:
+            github_cache.close_github_cache()
+            await http_client.http.client.aclose()
+            http_client.http.client = None
+
+    first, second, stats = asyncio.run(fetch_twice())
+
+    assert seen_validators == [None, '"v1"']
+    assert first.json() == second.json() == {"login": "octocat"}
+    assert second.status_code == 200
+    assert stats["stored"] == 1 and stats["revalidated"] == 1
@@ -0,0 +1,71 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+
+from app.services import github_service, http_client
+
+
+def _run_with_transport(handler, coroutine_factory):
+    async def main():
+        previous = http_client.http.client
+        http_client.http.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await coroutine_factory()
+        finally:
+            await http_client.http.client.aclose()
+            http_client.http.client = previous
+    return asyncio.run(main())
+
+
+def test_coalesced_gzip_response_is_readable_by_every_caller():
+    payload = {"items": [{"id": 1, "title": "good first issue"}]}
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url)
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "content-encoding": "gzip"},
+            content=gzip.compress(json.dumps(payload).encode("utf-8")),
+        )
+
+    async def fetch_concurrently():
+        return await asyncio.gather(*[
+            github_service.github_get(f"{github_service.GITHUB_API_URL}/search/issues", "token",
+                                      params={"q": "label:\"good first issue\""})
+            for _ in range(5)
+        ])
+
+    responses = _run_with_transport(handler, fetch_concurrently)
+
+    assert len(calls) == 1
+    for response in responses:
+        assert response.status_code == 200
+        assert response.json() == payload
+        assert "content-encoding" not in response.headers
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"login": "octocat"})
+
+    async def cancel_first_caller():
+        url = f"{github_service.GITHUB_API_URL}/user"
+        first = asyncio.create_task(github_service.github_get(url, "token"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(github_service.github_get(url, "token"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    response = _run_with_transport(handler, cancel_first_caller)
+
+    assert len(calls) == 1
+    assert response.json() == {"login": "octocat"}
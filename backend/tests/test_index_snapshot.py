@@ -0,0 +1,35 @@
+import numpy as np
+
+from app.services import issue_index as issue_index_module
+from app.services.index_snapshot import load_latest_snapshot, write_snapshot
+from app.services.issue_index import IssueIndex
+
+
+def _issue(issue_id, label):
+    return {"id": issue_id, "title": f"Issue {issue_id}", "body": "", "state": "open",
+            "labels": [{"name": label}], "updated_at": f"2024-01-01T00:00:{issue_id:02d}Z"}
+
+
+def test_snapshot_keeps_labels_state_and_seen_times(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(issue_index_module.time, "time", lambda: clock[0])
+    vectors = np.random.default_rng(0).standard_normal((4, 8)).astype("float32")
+    index = IssueIndex(max_age=100.0)
+    index.upsert([_issue(0, "rust"), _issue(1, "rust")], vectors[:2])
+    clock[0] = 1080.0
+    index.upsert([_issue(2, "Python"), _issue(3, "python")], vectors[2:])
+
+    write_snapshot(str(tmp_path), index.snapshot_state("model"))
+    snapshot = load_latest_snapshot(str(tmp_path), "model", index.compression)
+
+    # Restored 50s later: the rust issues were last seen 130s ago and expire
+    clock[0] = 1130.0
+    restored = IssueIndex(max_age=100.0)
+    restored.restore_snapshot(snapshot)
+    try:
+        assert len(restored) == 2
+        assert sorted(restored.ids_with_labels(["python", "rust"])) == [2, 3]
+        issue, _ = restored.search(vectors[2:3], 1)[0]
+        assert issue["id"] == 2 and issue["state"] == "open"
+    finally:
+        restored.clear()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.services import issue_index as issue_index_module
+from app.services.issue_index import IssueIndex
+
+
+def _issue(issue_id, state="open"):
+    return {"id": issue_id, "title": f"Issue {issue_id}", "body": "", "state": state,
+            "updated_at": f"2024-01-01T00:00:{issue_id:02d}Z"}
+
+
+def _vectors(count, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, 8)).astype("float32")
+
+
+def test_closed_payload_removes_indexed_issue():
+    index = IssueIndex()
+    index.upsert([_issue(i) for i in range(4)], _vectors(4))
+
+    index.upsert([_issue(1, state="closed"), _issue(9)], _vectors(2, seed=1))
+
+    ids = {issue["id"] for issue, _ in index.search(_vectors(1, seed=2), 10)}
+    assert ids == {0, 2, 3, 9}
+
+
+def test_issues_not_seen_within_max_age_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(issue_index_module.time, "time", lambda: clock[0])
+    index = IssueIndex(max_age=100.0)
+    index.upsert([_issue(i) for i in range(4)], _vectors(4))
+
+    clock[0] = 1060.0
+    index.touch([2, 3])
+    clock[0] = 1120.0
+    # Searches expire the issues last seen at t=1000 and keep the touched ones
+    assert {issue["id"] for issue, _ in index.search(_vectors(1, seed=2), 10)} == {2, 3}
+    assert index.expire(1200.0) == 2
+    assert len(index) == 0
@@ -0,0 +1,55 @@
+import threading
+
+import numpy as np
+
+from app.services import issue_index as issue_index_module
+from app.services.issue_index import IssueIndex
+from app.services.vector_search import ENGINE_FLAT, FlatIPEngine
+
+
+def _issues(start, count):
+    return [{"id": i, "title": f"Issue {i}", "body": "", "updated_at": "2024-01-01T00:00:00Z"}
+            for i in range(start, start + count)]
+
+
+def _vectors(count, seed):
+    return np.random.default_rng(seed).standard_normal((count, 16)).astype("float32")
+
+
+def test_engine_builds_outside_the_lock_and_replays_concurrent_writes(monkeypatch):
+    build_started, release_build = threading.Event(), threading.Event()
+
+    class SlowFlatEngine(FlatIPEngine):
+        def build(self, ids, vectors):
+            build_started.set()
+            assert release_build.wait(5)
+            super().build(ids, vectors)
+
+    monkeypatch.setattr(issue_index_module, "create_engine",
+                        lambda name, dim, compression: SlowFlatEngine(dim) if name == ENGINE_FLAT else None)
+
+    index = IssueIndex(numpy_max=32)
+    index.upsert(_issues(0, 32), _vectors(32, 0))
+    assert index.engine_name == "numpy"
+
+    # Crossing numpy_max plans a flat engine; its build blocks in the writer thread
+    writer = threading.Thread(target=index.upsert, args=(_issues(32, 8), _vectors(8, 1)))
+    writer.start()
+    assert build_started.wait(5)
+
+    # The lock is free: searches and further writes proceed during the build
+    query = _vectors(1, 2)
+    assert len(index.search(query, 5)) == 5
+    late = _vectors(4, 3)
+    index.upsert(_issues(40, 4), late)
+    index.delete([0, 1])
+
+    release_build.set()
+    writer.join(5)
+    assert index.engine_name == ENGINE_FLAT
+
+    # The swapped-in engine includes the writes made during the build
+    best, score = index.search(late[:1], 1)[0]
+    assert best["id"] == 40 and score > 0.99
+    assert {issue["id"] for issue, _ in index.search(query, 42)}.isdisjoint({0, 1})
+    assert len(index.search(query, 100)) == 42
@@ -0,0 +1,27 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import metrics
+from app.core.config import settings
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+    return TestClient(app)
+
+
+def test_metrics_hidden_without_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert _client().get("/metrics/", headers={"Authorization": "Bearer anything"}).status_code == 404
+
+
+def test_metrics_require_matching_bearer_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    client = _client()
+
+    assert client.get("/metrics/").status_code == 401
+    assert client.get("/metrics/", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics/", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "github_rate_limit" in response.json()
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+
+from app.routers import contributions
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+
+def _matches(document, query):
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(_matches(document, part) for part in condition):
+                return False
+        elif field == "$or":
+            if not any(_matches(document, part) for part in condition):
+                return False
+        elif isinstance(condition, dict):
+            if "$lt" in condition and not document.get(field) < condition["$lt"]:
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if _matches(document, query)])
+
+
+class FakeDatabase:
+    def __init__(self, count):
+        # Pairs share a createdAt so the _id tie-break is exercised
+        self.contributions = FakeCollection([
+            {"_id": ObjectId(), "userId": "1", "issueTitle": f"issue {i}", "createdAt": f"2024-01-{i // 2 + 1:02d}"}
+            for i in range(count)
+        ])
+
+
+@pytest.fixture
+def database(monkeypatch):
+    db = FakeDatabase(130)
+
+    async def user_id(request):
+        return "1"
+
+    monkeypatch.setattr(contributions, "get_database", lambda: db)
+    monkeypatch.setattr(contributions, "get_github_user_id", user_id)
+    return db
+
+
+def _list(**params):
+    response = Response()
+    result = asyncio.run(contributions.get_my_contributions(None, response, **params))
+    return result, response
+
+
+def test_plain_list_by_default_with_cursor_header(database):
+    result, response = _list()
+
+    assert isinstance(result, list)
+    assert len(result) == 100
+    assert NEXT_CURSOR_HEADER in response.headers
+
+
+def test_cursor_walk_returns_every_item_once(database):
+    seen, cursor = [], None
+    while True:
+        page, _ = _list(limit=25, cursor=cursor)
+        assert set(page) == {"items", "nextCursor"}
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 130
+    assert seen == [str(document["_id"]) for document in
+                    sorted(database.contributions.documents, key=lambda d: (d["createdAt"], d["_id"]), reverse=True)]
+
+
+def test_malformed_cursor_is_rejected(database):
+    with pytest.raises(HTTPException) as error:
+        _list(cursor="not-a-cursor")
+    assert error.value.status_code == 400
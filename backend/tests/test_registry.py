@@ -0,0 +1,39 @@
+import asyncio
+
+from app.services.registry import STATE_FAILED, STATE_READY, ServiceRegistry
+
+
+def test_warmup_retries_failed_required_service_until_ready():
+    registry = ServiceRegistry()
+    calls = []
+
+    def flaky_loader():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("model download failed")
+        return "model"
+
+    registry.register("model", flaky_loader, required=True)
+    asyncio.run(asyncio.wait_for(registry.warmup(retry_base=0.01, retry_max=0.02), timeout=5))
+
+    status = registry.status()
+    assert status["ready"] is True
+    assert status["services"]["model"]["state"] == STATE_READY
+    assert status["services"]["model"]["attempts"] == 3
+    assert registry.get("model") == "model"
+
+
+def test_warmup_does_not_retry_optional_service():
+    registry = ServiceRegistry()
+    calls = []
+
+    def failing_loader():
+        calls.append(1)
+        raise RuntimeError("no credentials")
+
+    registry.register("language", failing_loader, required=False)
+    asyncio.run(asyncio.wait_for(registry.warmup(retry_base=0.01), timeout=5))
+
+    assert len(calls) == 1
+    assert registry.status()["services"]["language"]["state"] == STATE_FAILED
+    assert registry.is_ready() is True
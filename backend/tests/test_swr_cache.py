@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from app.services.swr_cache import StaleWhileRevalidateCache
+
+
+def test_cancelled_waiter_does_not_cancel_shared_load():
+    cache = StaleWhileRevalidateCache(ttl=60.0, max_stale=60.0, max_entries=10)
+    calls = []
+
+    async def loader(background):
+        calls.append(background)
+        await asyncio.sleep(0.05)
+        return "profile"
+
+    async def scenario():
+        first = asyncio.ensure_future(cache.get("octocat", loader))
+        second = asyncio.ensure_future(cache.get("octocat", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "profile"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # The shared load finished and was cached
+        assert await cache.get("octocat", loader) == "profile"
+
+    asyncio.run(scenario())
+    assert calls == [False]
+    assert cache.stats()["hits"] == 1
+
+
+def test_failed_load_reaches_every_waiter():
+    cache = StaleWhileRevalidateCache(ttl=60.0, max_stale=60.0, max_entries=10)
+
+    async def loader(background):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("GitHub unavailable")
+
+    async def scenario():
+        return await asyncio.gather(cache.get("octocat", loader), cache.get("octocat", loader),
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import faiss_search, issue_index
+
+
+def _issue(issue_id, label="python"):
+    return {
+        "id": issue_id,
+        "html_url": f"https://github.com/octo/repo/issues/{issue_id}",
+        "repository_url": "https://api.github.com/repos/octo/repo",
+        "title": f"Issue {issue_id}",
+        "body": "",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "user": {"login": "octocat"},
+        "labels": [{"name": label}],
+    }
+
+
+@pytest.fixture
+def warm_index(monkeypatch):
+    index = issue_index.IssueIndex()
+    vectors = np.random.default_rng(0).standard_normal((50, 8)).astype("float32")
+    index.upsert([_issue(i, "Python" if i % 2 else "rust") for i in range(50)], vectors)
+    monkeypatch.setattr(issue_index, "issue_index", index)
+    monkeypatch.setattr(settings, "MATCH_WARM_MIN_ISSUES", 10)
+    monkeypatch.setattr(faiss_search, "_keyword_refreshed_at", {})
+
+    searches = []
+
+    async def fetch_github_issues(keywords, top_k=5, github_token=None, concurrency=None, priority=None):
+        searches.append((sorted(keywords), priority))
+        return [_issue(100)]
+
+    async def embed_issues(issues):
+        return np.ones((len(issues), 8), dtype="float32")
+
+    monkeypatch.setattr(faiss_search, "fetch_github_issues", fetch_github_issues)
+    monkeypatch.setattr(faiss_search, "embed_issues", embed_issues)
+    return index, searches
+
+
+def test_warm_index_answers_first_and_refreshes_in_background(warm_index):
+    index, searches = warm_index
+    query = np.random.default_rng(1).standard_normal((1, 8)).astype("float32")
+
+    async def match_twice():
+        first = await faiss_search.get_top_matched_issues("query", ["python"], top_k=3, query_vector=query)
+        await asyncio.gather(*faiss_search._refresh_tasks)
+        second = await faiss_search.get_top_matched_issues("query", ["python"], top_k=3, query_vector=query)
+        return first, second
+
+    first, second = asyncio.run(match_twice())
+
+    assert len(first["recommendations"]) == 3
+    assert first["issues_fetched"] == 0 and first["refreshing"] is True
+    # Only issues labelled with the request's keywords are candidates
+    assert first["issues_indexed"] == 25
+    assert all(rec["issue_id"] % 2 for rec in first["recommendations"])
+    # One background search at background priority, then the keywords count as fresh
+    assert len(searches) == 1 and searches[0][1] == faiss_search.PRIORITY_BACKGROUND
+    assert index.is_current(_issue(100))
+    assert second["refreshing"] is False
+
+
+def test_small_index_searches_github_first(warm_index, monkeypatch):
+    _, searches = warm_index
+    monkeypatch.setattr(settings, "MATCH_WARM_MIN_ISSUES", 1000)
+    query = np.ones((1, 8), dtype="float32")
+
+    result = asyncio.run(faiss_search.get_top_matched_issues("query", ["python"], top_k=3, query_vector=query))
+
+    assert result["issues_fetched"] == 1
+    assert searches and searches[0][1] is None
+
+
+def test_index_without_issues_for_the_keywords_searches_github_first(warm_index):
+    _, searches = warm_index
+    query = np.ones((1, 8), dtype="float32")
+
+    result = asyncio.run(faiss_search.get_top_matched_issues("query", ["haskell"], top_k=3, query_vector=query))
+
+    assert result["issues_fetched"] == 1
+    assert searches and searches[0][1] is None